@@ -72,6 +72,18 @@ describe("Grapher", () => {
         expect(grapher.mainChart.updateSeries).toHaveBeenCalledWith([{ name: 'Probability', data: expectedData }]);
     });
 
+    it('updates the graph with sparse outcomes', () => {
+        const outcomes = { '111': 0.25, '001': 0.75 };
+
+        grapher.update(outcomes);
+
+        const expectedData = [
+            { x: '001', y: 0.75 },
+            { x: '111', y: 0.25 }
+        ];
+        expect(grapher.mainChart.updateSeries).toHaveBeenCalledWith([{ name: 'Probability', data: expectedData }]);
+    });
+
     it('should return an empty array of labels when no qubits are toggled', () => {
         const labels = grapher.generateLabels();
         expect(labels).toEqual([]);
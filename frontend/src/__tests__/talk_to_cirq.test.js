@@ -64,6 +64,98 @@ describe('simulate function', () => {
     });
 });
 
+describe('simulateStream function', () => {
+    const { TextEncoder, TextDecoder } = require('util');
+    global.TextDecoder = TextDecoder;
 
+    // Builds a fetch response that streams the given text in the given chunks
+    const streamResponse = (chunks, contentType = 'application/x-ndjson') => {
+        const encoder = new TextEncoder();
+        const pending = chunks.map((chunk) => encoder.encode(chunk));
+        return Promise.resolve({
+            headers: { get: () => contentType },
+            body: {
+                getReader: () => ({
+                    read: () => Promise.resolve(
+                        pending.length ? { done: false, value: pending.shift() } : { done: true, value: undefined }
+                    ),
+                }),
+            },
+        });
+    };
+
+    beforeEach(() => {
+        jest.clearAllMocks();
+        console.error = jest.fn();
+    });
+
+    test('calls onProbe for each probe and stores the result', async () => {
+        const probe = { row: 0, col: 1, value: 0.5 };
+        const result = { type: 'result', status: 'ok', state_vector: [0.5, 0.5], probed_values: [probe] };
+        // Split a record across chunks to check partial lines are buffered
+        const text = JSON.stringify({ type: 'probe', ...probe }) + '\n' + JSON.stringify(result) + '\n';
+        global.fetch = jest.fn(() => streamResponse([text.slice(0, 10), text.slice(10)]));
+        const onProbe = jest.fn();
 
+        await ttc.simulateStream([{ gate: 'H', qubit: 0 }], [{ qubit: 0, toggle: 1 }], onProbe);
 
+        expect(global.fetch).toHaveBeenCalledWith('/simulate_stream', expect.anything());
+        expect(JSON.parse(global.fetch.mock.calls[0][1].body).incremental).toBe(true);
+        expect(onProbe).toHaveBeenCalledWith(probe);
+        expect(ttc.currentStatus).toEqual('ok');
+        expect(ttc.currentStateVector).toEqual([0.5, 0.5]);
+        expect(ttc.currentMeasurementProbeValues).toEqual([probe]);
+    });
+
+    test('handles error records', async () => {
+        const text = JSON.stringify({ type: 'error', status: 'error', message: 'Simulation took too long' }) + '\n';
+        global.fetch = jest.fn(() => streamResponse([text]));
+
+        await ttc.simulateStream([], []);
+        expect(ttc.currentStatus).toEqual('error');
+    });
+
+    test('handles rejected circuits', async () => {
+        global.fetch = jest.fn(() => Promise.resolve({
+            headers: { get: () => 'application/json' },
+            json: () => Promise.resolve({ status: 'error', message: 'Circuit has 30 qubits' }),
+        }));
+
+        await ttc.simulateStream([], []);
+        expect(ttc.currentStatus).toEqual('error');
+    });
+});
+
+
+describe('simulateUnitary function', () => {
+    beforeEach(() => {
+        console.error = jest.fn();
+    });
+
+    test('expands the sparse column unitaries and the dense circuit unitary', async () => {
+        global.fetch = jest.fn(() =>
+            Promise.resolve({
+                json: () => Promise.resolve({
+                    status: 'ok',
+                    columns: [{ col: 0, unitary: { size: 2, rows: [0, 1], cols: [1, 0], real: [1, 1], imag: [0, 0] } }],
+                    unitary: { real: [[0, 1], [1, 0]], imag: [[0, 0], [0, 0]] },
+                }),
+            })
+        );
+
+        await ttc.simulateUnitary({ gates: [['X']] });
+
+        expect(JSON.parse(global.fetch.mock.calls[0][1].body)).toEqual({ circuit: { gates: [['X']] } });
+        expect(ttc.currentStatus).toEqual('ok');
+        expect(ttc.currentColumnUnitaries).toEqual([{ col: 0, unitary: [[{ re: 0, im: 0 }, { re: 1, im: 0 }], [{ re: 1, im: 0 }, { re: 0, im: 0 }]] }]);
+        expect(ttc.currentUnitary).toEqual(ttc.currentColumnUnitaries[0].unitary);
+    });
+
+    test('handles errors correctly', async () => {
+        global.fetch = jest.fn(() => Promise.reject(new Error('Failed to connect')));
+
+        await ttc.simulateUnitary({ gates: [['X']] });
+
+        expect(ttc.currentStatus).toEqual('error');
+    });
+});
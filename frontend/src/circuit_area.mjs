@@ -13,7 +13,7 @@ import { Circuit, getCircuit } from './circuit.mjs';
 import { HoverInfo } from './hover_info.mjs';
 import { Grapher } from "./graphs.mjs";
 import { createMeasurementSvg, constructSvg, constructSquareGate, createComponentIcon, drawMeasurementInCircuit } from './icons.mjs';
-import { simulate, currentStateVector, currentMeasurementProbeValues } from './talk_to_cirq.mjs';
+import { simulateStream, currentStateVector, currentMeasurementProbeValues } from './talk_to_cirq.mjs';
 import { exportCircuit, setExportForm, importCircuit, setImportForm } from './import_export.mjs';
 import { saveCircuit, setSaveForm, loadCircuit, setLoadForm } from './load_save.mjs';
 import { startTutorial } from './tutorial.mjs';
@@ -595,7 +595,8 @@ export async function updateArea() {
     // Restore the scroll position
     document.getElementById('circuit-lines').scrollLeft = scrollLeft;
 
-    await simulate(circuit, measureToggle);
+    // Probes are drawn as the simulator reaches them, so early columns fill in on big circuits
+    await simulateStream(circuit, measureToggle, drawMeasurementProbe);
 
     // dont stall the updateArea function to wait for measurements, just redraw once they are ready
     updateMeasurementProbes();
@@ -631,15 +632,25 @@ export async function updateArea() {
  */
 function updateMeasurementProbes(){
     for (let probe of currentMeasurementProbeValues) {
-        let r = probe.row;
-        let c = probe.col;
-        let val = probe.value;
+        drawMeasurementProbe(probe);
+    }
+}
 
-        let parent = document.getElementById(`M-${r}-${c}`);
+/**
+ * Draws a single measurement probe value in the circuit area.
+ * 
+ * @param {*} probe - the {row, col, value} of the probe
+ */
+function drawMeasurementProbe(probe) {
+    let parent = document.getElementById(`M-${probe.row}-${probe.col}`);
 
-        parent.innerHTML = '' 
-        parent.appendChild(drawMeasurementInCircuit(val));
+    // The circuit may have been redrawn while the probe was on its way
+    if (!parent) {
+        return;
     }
+
+    parent.innerHTML = '' 
+    parent.appendChild(drawMeasurementInCircuit(probe.value));
 }
 
 /**
@@ -155,16 +155,25 @@ export class Grapher {
     /**
      * Update the graph with new probabilities
      * 
-     * @param {Array<number>} probabilities - The probabilities to update the graph with
+     * @param {Array<number>|Object<string, number>} probabilities - The probabilities to update the graph with, either
+     * one per state or the sparse {bitstring: probability} outcomes returned with top_k or min_probability
      */
     update(probabilities) {
         this.probabilities = probabilities;
 
-        let labels = this.generateLabels();
         let data = [];
 
-        for (let i = 0; i < labels.length; i++) {
-            data.push({ x: labels[i], y: this.probabilities[i] });
+        if (Array.isArray(probabilities)) {
+            let labels = this.generateLabels();
+
+            for (let i = 0; i < labels.length; i++) {
+                data.push({ x: labels[i], y: this.probabilities[i] });
+            }
+        } else {
+            // Only the significant states were sent, so draw a bar for each of them in state order
+            for (let label of Object.keys(probabilities).sort()) {
+                data.push({ x: label, y: probabilities[label] });
+            }
         }
 
         this.mainChart.updateSeries([{
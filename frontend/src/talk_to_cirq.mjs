@@ -8,6 +8,8 @@
 export var currentStatus = null;
 export var currentStateVector = [];
 export var currentMeasurementProbeValues = [];
+export var currentColumnUnitaries = [];
+export var currentUnitary = null;
 
 /**
  * Sends the circuit data to the simulator for simulation, and stores the response in the currentStatus and currentProbabilities variables.
@@ -34,4 +36,120 @@ export async function simulate(circuitData, toMeasure) {
         console.error('Error:', error);
     }
 }
-  
+
+/**
+ * Streams a simulation from the simulator, calling onProbe with each probe value as soon as the
+ * sweep reaches its column, then stores the final result like simulate does.
+ * 
+ * @param {*} circuitData - the data to be sent to the simulator
+ * @param {*} toMeasure - the qubits to measure
+ * @param {*} onProbe - called with each {row, col, value} probe as it arrives
+ */
+export async function simulateStream(circuitData, toMeasure, onProbe = () => {}) {
+    currentMeasurementProbeValues = [];
+
+    const handleRecord = (record) => {
+        if (record.type === 'probe') {
+            const probe = { row: record.row, col: record.col, value: record.value };
+            currentMeasurementProbeValues.push(probe);
+            onProbe(probe);
+        } else if (record.type === 'result') {
+            currentStatus = record.status;
+            currentStateVector = record.state_vector;
+            currentMeasurementProbeValues = record.probed_values;
+        } else {
+            currentStatus = 'error';
+            console.error('Error:', record.message);
+        }
+    };
+
+    try {
+        const response = await fetch('/simulate_stream', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            // The builder re-posts the whole circuit on every edit, so let the server resume from the edit
+            body: JSON.stringify({
+                circuit: circuitData,
+                to_measure: toMeasure,
+                incremental: true,
+            }),
+        });
+
+        // Rejected circuits come back as a single JSON object rather than a stream
+        if (!(response.headers.get('Content-Type') || '').startsWith('application/x-ndjson')) {
+            handleRecord({ type: 'error', ...(await response.json()) });
+            return;
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { done, value } = await reader.read();
+            buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            for (const line of lines) {
+                if (line.trim()) {
+                    handleRecord(JSON.parse(line));
+                }
+            }
+
+            if (done) {
+                break;
+            }
+        }
+    } catch (error) {
+        currentStatus = 'error';
+        console.error('Error:', error);
+    }
+}
+
+/**
+ * Expands a matrix from /simulate_unitary into rows of {re, im} entries. Column unitaries arrive
+ * sparse, as the rows, columns and values of their nonzero entries, and the circuit unitary dense.
+ * 
+ * @param {*} matrix - the matrix as sent by the server
+ * @returns {Array} the matrix as an array of rows
+ */
+export function expandMatrix(matrix) {
+    if (matrix.rows === undefined) {
+        return matrix.real.map((row, i) => row.map((re, j) => ({ re, im: matrix.imag[i][j] })));
+    }
+
+    const dense = Array.from({ length: matrix.size }, () => Array.from({ length: matrix.size }, () => ({ re: 0, im: 0 })));
+    matrix.rows.forEach((row, k) => {
+        dense[row][matrix.cols[k]] = { re: matrix.real[k], im: matrix.imag[k] };
+    });
+    return dense;
+}
+
+/**
+ * Fetches the unitary of each column of the circuit and of the whole circuit, for the lessons,
+ * and stores them expanded in currentColumnUnitaries and currentUnitary.
+ * 
+ * @param {*} circuitData - the data to be sent to the simulator
+ */
+export async function simulateUnitary(circuitData) {
+    try {
+        const response = await fetch('/simulate_unitary', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ circuit: circuitData }),
+        });
+        const data = await response.json();
+        currentStatus = data.status;
+
+        if (data.status === 'ok') {
+            currentColumnUnitaries = data.columns.map((column) => ({ col: column.col, unitary: expandMatrix(column.unitary) }));
+            currentUnitary = expandMatrix(data.unitary);
+        } else {
+            console.error('Error:', data.message);
+        }
+    } catch (error) {
+        currentStatus = 'error';
+        console.error('Error:', error);
+    }
+}
@@ -0,0 +1,165 @@
+"""
+    File: aer_backend.py
+    Date: 10-2026
+"""
+
+import importlib.util
+import numpy as np
+from confighome.backends import lazy_import
+from confighome.columns import parse_columns
+
+# Qiskit and Aer take around a second to import, so they are only loaded once a circuit runs on Aer
+qiskit = lazy_import('qiskit')
+qiskit_aer = lazy_import('qiskit_aer')
+
+# Controlled Z, S and T are multi-controlled phase gates
+PHASES = {
+    'Z': np.pi,
+    'S': np.pi / 2,
+    'T': np.pi / 4,
+}
+
+
+def aer_available() -> bool:
+    """
+    Returns:
+        True if qiskit-aer is installed, checked without importing it
+    """
+    return importlib.util.find_spec('qiskit_aer') is not None
+
+
+class AerEngine:
+    """
+    Runs the builder grid on Qiskit Aer's multithreaded state vector simulator.
+
+    Grid row r is Qiskit qubit n-1-r, so that row 0 stays the most significant bit as in Cirq.
+    Each probe saves the probabilities of its qubit before its column, so a single run returns
+    every probe along with the final distribution.
+    """
+    def __init__(self, num_qubits, threads=0, precision='single'):
+        self.num_qubits = num_qubits
+        self.threads = threads
+        self.precision = precision
+        self.probabilities = None
+
+    def run(self, columns) -> list:
+        """
+        Builds and runs the circuit for the grid
+
+        Args:
+            columns: list of columns, each a list of gates indexed by row
+
+        Returns:
+            a list of dictionaries containing the row, column and value of the probed measurements
+        """
+        circuit, probes = self.build_circuit(columns)
+
+        simulator = qiskit_aer.AerSimulator(method='statevector', precision=self.precision, max_parallel_threads=self.threads)
+        data = simulator.run(circuit, shots=1).result().data()
+
+        self.probabilities = np.asarray(data['final'], dtype=np.float64)
+
+        return [{'row': row, 'col': col_index, 'value': float(data[label][1])} for label, row, col_index in probes]
+
+    def sweep(self, columns):
+        """
+        Runs the circuit, then yields its probes. Aer returns every saved value at the end of
+        the run, so the probes cannot arrive any earlier.
+
+        Args:
+            columns: list of columns, each a list of gates indexed by row
+
+        Yields:
+            a dictionary containing the row, column and value of each probed measurement
+        """
+        yield from self.run(columns)
+
+    def build_circuit(self, columns) -> tuple:
+        """
+        Translates the grid into a Qiskit circuit made only of instructions Aer runs natively,
+        so it can skip transpiling. Anticontrols are flipped around their column, and controlled
+        gates are built from multi-controlled X and phase gates, as Qiskit's generic controlled
+        gates would be decomposed into thousands of two-qubit gates.
+
+        Args:
+            columns: list of columns, each a list of gates indexed by row
+
+        Returns:
+            a (circuit, probes) tuple, where probes lists the (label, row, column) of every
+            saved probe in the order they are reached
+        """
+        circuit = qiskit.QuantumCircuit(self.num_qubits)
+        probes = []
+
+        for column in parse_columns(columns):
+            for row in column.probes:
+                label = f'probe_{row}_{column.col_index}'
+                circuit.append(qiskit_aer.library.SaveProbabilities(1, label=label), [self.__qubit(row)])
+                probes.append((label, row, column.col_index))
+
+            controls = [self.__qubit(row) for row in column.controls + column.anticontrols]
+            anticontrols = [self.__qubit(row) for row in column.anticontrols]
+
+            if anticontrols:
+                circuit.x(anticontrols)
+            if column.swap is not None:
+                self.__swap(circuit, controls, *[self.__qubit(row) for row in column.swap])
+            for row, gate in column.gates:
+                self.__gate(circuit, gate, controls, self.__qubit(row))
+            if anticontrols:
+                circuit.x(anticontrols)
+
+        circuit.append(qiskit_aer.library.SaveProbabilities(self.num_qubits, label='final'), circuit.qubits)
+
+        return circuit, probes
+
+    def marginal(self, indices) -> np.ndarray:
+        """
+        Finds the outcome probabilities of some qubits
+
+        Args:
+            indices: the qubits to measure
+
+        Returns:
+            the probabilities over the measured qubits, first qubit most significant
+        """
+        probs = self.probabilities.reshape((2,) * self.num_qubits)
+        axes_to_sum_over = tuple(i for i in range(self.num_qubits) if i not in indices)
+
+        return np.sum(probs, axis=axes_to_sum_over).flatten()
+
+    def __qubit(self, row) -> int:
+        return self.num_qubits - 1 - row
+
+    def __gate(self, circuit, gate, controls, target):
+        """
+        Adds a palette gate, controlled on every qubit in controls
+        """
+        if not controls:
+            getattr(circuit, gate.lower())(target)
+        elif gate == 'X':
+            circuit.mcx(controls, target)
+        elif gate == 'Y':
+            # Y = S X S^dagger, and the S gates cancel wherever the controls are not met
+            circuit.sdg(target)
+            circuit.mcx(controls, target)
+            circuit.s(target)
+        elif gate == 'H':
+            # H = Ry(pi/4) Z Ry(-pi/4)
+            circuit.ry(-np.pi / 4, target)
+            circuit.mcp(np.pi, controls, target)
+            circuit.ry(np.pi / 4, target)
+        else:
+            circuit.mcp(PHASES[gate], controls, target)
+
+    def __swap(self, circuit, controls, a, b):
+        """
+        Adds a swap, controlled on every qubit in controls, as three CNOTs with the middle one controlled
+        """
+        if not controls:
+            circuit.swap(a, b)
+            return
+
+        circuit.cx(b, a)
+        circuit.mcx(controls + [a], b)
+        circuit.cx(b, a)
@@ -0,0 +1,47 @@
+"""
+    File: backends.py
+    Date: 10-2026
+"""
+
+import importlib
+
+
+class LazyModule:
+    """
+    Stands in for a heavy module until one of its attributes is first used, so importing
+    the simulator (and every view) does not pay for backends a request never selects
+    """
+    def __init__(self, name):
+        self.__name = name
+        self.__module = None
+
+    @property
+    def loaded(self) -> bool:
+        """
+        Returns:
+            True once the real module has been imported
+        """
+        return self.__module is not None
+
+    def __getattr__(self, attribute):
+        if self.__module is None:
+            self.__module = importlib.import_module(self.__name)
+
+        return getattr(self.__module, attribute)
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f'<lazy module {self.__name!r} ({state})>'
+
+
+def lazy_import(name) -> LazyModule:
+    """
+    Defers importing a module until it is first used
+
+    Args:
+        name: the full name of the module, such as 'cirq'
+
+    Returns:
+        a LazyModule to use in place of the module
+    """
+    return LazyModule(name)
@@ -0,0 +1,234 @@
+"""
+    File: benchmarks.py
+    Date: 10-2026
+"""
+
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+from confighome.simulator import Simulator
+
+BASELINE_VERSION = 1
+TARGET_GATES = ('X', 'Y', 'Z', 'H', 'S', 'T')
+
+# Seconds a fresh worker may spend importing confighome.views, after Django is set up.
+# Loading Cirq alone takes several seconds, so this only holds while backends stay lazy.
+IMPORT_BUDGET_SECONDS = 1.5
+
+HEAVY_MODULES = ('cirq', 'qiskit', 'qiskit_aer', 'matplotlib')
+
+STARTUP_SCRIPT = f"""
+import json, sys, time
+import django
+django.setup()
+start = time.perf_counter()
+import confighome.views
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+class BenchmarkCase:
+    """
+    One point of the benchmark sweep
+    """
+    def __init__(self, qubits, columns, probe_density=0.0, control_density=0.0, engine='cirq'):
+        self.qubits = qubits
+        self.columns = columns
+        self.probe_density = probe_density
+        self.control_density = control_density
+        self.engine = engine
+
+    @property
+    def name(self) -> str:
+        """
+        Returns:
+            the identifier of the case in results and baselines
+        """
+        return f'{self.engine}/q{self.qubits}/c{self.columns}/p{self.probe_density:g}/k{self.control_density:g}'
+
+
+def sweep_cases(qubits=range(1, 21), columns=(10,), probe_densities=(0.0, 0.2),
+                control_densities=(0.0, 0.3), engines=('cirq',)) -> list:
+    """
+    Builds every combination of the given parameters
+
+    Returns:
+        a list of BenchmarkCase objects
+    """
+    return [
+        BenchmarkCase(q, c, p, k, engine)
+        for engine, q, c, p, k in itertools.product(engines, qubits, columns, probe_densities, control_densities)
+    ]
+
+
+def random_circuit(rng, qubits, columns, probe_density=0.0, control_density=0.0) -> tuple:
+    """
+    Builds a random builder grid in the format sent by the circuit editor
+
+    Args:
+        rng: a NumPy random generator
+        qubits: the number of rows
+        columns: the number of columns
+        probe_density: the chance of each cell being a probe
+        control_density: the chance of each remaining cell being a control or anticontrol
+
+    Returns:
+        a (gates, to_measure) tuple, with gates indexed [row][col] and every qubit measured
+    """
+    gates = [[0] * columns for _ in range(qubits)]
+
+    for row, col in itertools.product(range(qubits), range(columns)):
+        roll = rng.random()
+        if roll < probe_density:
+            gates[row][col] = 'M'
+        elif roll < probe_density + control_density:
+            gates[row][col] = rng.choice(['c', 'ac'])
+        else:
+            gates[row][col] = str(rng.choice(TARGET_GATES))
+
+    to_measure = [{'qubit': qubit, 'toggle': 1} for qubit in range(qubits)]
+
+    return gates, to_measure
+
+
+def time_case(case, repeat=3, seed=0, simulator_class=Simulator, clock=time.perf_counter) -> dict:
+    """
+    Times the stages of simulating one case, keeping the fastest of several runs on a fresh
+    simulator each time. Circuit generation is only timed for the Cirq engine, as the native
+    engines work from the grid directly.
+
+    Args:
+        case: the BenchmarkCase to run
+        repeat: the number of runs
+        seed: the seed of the random circuit
+        simulator_class: the class used to simulate the circuit
+        clock: the timer to use
+
+    Returns:
+        a dictionary of stage names to milliseconds
+    """
+    gates, to_measure = random_circuit(np.random.default_rng(seed), case.qubits, case.columns,
+                                       case.probe_density, case.control_density)
+    best = {}
+
+    for _ in range(repeat):
+        # A simulator keeps the final state of its probe sweep, and the native engines run once for
+        # both stages, so simulating and probing each get a fresh simulator to do the real work
+        simulator = simulator_class(gates, to_measure, engine=case.engine)
+        prober = simulator_class(gates, to_measure, engine=case.engine)
+        stages = [('simulate', simulator.simulate_circuit), ('probe', prober.probe_measurements)]
+        if simulator.uses_cirq:
+            stages = [('generate_circuit', simulator.generate_cirq_circuit), stages[0],
+                      ('generate_probed_circuit', prober.generate_probed_circuit), stages[1]]
+
+        for name, stage in stages:
+            start = clock()
+            stage()
+            milliseconds = (clock() - start) * 1000
+            best[name] = min(best.get(name, milliseconds), milliseconds)
+
+    return best
+
+
+def run_benchmarks(cases, repeat=3, seed=0, simulator_class=Simulator, progress=None) -> dict:
+    """
+    Times every case of a sweep
+
+    Args:
+        cases: the BenchmarkCase objects to run
+        repeat: the number of runs of each case
+        seed: the seed of the random circuits
+        simulator_class: the class used to simulate the circuits
+        progress: optional callable given each case name and its timings as it finishes
+
+    Returns:
+        a {'version', 'cases'} dictionary that can be saved as a baseline
+    """
+    results = {}
+
+    for case in cases:
+        results[case.name] = time_case(case, repeat, seed, simulator_class)
+        if progress is not None:
+            progress(case.name, results[case.name])
+
+    return {'version': BASELINE_VERSION, 'cases': results}
+
+
+def compare(results, baseline, threshold=0.25, min_delta=1.0) -> list:
+    """
+    Finds the stages that got slower than the baseline. A stage only counts as a regression
+    when it is both threshold times slower and min_delta milliseconds slower, so timer noise
+    on stages that take microseconds is not reported.
+
+    Args:
+        results: the output of run_benchmarks
+        baseline: an earlier output of run_benchmarks
+        threshold: the allowed slowdown, as a fraction of the baseline time
+        min_delta: the allowed slowdown in milliseconds
+
+    Returns:
+        a list of {'case', 'stage', 'baseline', 'current', 'ratio'} dictionaries, slowest first
+
+    Raises:
+        ValueError: if the baseline was written by another version of the suite
+    """
+    if baseline.get('version') != BASELINE_VERSION:
+        raise ValueError(f"Baseline version {baseline.get('version')} does not match {BASELINE_VERSION}")
+
+    regressions = []
+
+    for name, stages in results['cases'].items():
+        for stage, current in stages.items():
+            previous = baseline['cases'].get(name, {}).get(stage)
+            if previous is None:
+                continue
+
+            if current > previous * (1 + threshold) and current - previous > min_delta:
+                regressions.append({
+                    'case': name,
+                    'stage': stage,
+                    'baseline': previous,
+                    'current': current,
+                    'ratio': current / previous if previous else float('inf'),
+                })
+
+    return sorted(regressions, key=lambda regression: regression['ratio'], reverse=True)
+
+
+def load_baseline(path) -> dict:
+    """
+    Reads a baseline written by save_baseline
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(results, path):
+    """
+    Writes the output of run_benchmarks as a baseline
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def measure_startup(settings_module, base_dir) -> dict:
+    """
+    Imports confighome.views in a fresh interpreter, as a newly started worker would
+
+    Args:
+        settings_module: the Django settings module the worker runs with
+        base_dir: the directory the worker runs in
+
+    Returns:
+        a {'seconds', 'loaded'} dictionary with the import time and the heavy modules it loaded
+    """
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module}
+    output = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT], cwd=base_dir, env=env,
+                            capture_output=True, text=True, check=True).stdout
+
+    return json.loads(output.strip().splitlines()[-1])
@@ -0,0 +1,118 @@
+"""
+    File: cache.py
+    Date: 10-2026
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from confighome.columns import compile_circuit
+
+
+def circuit_key(gates, to_measure, engine='auto') -> str:
+    """
+    Builds a stable hash of a circuit grid, its measurement toggles and the requested engine
+
+    The grid is hashed through its compiled opcodes, so empty cells sent as 0 or '0'
+    give the same key, and toggles may come in any order. A forced engine gets its own
+    keys, so its results are never served to requests for another engine.
+
+    Args:
+        gates: the circuit grid, indexed [row][col], or its CompiledCircuit
+        to_measure: list of {'qubit', 'toggle'} dictionaries
+        engine: the engine requested for the simulation
+
+    Returns:
+        a hex digest identifying the simulation
+    """
+    measured = sorted({item['qubit'] for item in to_measure if item['toggle'] == 1})
+
+    digest = hashlib.sha256(compile_circuit(gates).fingerprint())
+    digest.update(json.dumps({'measured': measured, 'engine': engine}, separators=(',', ':')).encode('utf-8'))
+
+    return digest.hexdigest()
+
+
+class SimulationCache:
+    """
+    A bounded, thread safe LRU cache of simulation results with a time to live
+    """
+    def __init__(self, max_size=256, ttl=300, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+
+        self.hits = 0
+        self.misses = 0
+
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Looks up a result, refreshing its position in the LRU order
+
+        Args:
+            key: the circuit key
+
+        Returns:
+            the cached result, or None if it is missing or has expired
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry is not None:
+                stored_at, value = entry
+                if self.ttl is None or self.clock() - stored_at < self.ttl:
+                    self.__entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.__entries[key]
+
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        """
+        Stores a result, evicting the least recently used entries when full
+
+        Args:
+            key: the circuit key
+            value: the result to store
+        """
+        if self.max_size <= 0:
+            return
+
+        with self.__lock:
+            self.__entries[key] = (self.clock(), value)
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes every entry and resets the counters
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            a dictionary of the cache size and hit/miss counters
+        """
+        with self.__lock:
+            return {
+                'size': len(self.__entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+    def __len__(self):
+        return len(self.__entries)
@@ -0,0 +1,180 @@
+"""
+    File: checkpoints.py
+    Date: 10-2026
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+import numpy as np
+
+
+class CheckpointStore:
+    """
+    A process-wide, thread safe LRU store of state vector snapshots under a byte budget.
+
+    Snapshots are kept in memory until memory_bytes is used up. The least recently used are
+    then spilled to read-only memory-mapped files in a scratch directory, which the OS can
+    page out under pressure. Once the spilled files pass disk_bytes, the coldest are deleted,
+    so a get may return None and callers must be able to recompute the snapshot.
+    """
+    def __init__(self, memory_bytes=256 * 2**20, disk_bytes=2 * 2**30, directory=None):
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.directory = directory
+
+        self.spills = 0
+        self.evictions = 0
+
+        self.__entries = OrderedDict()
+        self.__memory_used = 0
+        self.__disk_used = 0
+        self.__scratch = None
+        self.__counter = 0
+        self.__lock = threading.Lock()
+
+    def put(self, key, array):
+        """
+        Stores a snapshot, replacing any earlier one under the same key. The array must not be
+        changed afterwards, as it is kept rather than copied.
+
+        Args:
+            key: any hashable key
+            array: the NumPy array to store
+        """
+        with self.__lock:
+            self.__remove(key)
+            self.__entries[key] = (array, None)
+            self.__memory_used += array.nbytes
+            self.__enforce_budget()
+
+    def get(self, key):
+        """
+        Looks up a snapshot, refreshing its position in the LRU order
+
+        Args:
+            key: the key it was stored under
+
+        Returns:
+            the array, read-only memory-mapped if it was spilled, or None if it was evicted
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+
+            self.__entries.move_to_end(key)
+            return entry[0]
+
+    def discard(self, keys):
+        """
+        Removes snapshots, deleting their files if they were spilled
+
+        Args:
+            keys: the keys to remove, which need not be stored
+        """
+        with self.__lock:
+            for key in keys:
+                self.__remove(key)
+
+    def clear(self):
+        """
+        Removes every snapshot and resets the counters
+        """
+        with self.__lock:
+            for key in list(self.__entries):
+                self.__remove(key)
+            self.spills = 0
+            self.evictions = 0
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            a dictionary of the snapshot count, bytes used and spill/eviction counters
+        """
+        with self.__lock:
+            return {
+                'snapshots': len(self.__entries),
+                'memory_bytes': self.__memory_used,
+                'disk_bytes': self.__disk_used,
+                'spills': self.spills,
+                'evictions': self.evictions,
+            }
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+    def __enforce_budget(self):
+        """
+        Spills the coldest in-memory snapshots until memory fits the budget, then evicts the
+        coldest spilled snapshots until disk fits too
+        """
+        if self.__memory_used > self.memory_bytes:
+            for key, (array, path) in list(self.__entries.items()):
+                if self.__memory_used <= self.memory_bytes:
+                    break
+                if path is None:
+                    self.__spill(key, array)
+
+        if self.__disk_used > self.disk_bytes:
+            for key, (array, path) in list(self.__entries.items()):
+                if self.__disk_used <= self.disk_bytes:
+                    break
+                if path is not None:
+                    self.__remove(key)
+                    self.evictions += 1
+
+    def __spill(self, key, array):
+        """
+        Moves a snapshot into a memory-mapped file, or drops it if it would not fit on disk
+        """
+        self.__memory_used -= array.nbytes
+
+        if array.nbytes > self.disk_bytes:
+            del self.__entries[key]
+            self.evictions += 1
+            return
+
+        self.__counter += 1
+        path = os.path.join(self.__scratch_directory(), f'{self.__counter}.dat')
+
+        spilled = np.memmap(path, dtype=array.dtype, mode='w+', shape=array.shape)
+        spilled[...] = array
+        spilled.flush()
+        del spilled
+
+        self.__entries[key] = (np.memmap(path, dtype=array.dtype, mode='r', shape=array.shape), path)
+        self.__disk_used += array.nbytes
+        self.spills += 1
+
+    def __remove(self, key):
+        """
+        Drops a snapshot if it is stored, deleting its file if it was spilled
+        """
+        entry = self.__entries.pop(key, None)
+        if entry is None:
+            return
+
+        array, path = entry
+        if path is None:
+            self.__memory_used -= array.nbytes
+        else:
+            self.__disk_used -= array.nbytes
+            # The mapping stays valid for anyone still reading it after the file is unlinked
+            os.remove(path)
+
+    def __scratch_directory(self) -> str:
+        """
+        Returns the scratch directory of this store, creating it on the first spill. It is
+        removed when the store is garbage collected or the process exits.
+        """
+        if self.__scratch is None:
+            if self.directory is not None:
+                os.makedirs(self.directory, exist_ok=True)
+            self.__scratch = tempfile.mkdtemp(prefix='checkpoints-', dir=self.directory)
+            weakref.finalize(self, shutil.rmtree, self.__scratch, True)
+
+        return self.__scratch
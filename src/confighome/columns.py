@@ -0,0 +1,226 @@
+"""
+    File: columns.py
+    Date: 10-2026
+"""
+
+import hashlib
+import numpy as np
+
+SINGLE_QUBIT_GATES = ('X', 'Y', 'Z', 'H', 'S', 'T', 'I')
+
+# Opcodes of the compiled grid. Cells that are not on the palette compile to OTHER, which
+# every engine ignores, as they ignored unknown labels before.
+EMPTY, OTHER, CONTROL, ANTICONTROL, SWAP, PROBE, BARRIER = range(7)
+GATE_OPCODES = {gate: BARRIER + 1 + i for i, gate in enumerate(SINGLE_QUBIT_GATES)}
+IDENTITY = GATE_OPCODES['I']
+
+OPCODES = {
+    0: EMPTY,
+    '0': EMPTY,
+    'c': CONTROL,
+    'ac': ANTICONTROL,
+    'sw': SWAP,
+    'M': PROBE,
+    'b': BARRIER,
+    **GATE_OPCODES,
+}
+GATE_NAMES = {opcode: gate for gate, opcode in GATE_OPCODES.items()}
+LABELS = {opcode: label for label, opcode in OPCODES.items() if isinstance(label, str)}
+
+
+def encode(cells) -> np.ndarray:
+    """
+    Compiles gate labels to opcodes, with empty cells sent as either 0 or '0'
+
+    Args:
+        cells: a list of gate labels, or a grid of them with rows of equal length
+
+    Returns:
+        an int8 array of opcodes with the same shape
+
+    Raises:
+        ValueError: if a cell is not a label
+    """
+    lookup = OPCODES.get
+
+    try:
+        if cells and isinstance(cells[0], (list, tuple)):
+            return np.array([[lookup(cell, OTHER) for cell in row] for row in cells], dtype=np.int8)
+        return np.array([lookup(cell, OTHER) for cell in cells], dtype=np.int8)
+    except TypeError:
+        raise ValueError('Every cell of the circuit must be a gate label') from None
+
+
+def bitmask(rows) -> int:
+    """
+    Returns:
+        an int with the bit of each row set, row 0 the least significant
+    """
+    mask = 0
+    for row in rows:
+        mask |= 1 << row
+
+    return mask
+
+
+class Column:
+    """
+    A column of the circuit grid, parsed for the engines that work directly
+    from the grid instead of from a Cirq circuit.
+
+    Mirrors Simulator.__parse_column: a swap is only applied when the column
+    holds exactly two swap nodes, and every gate in the column is controlled
+    by all of the controls and anticontrols in it. The controls, anticontrols,
+    swap nodes and probes are also kept as bitmasks over the rows.
+    """
+    __slots__ = ('col_index', 'gates', 'controls', 'anticontrols', 'swaps', 'swap', 'probes',
+                 'control_mask', 'anticontrol_mask', 'swap_mask', 'probe_mask')
+
+    def __init__(self, column, col_index):
+        """
+        Args:
+            column: the column's gate labels, or its opcodes, indexed by row
+            col_index: the index of the column in the grid
+        """
+        opcodes = column if isinstance(column, np.ndarray) else encode(column)
+        occupied = np.flatnonzero(opcodes)
+
+        self.__parse(col_index, occupied.tolist(), opcodes[occupied].tolist())
+
+    @classmethod
+    def from_cells(cls, col_index, rows, opcodes) -> 'Column':
+        """
+        Builds a column from just its occupied cells
+
+        Args:
+            col_index: the index of the column in the grid
+            rows: the rows of the occupied cells, in order
+            opcodes: the opcode of each of those cells
+
+        Returns:
+            the parsed Column
+        """
+        column = cls.__new__(cls)
+        column.__parse(col_index, rows, opcodes)
+
+        return column
+
+    def __parse(self, col_index, rows, opcodes):
+        self.col_index = col_index
+        self.gates = []
+        self.controls = []
+        self.anticontrols = []
+        self.swaps = []
+        self.probes = []
+
+        for row, opcode in zip(rows, opcodes):
+            if opcode == CONTROL:
+                self.controls.append(row)
+            elif opcode == ANTICONTROL:
+                self.anticontrols.append(row)
+            elif opcode == SWAP:
+                self.swaps.append(row)
+            elif opcode == PROBE:
+                self.probes.append(row)
+            elif opcode in GATE_NAMES and opcode != IDENTITY:
+                self.gates.append((row, GATE_NAMES[opcode]))
+
+        self.swap = tuple(self.swaps) if len(self.swaps) == 2 else None
+
+        self.control_mask = bitmask(self.controls)
+        self.anticontrol_mask = bitmask(self.anticontrols)
+        self.swap_mask = bitmask(self.swaps)
+        self.probe_mask = bitmask(self.probes)
+
+
+class CompiledCircuit:
+    """
+    A circuit grid compiled once per request and shared by the Cirq translation, the native
+    engines, the engine dispatcher, admission and cache keys: an int8 opcode grid, indexed
+    [row][col] and cut to the shortest row as Simulator's transpose does, and the parsed
+    columns that are not barriers.
+    """
+    __slots__ = ('num_qubits', 'depth', 'opcodes', 'columns')
+
+    def __init__(self, opcodes):
+        """
+        Args:
+            opcodes: the int8 opcode grid, indexed [row][col]
+        """
+        opcodes.flags.writeable = False
+
+        self.num_qubits, self.depth = opcodes.shape
+        self.opcodes = opcodes
+
+        # The occupied cells of the whole grid are found at once, in column order
+        by_column = opcodes.T
+        cols, rows = np.nonzero(by_column)
+        cells = by_column[cols, rows].tolist()
+        bounds = np.searchsorted(cols, np.arange(self.depth + 1)).tolist()
+        rows = rows.tolist()
+
+        barriers = (opcodes == BARRIER).any(axis=0)
+        self.columns = [Column.from_cells(col_index, rows[bounds[col_index]:bounds[col_index + 1]], cells[bounds[col_index]:bounds[col_index + 1]])
+                        for col_index in np.flatnonzero(~barriers).tolist()]
+
+    def labels(self) -> list:
+        """
+        Returns:
+            the grid as gate labels, indexed [row][col], with '0' for empty cells and '?' for
+            cells that were not on the palette
+        """
+        return [[LABELS.get(opcode, '?') for opcode in row] for row in self.opcodes.tolist()]
+
+    def fingerprint(self) -> bytes:
+        """
+        Returns:
+            a digest of the opcode grid and its shape, equal for grids that simulate the same
+        """
+        digest = hashlib.sha256(np.array(self.opcodes.shape, dtype=np.int64).tobytes())
+        digest.update(self.opcodes.tobytes())
+
+        return digest.digest()
+
+
+def compile_circuit(gates) -> CompiledCircuit:
+    """
+    Compiles a circuit grid, or returns it as it is if it is already compiled
+
+    Args:
+        gates: the circuit grid, indexed [row][col]
+
+    Returns:
+        the CompiledCircuit
+
+    Raises:
+        ValueError: if the grid is not a list of rows
+    """
+    if isinstance(gates, CompiledCircuit):
+        return gates
+
+    if not isinstance(gates, (list, tuple)) or not all(isinstance(row, (list, tuple)) for row in gates):
+        raise ValueError('The circuit must be a list of rows of gates')
+
+    depth = min((len(row) for row in gates), default=0)
+    opcodes = encode([list(row[:depth]) for row in gates]).reshape(len(gates), depth)
+
+    return CompiledCircuit(opcodes)
+
+
+def parse_columns(columns) -> list:
+    """
+    Parses the transposed gate grid, skipping barrier columns
+
+    Args:
+        columns: a CompiledCircuit, or a list of columns, each a list of gates indexed by row
+
+    Returns:
+        a list of parsed Column objects
+    """
+    if isinstance(columns, CompiledCircuit):
+        return columns.columns
+
+    if not columns:
+        return []
+
+    return CompiledCircuit(np.ascontiguousarray(encode([list(column) for column in columns]).T)).columns
@@ -0,0 +1,126 @@
+"""
+    File: dispatcher.py
+    Date: 10-2026
+"""
+
+import logging
+from confighome.aer_backend import aer_available
+from confighome.columns import compile_circuit
+from confighome.stabilizer import is_clifford
+from confighome.sparse import densify_threshold, max_support
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ('auto', 'cirq', 'numpy', 'stabilizer', 'sparse', 'aer')
+
+# Largest dense circuit the NumPy engine runs faster than Cirq. From manage.py benchmark_simulator,
+# NumPy is 3-5x faster up to 14 qubits, about 1.5x at 16, and level with Cirq by 18, as Cirq's
+# moment-by-moment probe sweep stops dominating its cost.
+NUMPY_MAX_QUBITS = 16
+
+# The stabilizer engine finds the distribution over the measured qubits one outcome at a time, at
+# about 30us an outcome (2.1s for 16 measured qubits against 9ms on NumPy), so a Clifford circuit
+# that fits a dense engine only goes to the stabilizer tableau when few of its qubits are measured
+STABILIZER_MAX_MEASURED = 10
+
+# Above that, Qiskit Aer beats Cirq even on one core (3.6s against 5.5s at 20 qubits, 10.6s against
+# 24s at 22), and its OpenMP state updates spread wider circuits over every core
+
+
+class CircuitFeatures:
+    """
+    The properties of a circuit that decide which engine runs it cheapest
+    """
+    def __init__(self, gates):
+        circuit = compile_circuit(gates)
+        columns = circuit.columns
+
+        self.qubits = circuit.num_qubits
+        self.depth = len(columns)
+        self.clifford = is_clifford(columns)
+        self.probes = sum(len(column.probes) for column in columns)
+        self.controlled_columns = sum(1 for column in columns if column.control_mask | column.anticontrol_mask)
+        self.max_support = max_support(columns, self.qubits)
+
+    def as_dict(self) -> dict:
+        """
+        Returns:
+            the features as a dictionary, for logs
+        """
+        return {
+            'qubits': self.qubits,
+            'depth': self.depth,
+            'clifford': self.clifford,
+            'probes': self.probes,
+            'controlled_columns': self.controlled_columns,
+            'max_support': self.max_support,
+        }
+
+
+class EngineChoice:
+    """
+    The engine picked for a circuit, and why
+    """
+    def __init__(self, engine, reason, features=None):
+        self.engine = engine
+        self.reason = reason
+        self.features = features
+
+    def __repr__(self):
+        return f'EngineChoice({self.engine!r}, {self.reason!r})'
+
+
+def choose_engine(gates, engine='auto', num_measured=None, max_dense_qubits=NUMPY_MAX_QUBITS) -> EngineChoice:
+    """
+    Picks the cheapest engine that can run a circuit, unless one was asked for:
+    Clifford circuits go to the stabilizer tableau, which is polynomial in the qubits, when at
+    most STABILIZER_MAX_MEASURED qubits are measured or the circuit is too wide for a dense run;
+    circuits whose support can never reach the dense threshold (few or no H gates) go to
+    the sparse engine; small dense circuits go to the NumPy engine, which probes as it sweeps;
+    and the rest go to Qiskit Aer, or Cirq if Aer is not installed. The choice is logged, at
+    debug level, with the features behind it.
+
+    Args:
+        gates: the circuit grid, indexed [row][col], or its CompiledCircuit
+        engine: the requested engine, or 'auto'
+        num_measured: the number of qubits measured at the end, all of them if not given
+        max_dense_qubits: the widest circuit a dense engine may run
+
+    Returns:
+        the EngineChoice
+
+    Raises:
+        ValueError: if the requested engine does not exist, or is the stabilizer engine and the
+            circuit is not Clifford
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {', '.join(ENGINES)}")
+
+    if engine == 'stabilizer' and not is_clifford(compile_circuit(gates).columns):
+        raise ValueError('The stabilizer engine only runs Clifford circuits: no T gates, and at most one control on X, Y and Z')
+
+    if engine != 'auto':
+        choice = EngineChoice(engine, 'requested')
+        logger.debug('Simulating on %s: %s', choice.engine, choice.reason)
+        return choice
+
+    features = CircuitFeatures(gates)
+    threshold = densify_threshold(features.qubits)
+    num_measured = features.qubits if num_measured is None else num_measured
+
+    if features.clifford and num_measured <= STABILIZER_MAX_MEASURED:
+        choice = EngineChoice('stabilizer', f'Clifford gates only, with {num_measured} measured qubits', features)
+    elif features.clifford and features.qubits > max_dense_qubits:
+        choice = EngineChoice('stabilizer', f'Clifford gates only, on {features.qubits} qubits, too many for a dense run', features)
+    elif features.max_support < threshold:
+        choice = EngineChoice('sparse', f'at most {features.max_support} nonzero amplitudes, under the dense threshold of {threshold}', features)
+    elif features.qubits <= NUMPY_MAX_QUBITS:
+        choice = EngineChoice('numpy', f'{features.qubits} qubits with {features.probes} probes fit the NumPy engine', features)
+    elif aer_available():
+        choice = EngineChoice('aer', f'{features.qubits} dense qubits, run on every core', features)
+    else:
+        choice = EngineChoice('cirq', f'{features.qubits} dense qubits, and Qiskit Aer is not installed', features)
+
+    logger.debug('Simulating on %s: %s %s', choice.engine, choice.reason, features.as_dict())
+
+    return choice
@@ -0,0 +1,108 @@
+"""
+    File: encoding.py
+    Date: 10-2026
+"""
+
+import base64
+import json
+import struct
+import numpy as np
+
+ENCODINGS = ('json', 'base64', 'binary')
+BINARY_CONTENT_TYPE = 'application/octet-stream'
+
+# Little-endian NumPy types for each dtype a client can ask for
+DTYPES = {
+    'float32': '<f4',
+    'float64': '<f8',
+}
+
+
+def negotiate(data, accept='') -> tuple:
+    """
+    Picks the encoding of the state vector for a /simulate response. Clients ask for one with an
+    'encoding' field in the request, or with an Accept header of application/octet-stream.
+
+    Args:
+        data: the parsed request body
+        accept: the request's Accept header
+
+    Returns:
+        an (encoding, dtype) tuple
+
+    Raises:
+        ValueError: if the encoding or dtype is not supported
+    """
+    default = 'binary' if BINARY_CONTENT_TYPE in (accept or '') else 'json'
+    encoding = data.get('encoding', default)
+    dtype = data.get('dtype', 'float32')
+
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown encoding '{encoding}', expected one of {', '.join(ENCODINGS)}")
+    if dtype not in DTYPES:
+        raise ValueError(f"Unknown dtype '{dtype}', expected one of {', '.join(DTYPES)}")
+
+    return encoding, dtype
+
+
+def encode_values(values, dtype='float32') -> bytes:
+    """
+    Packs probabilities into a little-endian buffer, straight from an array if given one
+
+    Args:
+        values: the probabilities, as a list or NumPy array
+        dtype: 'float32' or 'float64'
+
+    Returns:
+        the raw bytes
+    """
+    return np.asarray(values, dtype=DTYPES[dtype]).tobytes()
+
+
+def encode_base64(values, dtype='float32') -> dict:
+    """
+    Packs probabilities into a base64 string, for clients that want JSON
+
+    Args:
+        values: the probabilities, as a list or NumPy array
+        dtype: 'float32' or 'float64'
+
+    Returns:
+        a {'dtype', 'length', 'data'} dictionary
+    """
+    return {'dtype': dtype, 'length': len(values), 'data': base64.b64encode(encode_values(values, dtype)).decode('ascii')}
+
+
+def pack_binary(header, values, dtype='float32') -> bytes:
+    """
+    Frames a response as a 4 byte little-endian header length, a UTF-8 JSON header and the
+    probability buffer. The header gains the dtype and length of the buffer.
+
+    Args:
+        header: the JSON-serializable fields of the response
+        values: the probabilities, as a list or NumPy array
+        dtype: 'float32' or 'float64'
+
+    Returns:
+        the framed bytes
+    """
+    header_bytes = json.dumps({**header, 'dtype': dtype, 'length': len(values)}).encode('utf-8')
+
+    return struct.pack('<I', len(header_bytes)) + header_bytes + encode_values(values, dtype)
+
+
+def unpack_binary(body) -> tuple:
+    """
+    Reads a response framed by pack_binary
+
+    Args:
+        body: the framed bytes
+
+    Returns:
+        a (header, values) tuple, with the values as a NumPy array
+    """
+    (header_length,) = struct.unpack_from('<I', body)
+    header = json.loads(body[4:4 + header_length].decode('utf-8'))
+    values = np.frombuffer(body, dtype=DTYPES[header['dtype']], offset=4 + header_length, count=header['length'])
+
+    return header, values
@@ -0,0 +1,170 @@
+"""
+    File: examples.py
+    Date: 10-2026
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import quote
+
+
+def normalize_name(name) -> str:
+    """
+    Normalizes a circuit name for lookups, ignoring case, punctuation and spacing
+
+    Args:
+        name: the circuit name
+
+    Returns:
+        the lowercase words of the name separated by single spaces
+    """
+    return ' '.join(re.findall(r'\w+', name.casefold()))
+
+
+class ExampleCircuit:
+    """
+    An example circuit, with its payload URL-encoded once for links and the API
+    """
+    def __init__(self, file_name, mtime, circuit_data):
+        self.file_name = file_name
+        self.mtime = mtime
+        self.name = circuit_data['title']
+        self.gates = circuit_data['gates']
+        self.data = quote(json.dumps(circuit_data))
+        self.etag = '"' + hashlib.sha256(self.data.encode('utf-8')).hexdigest()[:32] + '"'
+
+    def as_dict(self) -> dict:
+        """
+        Returns:
+            the {'name', 'data'} dictionary used by the templates and /api/get-circuit/
+        """
+        return {'name': self.name, 'data': self.data}
+
+
+class ExampleCircuitRegistry:
+    """
+    The example circuits in static/circuits, loaded on first use.
+
+    Lookups go through an exact and a normalized name index, falling back to the first
+    example (in file name order) whose normalized name contains the query. The directory
+    is checked at most every check_interval seconds, and only files whose modification
+    time changed are parsed again.
+    """
+    def __init__(self, directory, check_interval=2.0, clock=time.monotonic):
+        self.check_interval = check_interval
+
+        self.__directory = directory
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__circuits = {}
+        self.__exact = {}
+        self.__normalized = {}
+        self.__matches = {}
+        self.__checked_at = None
+
+    @property
+    def directory(self) -> str:
+        """
+        Returns:
+            the directory of example files, resolving it if it was given as a callable
+        """
+        if callable(self.__directory):
+            self.__directory = self.__directory()
+
+        return self.__directory
+
+    def all(self) -> list:
+        """
+        Returns:
+            every example circuit, in file name order
+        """
+        self.__refresh()
+
+        return [self.__circuits[file_name] for file_name in sorted(self.__circuits)]
+
+    def find(self, name):
+        """
+        Finds an example circuit by name
+
+        Args:
+            name: the exact title, or any part of it
+
+        Returns:
+            the ExampleCircuit, or None if nothing matches
+        """
+        self.__refresh()
+
+        circuit = self.__exact.get(name)
+        if circuit is not None:
+            return circuit
+
+        query = normalize_name(name)
+        circuit = self.__normalized.get(query)
+        if circuit is not None:
+            return circuit
+
+        circuit = self.__matches.get(query)
+        if circuit is None:
+            circuit = next((c for c in self.all() if query in normalize_name(c.name)), None)
+
+            # Only hits are remembered, so arbitrary queries cannot grow the index
+            if circuit is not None:
+                self.__matches[query] = circuit
+
+        return circuit
+
+    def __refresh(self):
+        """
+        Reloads new and changed files, and forgets deleted ones, if the directory is due a check
+        """
+        now = self.__clock()
+        if self.__checked_at is not None and now - self.__checked_at < self.check_interval:
+            return
+
+        with self.__lock:
+            if self.__checked_at is not None and now - self.__checked_at < self.check_interval:
+                return
+
+            circuits = {}
+            changed = False
+
+            for file_name in os.listdir(self.directory):
+                if not file_name.endswith('.json'):
+                    continue
+
+                mtime = os.stat(os.path.join(self.directory, file_name)).st_mtime_ns
+                current = self.__circuits.get(file_name)
+
+                if current is not None and current.mtime == mtime:
+                    circuits[file_name] = current
+                    continue
+
+                with open(os.path.join(self.directory, file_name), 'r', encoding='utf-8') as f:
+                    circuits[file_name] = ExampleCircuit(file_name, mtime, json.load(f))
+                changed = True
+
+            if changed or circuits.keys() != self.__circuits.keys():
+                self.__index(circuits)
+
+            self.__checked_at = now
+
+    def __index(self, circuits):
+        """
+        Rebuilds the name indexes. Earlier file names win when two examples share a name.
+        """
+        exact = {}
+        normalized = {}
+
+        for file_name in sorted(circuits):
+            circuit = circuits[file_name]
+            exact.setdefault(circuit.name, circuit)
+            normalized.setdefault(normalize_name(circuit.name), circuit)
+
+        self.__circuits = circuits
+        self.__exact = exact
+        self.__normalized = normalized
+        self.__matches = {}
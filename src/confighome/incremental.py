@@ -0,0 +1,277 @@
+"""
+    File: incremental.py
+    Date: 10-2026
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from itertools import count
+import numpy as np
+from confighome.checkpoints import CheckpointStore
+from confighome.columns import Column
+from confighome.statevector import StatevectorEngine
+from confighome.workers import SimulationTimeout
+
+session_ids = count()
+
+
+class IncrementalSession:
+    """
+    The sweep of the last circuit simulated for one builder session. The state is checkpointed
+    before every interval-th column and after the last one, so the next edit only re-simulates
+    from the checkpoint at or before its first changed column. Checkpoints live in a shared
+    CheckpointStore, which may evict them, in which case the sweep resumes from an earlier one.
+    """
+    def __init__(self, checkpoint_bytes=64 * 2**20, store=None):
+        self.checkpoint_bytes = checkpoint_bytes
+        self.lock = threading.Lock()
+
+        self.__id = next(session_ids)
+        self.__store = store if store is not None else CheckpointStore()
+        self.__num_qubits = None
+        self.__columns = []
+        self.__checkpoints = set()
+        self.__probes = {}
+
+    def simulate(self, gates, to_measure, timeout=None) -> dict:
+        """
+        Simulates a circuit, resuming from the previous one where their columns agree
+
+        Args:
+            gates: the circuit grid, indexed [row][col]
+            to_measure: list of {'qubit', 'toggle'} dictionaries
+            timeout: optional seconds the sweep may take
+
+        Returns:
+            a {'state_vector', 'probed_values'} dictionary like a simulation result, and
+            'resumed_from', the column the sweep restarted at
+
+        Raises:
+            SimulationTimeout: if the sweep overran
+        """
+        for record in self.stream(gates, to_measure, timeout):
+            pass
+
+        return {key: record[key] for key in ('state_vector', 'probed_values', 'resumed_from')}
+
+    def stream(self, gates, to_measure, timeout=None):
+        """
+        Simulates a circuit like simulate, yielding the probes in the same records as stream_job.
+        Probes before the resumed column are yielded straight away, and the rest as the sweep
+        reaches them. A sweep that overruns or is abandoned forgets the previous circuit, so the
+        next one starts from scratch.
+
+        Args:
+            gates: the circuit grid, indexed [row][col]
+            to_measure: list of {'qubit', 'toggle'} dictionaries
+            timeout: optional seconds the sweep may take, checked before every column
+
+        Yields:
+            {'type': 'probe', 'row', 'col', 'value'} records, then a {'type': 'result'} record
+            with the fields returned by simulate
+
+        Raises:
+            SimulationTimeout: if the sweep overran
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        num_qubits = len(gates)
+        columns = [[str(gate) for gate in column] for column in zip(*gates)]
+
+        if num_qubits != self.__num_qubits:
+            self.close()
+            self.__num_qubits = num_qubits
+
+        changed = next((i for i, (old, new) in enumerate(zip(self.__columns, columns)) if old != new),
+                       min(len(self.__columns), len(columns)))
+        start, state = self.__resume_point(changed)
+        finished = False
+
+        try:
+            engine = StatevectorEngine(num_qubits)
+            if state is not None:
+                # The engine updates its state in place, and spilled checkpoints are read-only
+                engine.state = np.array(state)
+            interval = self.__interval(num_qubits, len(columns))
+
+            kept = {i for i in self.__checkpoints if i <= start and i % interval == 0}
+            self.__store.discard([(self.__id, i) for i in self.__checkpoints - kept])
+            self.__checkpoints = kept
+            probes = {i: values for i, values in self.__probes.items() if i < start}
+
+            for col_index in sorted(probes):
+                for probe in probes[col_index]:
+                    yield {'type': 'probe', **probe}
+
+            for col_index in range(start, len(columns)):
+                if deadline is not None and time.monotonic() > deadline:
+                    raise SimulationTimeout(f'Simulation took longer than {timeout:g} seconds')
+                if col_index % interval == 0 and col_index not in self.__checkpoints:
+                    self.__checkpoint(col_index, engine.state)
+                if 'b' in columns[col_index]:
+                    continue
+
+                column = Column(columns[col_index], col_index)
+                probes[col_index] = [{'row': row, 'col': col_index, 'value': engine.probability_of_one(row)} for row in column.probes]
+                for probe in probes[col_index]:
+                    yield {'type': 'probe', **probe}
+                engine.apply_column(column)
+
+            # The final state is kept too, as most edits append to the end of the circuit
+            if len(columns) not in self.__checkpoints:
+                self.__checkpoint(len(columns), engine.state)
+
+            self.__columns = columns
+            self.__probes = probes
+            finished = True
+        finally:
+            # Checkpoints of a half finished sweep do not match the columns kept from the last one
+            if not finished:
+                self.close()
+
+        measured = [item['qubit'] for item in to_measure if item['toggle'] == 1 and item['qubit'] < num_qubits]
+
+        yield {
+            'type': 'result',
+            'status': 'ok',
+            'state_vector': engine.marginal(measured).tolist(),
+            'probed_values': [probe for col_index in sorted(probes) for probe in probes[col_index]],
+            'resumed_from': start,
+        }
+
+    def close(self):
+        """
+        Forgets the previous circuit and frees its checkpoints
+        """
+        self.__store.discard([(self.__id, i) for i in self.__checkpoints])
+        self.__columns = []
+        self.__checkpoints = set()
+        self.__probes = {}
+
+    def __resume_point(self, changed) -> tuple:
+        """
+        Finds the latest checkpoint at or before a column that is still in the store
+
+        Returns:
+            a (column, state) tuple, with a state of None for the start of the circuit
+        """
+        for col_index in sorted(self.__checkpoints, reverse=True):
+            if col_index > changed:
+                continue
+            state = self.__store.get((self.__id, col_index))
+            if state is not None:
+                return col_index, state
+
+        return 0, None
+
+    def __checkpoint(self, col_index, state):
+        """
+        Stores the state before a column. The start of the circuit is rebuilt rather than stored.
+        """
+        if col_index > 0:
+            self.__store.put((self.__id, col_index), state.copy())
+            self.__checkpoints.add(col_index)
+
+    def __interval(self, num_qubits, num_columns) -> int:
+        """
+        Spaces the checkpoints out so that they fit in checkpoint_bytes
+
+        Returns:
+            the number of columns between checkpoints
+        """
+        state_bytes = 2**num_qubits * 8
+        max_checkpoints = max(1, self.checkpoint_bytes // state_bytes - 1)
+
+        return max(1, math.ceil(num_columns / max_checkpoints))
+
+
+class IncrementalSimulations:
+    """
+    The incremental sweeps of the most recently active builder sessions, in this process, with
+    their checkpoints sharing one CheckpointStore
+    """
+    def __init__(self, max_sessions=64, checkpoint_bytes=64 * 2**20, store=None):
+        self.max_sessions = max_sessions
+        self.checkpoint_bytes = checkpoint_bytes
+        self.store = store if store is not None else CheckpointStore()
+
+        self.__sessions = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def simulate(self, session_key, gates, to_measure, timeout=None) -> dict:
+        """
+        Simulates a circuit for a session, resuming from the session's previous circuit
+
+        Args:
+            session_key: identifies the builder session
+            gates: the circuit grid, indexed [row][col]
+            to_measure: list of {'qubit', 'toggle'} dictionaries
+            timeout: optional seconds the sweep may take
+
+        Returns:
+            the result of IncrementalSession.simulate
+        """
+        session = self.__session(session_key)
+
+        with session.lock:
+            return session.simulate(gates, to_measure, timeout)
+
+    def stream(self, session_key, gates, to_measure, timeout=None):
+        """
+        Streams a circuit for a session, resuming from the session's previous circuit. The
+        session is held until the stream finishes or is closed.
+
+        Args:
+            session_key: identifies the builder session
+            gates: the circuit grid, indexed [row][col]
+            to_measure: list of {'qubit', 'toggle'} dictionaries
+            timeout: optional seconds the sweep may take
+
+        Yields:
+            the records of IncrementalSession.stream
+        """
+        session = self.__session(session_key)
+
+        with session.lock:
+            yield from session.stream(gates, to_measure, timeout)
+
+    def __session(self, session_key) -> IncrementalSession:
+        """
+        Finds or starts the session's sweep, closing the least recently used ones past max_sessions
+        """
+        evicted = []
+
+        with self.__lock:
+            session = self.__sessions.get(session_key)
+            if session is None:
+                session = self.__sessions[session_key] = IncrementalSession(self.checkpoint_bytes, self.store)
+            self.__sessions.move_to_end(session_key)
+
+            while len(self.__sessions) > self.max_sessions:
+                evicted.append(self.__sessions.popitem(last=False)[1])
+
+        self.__close(evicted)
+
+        return session
+
+    def clear(self):
+        """
+        Forgets every session
+        """
+        with self.__lock:
+            sessions = list(self.__sessions.values())
+            self.__sessions.clear()
+
+        self.__close(sessions)
+
+    def __close(self, sessions):
+        """
+        Frees the checkpoints of sessions that were dropped, once they finish any running sweep
+        """
+        for session in sessions:
+            with session.lock:
+                session.close()
+
+    def __len__(self):
+        return len(self.__sessions)
@@ -0,0 +1,81 @@
+"""
+    File: benchmark_simulator.py
+    Date: 10-2026
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from confighome.benchmarks import compare, load_baseline, run_benchmarks, save_baseline, sweep_cases
+from confighome.simulator import ENGINES
+
+
+def int_list(value) -> list:
+    """
+    Parses '1-20' or '1,4,8' style arguments
+    """
+    values = []
+    for part in value.split(','):
+        if '-' in part:
+            start, end = part.split('-')
+            values.extend(range(int(start), int(end) + 1))
+        else:
+            values.append(int(part))
+    return values
+
+
+def float_list(value) -> list:
+    return [float(part) for part in value.split(',')]
+
+
+def str_list(value) -> list:
+    return value.split(',')
+
+
+class Command(BaseCommand):
+    help = 'Times the simulator stages over a sweep of random circuits, optionally against a stored baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--qubits', type=int_list, default=int_list('1-20'), help="qubit counts, such as '1-20' or '2,4,8'")
+        parser.add_argument('--columns', type=int_list, default=[10], help='column counts')
+        parser.add_argument('--probe-density', type=float_list, default=[0.0, 0.2], help='chances of a cell being a probe')
+        parser.add_argument('--control-density', type=float_list, default=[0.0, 0.3], help='chances of a cell being a control')
+        parser.add_argument('--engine', type=str_list, default=['cirq'], help=f"engines, from {', '.join(ENGINES)}")
+        parser.add_argument('--repeat', type=int, default=3, help='runs of each case, keeping the fastest')
+        parser.add_argument('--seed', type=int, default=0, help='seed of the random circuits')
+        parser.add_argument('--baseline', help='baseline JSON file to compare against')
+        parser.add_argument('--save', help='write the results to this JSON file, to use as a baseline later')
+        parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown as a fraction of the baseline')
+        parser.add_argument('--min-delta', type=float, default=1.0, help='allowed slowdown in milliseconds')
+
+    def handle(self, *args, **options):
+        unknown = set(options['engine']) - set(ENGINES)
+        if unknown:
+            raise CommandError(f"Unknown engine {', '.join(sorted(unknown))}, expected one of {', '.join(ENGINES)}")
+
+        cases = sweep_cases(options['qubits'], options['columns'], options['probe_density'],
+                            options['control_density'], options['engine'])
+        results = run_benchmarks(cases, options['repeat'], options['seed'], progress=self.report)
+
+        if options['save']:
+            save_baseline(results, options['save'])
+            self.stdout.write(f"Saved {len(cases)} cases to {options['save']}")
+
+        if options['baseline']:
+            try:
+                regressions = compare(results, load_baseline(options['baseline']), options['threshold'], options['min_delta'])
+            except (OSError, ValueError) as e:
+                raise CommandError(str(e))
+
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(
+                    f"{regression['case']} {regression['stage']}: {regression['baseline']:.2f} ms -> "
+                    f"{regression['current']:.2f} ms ({regression['ratio']:.2f}x)"
+                ))
+
+            if regressions:
+                raise CommandError(f'{len(regressions)} stages are slower than the baseline')
+
+            self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
+
+    def report(self, name, timings):
+        stages = '  '.join(f'{stage}={milliseconds:.2f}ms' for stage, milliseconds in timings.items())
+        self.stdout.write(f'{name:<32} {stages}')
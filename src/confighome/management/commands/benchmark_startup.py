@@ -0,0 +1,30 @@
+"""
+    File: benchmark_startup.py
+    Date: 10-2026
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from confighome.benchmarks import IMPORT_BUDGET_SECONDS, measure_startup
+
+
+class Command(BaseCommand):
+    help = 'Times importing the views in a fresh worker, and fails if it is over budget or loads a simulation backend'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--budget', type=float, default=IMPORT_BUDGET_SECONDS, help='allowed import time in seconds')
+        parser.add_argument('--repeat', type=int, default=3, help='fresh imports to run, keeping the fastest')
+
+    def handle(self, *args, **options):
+        runs = [measure_startup(settings.SETTINGS_MODULE, settings.BASE_DIR) for _ in range(options['repeat'])]
+        seconds = min(run['seconds'] for run in runs)
+        loaded = sorted({module for run in runs for module in run['loaded']})
+
+        self.stdout.write(f'Imported confighome.views in {seconds:.3f}s, the budget is {options["budget"]:g}s')
+
+        if loaded:
+            raise CommandError(f"Importing the views loaded {', '.join(loaded)}")
+        if seconds > options['budget']:
+            raise CommandError(f'Importing the views took {seconds:.3f}s, over the budget of {options["budget"]:g}s')
+
+        self.stdout.write(self.style.SUCCESS('Start-up is within budget'))
@@ -0,0 +1,27 @@
+"""
+    File: precompute_examples.py
+    Date: 10-2026
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from confighome.precompute import precompute_examples
+from confighome.views import example_registry
+
+
+class Command(BaseCommand):
+    help = 'Simulates the example circuits in static/circuits and stores the results for workers to serve directly'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=settings.EXAMPLE_RESULTS_DIR,
+                            help='directory to write the results to (default: EXAMPLE_RESULTS_DIR)')
+
+    def handle(self, *args, **options):
+        try:
+            written = precompute_examples(example_registry, options['output'])
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        for file_name in written:
+            self.stdout.write(f'  {file_name}')
+        self.stdout.write(self.style.SUCCESS(f"Precomputed {len(written)} example circuits into {options['output']}"))
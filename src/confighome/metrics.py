@@ -0,0 +1,118 @@
+"""
+    File: metrics.py
+    Date: 10-2026
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+
+
+class StageTimer:
+    """
+    Times the stages of a single request, in the order they ran
+    """
+    def __init__(self, clock=time.perf_counter):
+        self.durations = {}
+        self.__clock = clock
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Times the block inside the with statement, adding to any earlier time for the same stage
+
+        Args:
+            name: the name of the stage
+        """
+        start = self.__clock()
+        try:
+            yield
+        finally:
+            self.add(name, (self.__clock() - start) * 1000)
+
+    def add(self, name, milliseconds):
+        """
+        Adds time to a stage, such as timings sent back from a worker process
+
+        Args:
+            name: the name of the stage
+            milliseconds: the time to add
+        """
+        self.durations[name] = self.durations.get(name, 0) + milliseconds
+
+    def update(self, durations):
+        """
+        Adds every stage from another timer's durations
+
+        Args:
+            durations: a dictionary of stage names to milliseconds
+        """
+        for name, milliseconds in durations.items():
+            self.add(name, milliseconds)
+
+    def header(self) -> str:
+        """
+        Returns:
+            the durations formatted as a Server-Timing header value
+        """
+        return ', '.join(f'{name};dur={milliseconds:.2f}' for name, milliseconds in self.durations.items())
+
+
+class StageMetrics:
+    """
+    Aggregates stage timings across requests, broken down by qubit count.
+
+    Counts and maxima are exact. Percentiles come from the most recent samples of each
+    stage, so memory stays fixed however long the server runs.
+    """
+    def __init__(self, max_samples=1024):
+        self.max_samples = max_samples
+        self.__series = {}
+        self.__lock = threading.Lock()
+
+    def record(self, durations, qubits):
+        """
+        Adds one request's stage timings
+
+        Args:
+            durations: a dictionary of stage names to milliseconds
+            qubits: the number of qubits in the simulated circuit
+        """
+        with self.__lock:
+            for name, milliseconds in durations.items():
+                series = self.__series.get((name, qubits))
+                if series is None:
+                    series = self.__series[(name, qubits)] = {'count': 0, 'max': 0.0, 'samples': deque(maxlen=self.max_samples)}
+
+                series['count'] += 1
+                series['max'] = max(series['max'], milliseconds)
+                series['samples'].append(milliseconds)
+
+    def snapshot(self) -> dict:
+        """
+        Returns:
+            a {stage: {qubits: {'count', 'p50', 'p95', 'max'}}} dictionary, in milliseconds
+        """
+        with self.__lock:
+            series = {key: (value['count'], value['max'], list(value['samples'])) for key, value in self.__series.items()}
+
+        stages = {}
+        for (name, qubits), (count, maximum, samples) in sorted(series.items()):
+            p50, p95 = np.percentile(samples, [50, 95])
+            stages.setdefault(name, {})[str(qubits)] = {
+                'count': count,
+                'p50': round(float(p50), 3),
+                'p95': round(float(p95), 3),
+                'max': round(maximum, 3),
+            }
+
+        return stages
+
+    def clear(self):
+        """
+        Removes every recorded timing
+        """
+        with self.__lock:
+            self.__series.clear()
@@ -0,0 +1,139 @@
+"""
+    File: optimizer.py
+    Date: 10-2026
+"""
+
+import numpy as np
+from confighome.backends import lazy_import
+
+cirq = lazy_import('cirq')
+
+
+def optimize_circuit(circuit: 'cirq.Circuit') -> 'cirq.Circuit':
+    """
+    Shrinks a parsed circuit before simulation. Identities are dropped, adjacent
+    self-inverse pairs (such as back-to-back CNOTs or H gates) are
+    cancelled, runs of single qubit gates on a wire are fused into one 2x2 matrix,
+    and the result is packed into the fewest moments.
+
+    Tagged operations (the probes) are never removed, and nothing is fused across
+    them, so every probe still sees the state of its wire at that point.
+
+    Args:
+        circuit: the Cirq circuit generated from the grid
+
+    Returns:
+        an equivalent circuit with fewer operations and moments
+    """
+    operations = [op for op in circuit.all_operations() if not _is_identity(op)]
+    operations = _cancel_self_inverse_pairs(operations)
+    operations = _fuse_single_qubit_runs(operations)
+
+    # Appending with the default EARLIEST strategy packs operations into the fewest moments
+    return cirq.Circuit(operations)
+
+
+def _is_identity(op) -> bool:
+    """
+    Checks if an untagged operation is an identity, controlled or not
+
+    Args:
+        op: the Cirq operation
+
+    Returns:
+        True if the operation does nothing
+    """
+    if isinstance(op, cirq.TaggedOperation):
+        return False
+
+    if isinstance(op, cirq.ControlledOperation):
+        op = op.sub_operation
+
+    return isinstance(op.gate, cirq.IdentityGate)
+
+
+def _is_self_inverse(op) -> bool:
+    """
+    Checks if an untagged operation undoes itself
+
+    Args:
+        op: the Cirq operation
+
+    Returns:
+        True if applying the operation twice is the identity
+    """
+    if isinstance(op, cirq.TaggedOperation):
+        return False
+
+    return cirq.inverse(op, None) == op
+
+
+def _cancel_self_inverse_pairs(operations) -> list:
+    """
+    Removes pairs of identical self-inverse operations with nothing between them on their qubits
+
+    Args:
+        operations: list of operations in circuit order
+
+    Returns:
+        the operations with cancelled pairs removed
+    """
+    kept = []
+    last_on_qubit = {}
+
+    for op in operations:
+        previous = {last_on_qubit[q][-1] if last_on_qubit.get(q) else None for q in op.qubits}
+
+        if len(previous) == 1:
+            index = previous.pop()
+            if index is not None and kept[index] == op and _is_self_inverse(op):
+                kept[index] = None
+                for q in op.qubits:
+                    last_on_qubit[q].pop()
+                continue
+
+        for q in op.qubits:
+            last_on_qubit.setdefault(q, []).append(len(kept))
+        kept.append(op)
+
+    return [op for op in kept if op is not None]
+
+
+def _fuse_single_qubit_runs(operations) -> list:
+    """
+    Fuses each run of single qubit operations on a wire into one matrix gate
+
+    Args:
+        operations: list of operations in circuit order
+
+    Returns:
+        the operations with each run replaced by at most one operation
+    """
+    fused = []
+    runs = {}
+
+    def flush(qubit):
+        run = runs.pop(qubit, [])
+        if len(run) == 1:
+            fused.append(run[0])
+        elif run:
+            matrix = np.eye(2, dtype=np.complex128)
+            for op in run:
+                matrix = cirq.unitary(op) @ matrix
+            # Runs that multiply out to a global phase, like H H or S S S S, vanish
+            if not cirq.allclose_up_to_global_phase(matrix, np.eye(2)):
+                fused.append(cirq.MatrixGate(matrix).on(qubit))
+
+    for op in operations:
+        if len(op.qubits) == 1 and not isinstance(op, cirq.TaggedOperation) and cirq.has_unitary(op):
+            runs.setdefault(op.qubits[0], []).append(op)
+            continue
+
+        for q in op.qubits:
+            flush(q)
+        fused.append(op)
+
+    for q in list(runs):
+        flush(q)
+
+    return fused
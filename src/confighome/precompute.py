@@ -0,0 +1,185 @@
+"""
+    File: precompute.py
+    Date: 10-2026
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import numpy as np
+from confighome.simulator import Simulator, run_job
+
+INDEX_FILE = 'index.json'
+FORMAT_VERSION = 1
+
+
+def example_key(gates) -> str:
+    """
+    Builds a hash of what a circuit grid simulates, so an example matches however the editor
+    pads it. Rows are cut to the shortest one, as the simulator does, and trailing empty
+    columns are dropped. The measurement toggles are left out, since the stored probabilities
+    cover every qubit.
+
+    Args:
+        gates: the circuit grid, indexed [row][col]
+
+    Returns:
+        a hex digest identifying the circuit
+    """
+    columns = [[str(gate) for gate in column] for column in zip(*gates)]
+    while columns and all(gate == '0' for gate in columns[-1]):
+        columns.pop()
+
+    canonical = json.dumps({'qubits': len(gates), 'columns': columns}, separators=(',', ':'))
+
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def precompute_examples(registry, directory, simulator_class=Simulator) -> list:
+    """
+    Simulates every example circuit and writes the results to a directory: one .npy file of
+    probabilities over all qubits per circuit, and an index of the probes and the etag of the
+    example file each result was computed from
+
+    Args:
+        registry: the ExampleCircuitRegistry to read the examples from
+        directory: the directory to write the results to, created if missing
+        simulator_class: the class used to simulate the circuits
+
+    Returns:
+        the file names of the examples that were written
+
+    Raises:
+        RuntimeError: if an example fails to simulate
+    """
+    os.makedirs(directory, exist_ok=True)
+    entries = {}
+
+    for circuit in registry.all():
+        to_measure = [{'qubit': qubit, 'toggle': 1} for qubit in range(len(circuit.gates))]
+        outcome = run_job({'circuit': {'gates': circuit.gates}, 'to_measure': to_measure}, simulator_class)
+
+        if outcome['status'] != 'ok':
+            raise RuntimeError(f"{circuit.file_name}: {outcome['message']}")
+
+        key = example_key(circuit.gates)
+        array_path = os.path.join(directory, f'{key}.npy')
+
+        # Replaced rather than rewritten in place, as workers may have the old file memory-mapped
+        with open(array_path + '.tmp', 'wb') as f:
+            np.save(f, np.asarray(outcome['state_vector'], dtype=np.float64))
+        os.replace(array_path + '.tmp', array_path)
+
+        entries[key] = {
+            'file_name': circuit.file_name,
+            'etag': circuit.etag,
+            'qubits': len(circuit.gates),
+            'probed_values': outcome['probed_values'],
+        }
+
+    # The index is swapped in last, so running workers never see it point at missing arrays
+    index_path = os.path.join(directory, INDEX_FILE)
+    with open(index_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'version': FORMAT_VERSION, 'circuits': entries}, f)
+    os.replace(index_path + '.tmp', index_path)
+
+    return sorted(entry['file_name'] for entry in entries.values())
+
+
+class PrecomputedResults:
+    """
+    Serves the results written by precompute_examples. The probability arrays are memory-mapped
+    read-only, so every worker shares the same pages, and each request only sums them down to
+    its measured qubits.
+
+    A result is served only while the etag of its example file matches the one it was computed
+    from, so an edited circuit falls back to the simulator until the results are rebuilt. The
+    index is reloaded when its file changes, checked at most every check_interval seconds.
+    """
+    def __init__(self, directory, registry, check_interval=2.0, clock=time.monotonic):
+        self.directory = directory
+        self.check_interval = check_interval
+
+        self.__registry = registry
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__entries = {}
+        self.__arrays = {}
+        self.__index_mtime = None
+        self.__checked_at = None
+
+    def get(self, gates, to_measure):
+        """
+        Looks up the result of an example circuit
+
+        Args:
+            gates: the circuit grid, indexed [row][col]
+            to_measure: list of {'qubit', 'toggle'} dictionaries
+
+        Returns:
+            a {'state_vector', 'probed_values'} dictionary like a simulation result, or None if
+            the circuit has no valid precomputed result
+        """
+        self.__refresh()
+
+        key = example_key(gates)
+        entry = self.__entries.get(key)
+        if entry is None or entry['qubits'] != len(gates):
+            return None
+
+        current = {circuit.file_name: circuit.etag for circuit in self.__registry.all()}
+        if current.get(entry['file_name']) != entry['etag']:
+            return None
+
+        probabilities = self.__array(key).reshape([2] * entry['qubits'])
+        measured = {item['qubit'] for item in to_measure if item['toggle'] == 1 and item['qubit'] < entry['qubits']}
+        axes_to_sum_over = tuple(i for i in range(entry['qubits']) if i not in measured)
+
+        return {
+            'state_vector': np.sum(probabilities, axis=axes_to_sum_over).flatten().tolist(),
+            'probed_values': entry['probed_values'],
+        }
+
+    def __array(self, key) -> np.ndarray:
+        """
+        Returns the memory-mapped probabilities of a circuit, opening the file on first use
+        """
+        array = self.__arrays.get(key)
+        if array is None:
+            array = self.__arrays[key] = np.load(os.path.join(self.directory, f'{key}.npy'), mmap_mode='r')
+
+        return array
+
+    def __refresh(self):
+        """
+        Reloads the index if it was written, changed or removed since it was last read
+        """
+        now = self.__clock()
+        if self.__checked_at is not None and now - self.__checked_at < self.check_interval:
+            return
+
+        with self.__lock:
+            if self.__checked_at is not None and now - self.__checked_at < self.check_interval:
+                return
+
+            index_path = os.path.join(self.directory, INDEX_FILE)
+            try:
+                mtime = os.stat(index_path).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+
+            if mtime != self.__index_mtime:
+                entries = {}
+                if mtime is not None:
+                    with open(index_path, 'r', encoding='utf-8') as f:
+                        index = json.load(f)
+                    if index.get('version') == FORMAT_VERSION:
+                        entries = index['circuits']
+
+                self.__entries = entries
+                self.__arrays = {}
+                self.__index_mtime = mtime
+
+            self.__checked_at = now
@@ -34,6 +34,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'confighome',
     'users',
 ]
 
@@ -132,3 +133,59 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
+
+# Simulation
+
+# Number of /simulate results kept in each worker's LRU cache, and how long (seconds) they stay valid
+SIMULATION_CACHE_SIZE = int(os.environ.get('SIMULATION_CACHE_SIZE', 256))
+SIMULATION_CACHE_TTL = int(os.environ.get('SIMULATION_CACHE_TTL', 300))
+
+# Most circuits accepted by a single /simulate_batch request, and the size of the pool that runs them
+SIMULATION_BATCH_LIMIT = int(os.environ.get('SIMULATION_BATCH_LIMIT', 64))
+SIMULATION_BATCH_WORKERS = int(os.environ.get('SIMULATION_BATCH_WORKERS', os.cpu_count() or 1))
+
+# Simulations run in this many separate processes per web worker (0 runs them in the web worker itself)
+SIMULATION_WORKERS = int(os.environ.get('SIMULATION_WORKERS', 2))
+# Wall-clock seconds a single simulation may take before it is cancelled
+SIMULATION_TIMEOUT = float(os.environ.get('SIMULATION_TIMEOUT', 30))
+# Circuits over these budgets are rejected before they are simulated
+SIMULATION_MAX_QUBITS = int(os.environ.get('SIMULATION_MAX_QUBITS', 20))
+SIMULATION_MAX_DEPTH = int(os.environ.get('SIMULATION_MAX_DEPTH', 500))
+SIMULATION_MAX_MEMORY = int(os.environ.get('SIMULATION_MAX_MEMORY', 512 * 2**20))
+# Clifford circuits run on a stabilizer tableau, which scales polynomially, so they get a higher qubit limit
+SIMULATION_MAX_STABILIZER_QUBITS = int(os.environ.get('SIMULATION_MAX_STABILIZER_QUBITS', 200))
+# The tableau finds its final distribution one outcome at a time, at about 30us an outcome, so few
+# enough qubits must be measured for every outcome to be searched within SIMULATION_TIMEOUT
+SIMULATION_MAX_STABILIZER_MEASURED = int(os.environ.get('SIMULATION_MAX_STABILIZER_MEASURED', 16))
+# Circuits with few superpositions run on the sparse engine, whose memory follows the nonzero amplitudes
+SIMULATION_MAX_SPARSE_QUBITS = int(os.environ.get('SIMULATION_MAX_SPARSE_QUBITS', 200))
+# Qiskit Aer spreads dense circuits over every core. Wide circuits still need SIMULATION_MAX_MEMORY
+# raised to match, about 24 bytes per amplitude (e.g. 6 GiB for 28 qubits)
+SIMULATION_MAX_AER_QUBITS = int(os.environ.get('SIMULATION_MAX_AER_QUBITS', 28))
+# Largest number of shots a single /simulate request may sample
+SIMULATION_MAX_SHOTS = int(os.environ.get('SIMULATION_MAX_SHOTS', 10**7))
+# Threads running /simulate_async simulations, and how many may be running or queued before
+# new requests get a 503 telling the client to retry after SIMULATION_RETRY_AFTER seconds
+SIMULATION_ASYNC_WORKERS = int(os.environ.get('SIMULATION_ASYNC_WORKERS', max(SIMULATION_WORKERS, 1)))
+SIMULATION_ASYNC_MAX_PENDING = int(os.environ.get('SIMULATION_ASYNC_MAX_PENDING', 16))
+SIMULATION_RETRY_AFTER = int(os.environ.get('SIMULATION_RETRY_AFTER', 1))
+# Builder sessions whose sweeps are kept for incremental re-simulation, and the bytes of
+# state vector checkpoints each may keep
+SIMULATION_INCREMENTAL_SESSIONS = int(os.environ.get('SIMULATION_INCREMENTAL_SESSIONS', 64))
+SIMULATION_CHECKPOINT_BYTES = int(os.environ.get('SIMULATION_CHECKPOINT_BYTES', 64 * 2**20))
+# Bytes of checkpoints all sessions may keep in memory, and in memory-mapped files once they are
+# spilled to SIMULATION_CHECKPOINT_DIR (the system temporary directory if unset)
+SIMULATION_CHECKPOINT_MEMORY = int(os.environ.get('SIMULATION_CHECKPOINT_MEMORY', 256 * 2**20))
+SIMULATION_CHECKPOINT_DISK = int(os.environ.get('SIMULATION_CHECKPOINT_DISK', 2 * 2**30))
+SIMULATION_CHECKPOINT_DIR = os.environ.get('SIMULATION_CHECKPOINT_DIR')
+# Largest circuit /simulate_unitary returns matrices for, and the number of column unitaries kept
+# for reuse across circuits
+SIMULATION_MAX_UNITARY_QUBITS = int(os.environ.get('SIMULATION_MAX_UNITARY_QUBITS', 6))
+SIMULATION_UNITARY_CACHE_SIZE = int(os.environ.get('SIMULATION_UNITARY_CACHE_SIZE', 1024))
+
+# Seconds between checks of static/circuits for new or edited example circuits
+EXAMPLE_CIRCUITS_CHECK_INTERVAL = float(os.environ.get('EXAMPLE_CIRCUITS_CHECK_INTERVAL', 2))
+# Where `manage.py precompute_examples` writes the example circuit results that workers serve directly
+EXAMPLE_RESULTS_DIR = os.environ.get('EXAMPLE_RESULTS_DIR', BASE_DIR / 'precomputed')
+# Most recent /simulate timings kept per stage and qubit count for the metrics percentiles
+SIMULATION_METRICS_SAMPLES = int(os.environ.get('SIMULATION_METRICS_SAMPLES', 1024))
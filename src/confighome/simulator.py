@@ -4,18 +4,97 @@
     Date: 04-2024
 """
 
-import cirq
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import cached_property
 import numpy as np
-from qiskit import QuantumCircuit, transpile, assemble
-from qiskit.primitives import StatevectorSampler
-from qiskit.visualization import plot_histogram
-from qiskit_aer import Aer
+from confighome.aer_backend import AerEngine
+from confighome.backends import lazy_import
+from confighome.columns import Column, compile_circuit
+from confighome.dispatcher import ENGINES, NUMPY_MAX_QUBITS, choose_engine
+from confighome.statevector import StatevectorEngine
+from confighome.stabilizer import StabilizerEngine
+from confighome.sparse import SparseEngine
+from confighome.unitary import circuit_unitaries
+from confighome.optimizer import optimize_circuit
+from confighome.metrics import StageTimer
+
+# Cirq takes seconds to import, so it is only loaded once a circuit actually needs it
+cirq = lazy_import('cirq')
+
+# Process pool shared by every batch in this worker, created on first use
+_batch_pool = None
+_batch_pool_lock = threading.Lock()
+
+NATIVE_ENGINES = {
+    'numpy': StatevectorEngine,
+    'stabilizer': StabilizerEngine,
+    'sparse': SparseEngine,
+    'aer': AerEngine,
+}
+
+
 class Simulator:
     """
     A class to represent a quantum circuit simulator
     """
-    def __init__(self, gates, to_measure):
-        self.gateMap = {
+    ENGINES = ENGINES
+
+    def __init__(self, gates, to_measure, engine='auto', optimize=True):
+        self.circuit = compile_circuit(gates)
+        self.num_qubits = self.circuit.num_qubits
+        self.to_measure = to_measure
+
+        self.engine = resolve_engine(self.circuit, engine, len(set(self.__measurement_indices())))
+        self.optimize = optimize
+        self.__engine = None
+        self.__engine_probes = None
+        self.__final_state = None
+        self.__probes_generated = False
+
+    @staticmethod
+    def simulate_batch(jobs, max_workers=None) -> list:
+        """
+        Simulates a list of circuits across the shared process pool
+
+        Args:
+            jobs: list of {'circuit': {'gates'}, 'to_measure'} dictionaries, as posted to /simulate
+            max_workers: size of the pool, if it has not been created yet
+
+        Returns:
+            a list of results in the same order as the jobs, each with a 'status' of 'ok' or 'error'
+        """
+        global _batch_pool
+
+        with _batch_pool_lock:
+            if _batch_pool is None:
+                # Forking a threaded web worker can copy a held lock into the children, so they are spawned
+                _batch_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+            pool = _batch_pool
+
+        futures = [pool.submit(run_job, job) for job in jobs]
+        results = []
+
+        for future in futures:
+            try:
+                results.append(future.result())
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory), so start a fresh pool for the next batch
+                with _batch_pool_lock:
+                    if _batch_pool is pool:
+                        pool.shutdown(wait=False)
+                        _batch_pool = None
+                results.append({'status': 'error', 'message': 'Simulation worker stopped unexpectedly'})
+            except Exception as e:
+                results.append({'status': 'error', 'message': str(e)})
+
+        return results
+
+    @cached_property
+    def gateMap(self) -> dict:
+        return {
             'X': cirq.X,
             'Y': cirq.Y,
             'Z': cirq.Z,
@@ -25,23 +104,36 @@ class Simulator:
             'I': cirq.I,
         }
 
-        rowNum = len(gates)
-        self.gates = self.__transpose(gates)
-        self.to_measure = to_measure
+    # The Cirq objects are only built when first used, so the native engines never load Cirq
+
+    @cached_property
+    def qubits(self) -> list:
+        return [cirq.GridQubit(i, 0) for i in range(self.num_qubits)]
+
+    @cached_property
+    def simulator(self) -> 'cirq.Simulator':
+        return cirq.Simulator()
 
-        self.cirq_circuit = cirq.Circuit()
-        self.probed_circuit = cirq.Circuit()
+    @cached_property
+    def cirq_circuit(self) -> 'cirq.Circuit':
+        return cirq.Circuit()
 
-        self.qubits = [cirq.GridQubit(i, 0) for i in range(rowNum)]
-        self.simulator = cirq.Simulator()
+    @cached_property
+    def probed_circuit(self) -> 'cirq.Circuit':
+        return cirq.Circuit()
+
+    @property
+    def uses_cirq(self) -> bool:
+        """
+        Whether the selected engine simulates the generated Cirq circuits
+        """
+        return self.engine == 'cirq'
 
     def generate_cirq_circuit(self):
         """
         Generates a Cirq circuit from the gates and to_measure lists
         """
-        for column in self.gates:
-            if 'b' in column:
-                continue
+        for column in self.circuit.columns:
             self.__parse_column(self.cirq_circuit, column)
 
         # Identity gates to ensure all qubits are measured
@@ -52,14 +144,14 @@ class Simulator:
         """
         Generates a Cirq circuit including measurement probes
         """
+        self.__probes_generated = True
+
         # Identity gates to ensure any probes in first column can still measure.
         for qubit in self.qubits:
             self.probed_circuit.append(cirq.I(qubit))
 
-        for col_index, column in enumerate(self.gates):
-            if 'b' in column:
-                continue
-            self.__parse_column(self.probed_circuit, column, col_index)
+        for column in self.circuit.columns:
+            self.__parse_column(self.probed_circuit, column, column.col_index)
         
         # Identity gates to ensure all qubits are measured
         for qubit in self.qubits:
@@ -67,50 +159,37 @@ class Simulator:
 
     def __parse_column(self, circuit, column, col_index=None):
         """
-        Parses a column of gates and adds them to the Cirq circuit
+        Adds a column of gates to the Cirq circuit
         
         Args:
             circuit: the Cirq circuit to add the gates to
-            column: list of gates in the column
+            column: the parsed Column, or the list of gates in the column
+            col_index: the index of the column, if its probes should be added
         """
-        controls = self.__find_controls(column)
-        swaps = self.__find_swaps(column)
-    
-        column_dict = {i: gate for i, gate in enumerate(column) if gate != '0' and gate not in ['c', 'ac']}
-
-        # Apply initial X gates for anticontrols
-        for ac in controls['ac']:
-            circuit.append(cirq.X(self.qubits[ac]))
-
-        # Add all ac indicies to c in controls
-        controls['c'] += controls['ac']
-        
-        if 'sw' in column_dict.values():
-            if len(swaps) == 2:
-                swap_gate = cirq.SWAP(self.qubits[swaps[0]], self.qubits[swaps[1]])
-                if controls['c']:
-                    circuit.append(swap_gate.controlled_by(*[self.qubits[c] for c in controls['c']]))
-                else:
-                    circuit.append(swap_gate)
-                del column_dict[swaps[0]]
-                del column_dict[swaps[1]]
-        
-        for i, gate in column_dict.items():
-            if gate == 'M' and col_index is not None:
+        if not isinstance(column, Column):
+            column = Column(column, col_index)
+
+        # Anticontrols are controls on |0>, so each controlled gate is a single operation
+        control_qubits = [self.qubits[c] for c in column.controls + column.anticontrols]
+        control_values = [1] * len(column.controls) + [0] * len(column.anticontrols)
+
+        if column.swap is not None:
+            swap_gate = cirq.SWAP(*[self.qubits[row] for row in column.swap])
+            if control_qubits:
+                circuit.append(swap_gate.controlled_by(*control_qubits, control_values=control_values))
+            else:
+                circuit.append(swap_gate)
+
+        if col_index is not None:
+            for row in column.probes:
                 # Add a tagged identity operation as a placeholder for probing
-                tagged_identity = cirq.I(self.qubits[i]).with_tags(f'probe_{i}_{col_index}')
-                circuit.append(tagged_identity)
-                continue
+                circuit.append(cirq.I(self.qubits[row]).with_tags(f'probe_{row}_{col_index}'))
 
-            if gate in self.gateMap:
-                operation = self.gateMap[gate](self.qubits[i])
-                if controls['c']:
-                    operation = operation.controlled_by(*[self.qubits[c] for c in controls['c']])
-                circuit.append(operation)
-
-        # Reapply X gates to anticontrols to revert them
-        for ac in controls['ac']:
-            circuit.append(cirq.X(self.qubits[ac]))
+        for row, gate in column.gates:
+            operation = self.gateMap[gate](self.qubits[row])
+            if control_qubits:
+                operation = operation.controlled_by(*control_qubits, control_values=control_values)
+            circuit.append(operation)
 
     def __find_controls(self, column) -> dict:
         """
@@ -122,15 +201,9 @@ class Simulator:
         Returns:
             a dictionary containing the indices of the control and anticontrol gates
         """
-        controls = {'c': [], 'ac': []}
+        column = Column(column, None)
 
-        for i, gate in enumerate(column):
-            if gate == 'c':
-                controls['c'].append(i)
-            elif gate == 'ac':
-                controls['ac'].append(i)
-        
-        return controls
+        return {'c': column.controls, 'ac': column.anticontrols}
     
     def __find_swaps(self, column) -> list:
         """
@@ -142,13 +215,7 @@ class Simulator:
         Returns:
             a list of indices where the swap gates are located
         """
-        swaps = []
-
-        for i, gate in enumerate(column):
-            if gate == 'sw':
-                swaps.append(i)
-        
-        return swaps
+        return Column(column, None).swaps
 
     def simulate_circuit(self) -> np.ndarray:
         """
@@ -157,9 +224,52 @@ class Simulator:
         Returns:
             the final state vector of the quantum circuit
         """
-        result = self.simulator.simulate(self.cirq_circuit)
-        full_state_vector = np.abs(result.final_state_vector)**2
+        if not self.uses_cirq:
+            return self.__run_engine().marginal(self.__measurement_indices())
+
+        if self.__final_state is not None:
+            return self.__marginal(np.abs(self.__final_state)**2)
+
+        result = self.simulator.simulate(self.__prepared(self.cirq_circuit), qubit_order=self.qubits)
+
+        return self.__marginal(np.abs(result.final_state_vector)**2)
+
+    def unitaries(self, cache=None) -> dict:
+        """
+        Finds the unitary of each column and of the whole circuit, for the lessons that show
+        them, without simulating each basis state in turn
+
+        Args:
+            cache: an optional SimulationCache of column unitaries, shared between circuits
+
+        Returns:
+            a {'columns', 'unitary'} dictionary, see unitary.circuit_unitaries
+        """
+        return circuit_unitaries(self.circuit, cache)
+
+    def sample(self, shots, seed=None) -> dict:
+        """
+        Samples measurement outcomes of the measured qubits, like a run on real hardware
+
+        Args:
+            shots: the number of times to measure the circuit
+            seed: optional seed for reproducible counts
+
+        Returns:
+            a dictionary mapping each observed bitstring to its count
+        """
+        return sample_counts(self.simulate_circuit(), shots, np.random.default_rng(seed))
 
+    def __marginal(self, full_state_vector) -> np.ndarray:
+        """
+        Sums the full probability vector down to the qubits being measured
+
+        Args:
+            full_state_vector: the probability of each basis state over all qubits
+
+        Returns:
+            the probabilities over the measured qubits only
+        """
         selected_qubits = self.__measurement_indices()
 
         num_qubits = int(np.log2(full_state_vector.size))
@@ -170,6 +280,58 @@ class Simulator:
     
         return final_state_vector
 
+    def __prepared(self, circuit) -> 'cirq.Circuit':
+        """
+        Runs the optimization pass over a generated circuit, unless it is turned off
+
+        Args:
+            circuit: the generated Cirq circuit
+
+        Returns:
+            the circuit to simulate
+        """
+        if self.optimize:
+            return optimize_circuit(circuit)
+
+        return circuit
+
+    def __stream_engine(self):
+        """
+        Runs the grid through the selected native engine, yielding probes as they are reached.
+        The engine is only kept once the sweep has finished.
+
+        Yields:
+            a dictionary containing the row, column and value of each probed measurement
+        """
+        if self.__engine is not None:
+            yield from self.__engine_probes
+            return
+
+        engine = NATIVE_ENGINES[self.engine](self.num_qubits)
+        probes = []
+
+        for probe in engine.sweep(self.circuit):
+            probes.append(probe)
+            yield probe
+
+        self.__engine_probes = probes
+        self.__engine = engine
+
+    def __run_engine(self):
+        """
+        Runs the grid through the selected native engine once, keeping the engine
+        and the probe values for both simulate_circuit and probe_measurements
+
+        Returns:
+            the engine holding the final state of the quantum circuit
+        """
+        if self.__engine is None:
+            engine = NATIVE_ENGINES[self.engine](self.num_qubits)
+            self.__engine_probes = engine.run(self.circuit)
+            self.__engine = engine
+
+        return self.__engine
+
     def __measurement_indices(self) -> list:
         """
         Finds the indices of the qubits to measure
@@ -177,52 +339,217 @@ class Simulator:
         Returns:
             a list of indices of the qubits to measure
         """
-        all_indicies = [item['qubit'] for item in self.to_measure if item['toggle'] == 1 and item['qubit'] < len(self.qubits)]
+        all_indicies = [item['qubit'] for item in self.to_measure if item['toggle'] == 1 and item['qubit'] < self.num_qubits]
 
         return all_indicies
 
     def probe_measurements(self) -> list:
         """
-        Probes the quantum circuit at the measurement points
+        Probes the quantum circuit at the measurement points, in a single forward sweep
+        over the moments of the probed circuit
 
         Returns:
             a list of dictionaries containing the row, column and value of the probed measurements
         """
-        results = []
+        if not self.uses_cirq:
+            self.__run_engine()
+            return self.__engine_probes
 
-        for moment_index, moment in enumerate(self.probed_circuit):
-            for op in moment:
-                if isinstance(op, cirq.TaggedOperation): #and any('probe' in tag for tag in op.tags)
-                    tag = op.tags[0] #next(tag for tag in op.tags) #if 'probe' in tag
-                    row, col_index = map(int, tag.split('_')[1:])
-                    qubit = op.qubits[0]
+        return list(self.stream_probes())
 
-                    sub_circuit = cirq.Circuit()
-                    for m in self.probed_circuit[:moment_index]:
-                        sub_circuit.append(m)
+    def stream_probes(self):
+        """
+        Probes the quantum circuit at the measurement points, yielding each value as soon as
+        the sweep reaches its column. The final state of the sweep is kept, so a following
+        simulate_circuit call does not simulate the circuit again.
+
+        Yields:
+            a dictionary containing the row, column and value of each probed measurement
+        """
+        if not self.uses_cirq:
+            yield from self.__stream_engine()
+            return
 
-                    result = self.simulator.simulate(sub_circuit)
-                    full_state_vector = np.abs(result.final_state_vector)**2
+        # The final state is kept from this sweep, so it must run over the whole probed circuit
+        if not self.__probes_generated:
+            self.generate_probed_circuit()
 
-                    selected_qubits = [row if i == row else next for i in range(len(self.qubits))]
+        # State before the first moment is |0...0>
+        state_vector = np.zeros(2 ** self.num_qubits, dtype=np.complex64)
+        state_vector[0] = 1
 
-                    num_qubits = int(np.log2(full_state_vector.size))
-                    reshaped_probs = full_state_vector.reshape([2] * num_qubits)
+        if not self.num_qubits:
+            self.__final_state = state_vector
+            return
 
-                    axes_to_sum_over = [i for i in range(num_qubits) if i not in selected_qubits]
-                    final_state_vector = np.sum(reshaped_probs, axis=tuple(axes_to_sum_over)).flatten()
-                    results.append({'row': qubit.row, 'col': col_index, 'value': float(final_state_vector[1])})
+        probed_circuit = self.__prepared(self.probed_circuit)
+        steps = self.simulator.simulate_moment_steps(probed_circuit, qubit_order=self.qubits)
 
-        return results
+        # The probes of each moment, as (row, col_index) pairs
+        moment_probes = [[tuple(map(int, op.tags[0].split('_')[1:])) for op in moment if isinstance(op, cirq.TaggedOperation)]
+                         for moment in probed_circuit]
+        last = len(moment_probes) - 1
 
-    def __transpose(self, array) -> list:
+        for index, (probes, step) in enumerate(zip(moment_probes, steps)):
+            # A probe reads the state before its own moment is applied
+            for row, col_index in probes:
+                yield {'row': row, 'col': col_index, 'value': self.__probability_of_one(state_vector, row)}
+
+            # The step's state is overwritten by the next moment, so it is only copied when a
+            # probe will read it, or when it is the final state
+            if index == last or moment_probes[index + 1]:
+                state_vector = step.state_vector(copy=True)
+
+        # Probes are tagged identities, so the probed circuit ends in the same state as the plain one
+        self.__final_state = state_vector
+
+    def __probability_of_one(self, state_vector, row) -> float:
         """
-        Transposes a 2D array
+        Finds the marginal probability of a qubit being measured as 1
 
         Args:
-            array: the 2D array to transpose
+            state_vector: the full state vector of the circuit
+            row: the index of the qubit to measure
 
         Returns:
-            the transposed 2D array
+            the probability of the qubit being in the |1> state
         """
-        return [list(row) for row in zip(*array)]
\ No newline at end of file
+        probs = np.abs(state_vector)**2
+        reshaped_probs = probs.reshape(2 ** row, 2, -1)
+
+        return float(np.sum(reshaped_probs[:, 1, :]))
+
+
+def stream_job(job, simulator_class=Simulator):
+    """
+    Simulates a single circuit, yielding each probe as the sweep reaches it and then the result.
+    Failures are yielded as an error record, so a stream always ends with 'result' or 'error'.
+
+    Args:
+        job: a {'circuit': {'gates'}, 'to_measure'} dictionary, with an optional 'engine'
+        simulator_class: the class used to simulate the circuit
+
+    Yields:
+        {'type': 'probe', 'row', 'col', 'value'} records, then a {'type': 'result'} record with
+        the same fields as run_job, or a {'type': 'error'} record
+    """
+    try:
+        circuit_array = job.get('circuit', {}).get('gates', [])
+        to_measure = job.get('to_measure', [])
+
+        simulator = simulator_class(circuit_array, to_measure, engine=job.get('engine', 'auto'))
+        if simulator.uses_cirq:
+            simulator.generate_probed_circuit()
+
+        probed_values = []
+        for probe in simulator.stream_probes():
+            probed_values.append(probe)
+            yield {'type': 'probe', **probe}
+
+        state_vector = simulator.simulate_circuit()
+
+        yield {'type': 'result', 'status': 'ok', 'state_vector': state_vector.tolist(), 'probed_values': probed_values}
+
+    except Exception as e:
+        yield {'type': 'error', 'status': 'error', 'message': str(e)}
+
+
+def resolve_engine(gates, engine='auto', num_measured=None, max_dense_qubits=NUMPY_MAX_QUBITS) -> str:
+    """
+    Picks the engine for a circuit, see dispatcher.choose_engine
+
+    Args:
+        gates: the circuit grid, indexed [row][col]
+        engine: the requested engine
+        num_measured: the number of qubits measured at the end, all of them if not given
+        max_dense_qubits: the widest circuit a dense engine may run
+
+    Returns:
+        the name of the engine to use
+    """
+    return choose_engine(gates, engine, num_measured, max_dense_qubits).engine
+
+
+def sample_counts(probabilities, shots, rng=None) -> dict:
+    """
+    Draws every shot from a distribution at once, without re-running the circuit
+
+    Args:
+        probabilities: the probability of each outcome, indexed by the measured bits
+        shots: the number of samples to draw
+        rng: optional NumPy random generator
+
+    Returns:
+        a dictionary mapping each observed bitstring to its count
+    """
+    rng = rng or np.random.default_rng()
+
+    probabilities = np.clip(np.asarray(probabilities, dtype=np.float64), 0, None)
+    probabilities /= probabilities.sum()
+    num_bits = int(np.log2(probabilities.size))
+
+    # One multinomial draw gives the count of every outcome directly
+    counts = rng.multinomial(shots, probabilities)
+
+    return {format(int(i), f'0{num_bits}b') if num_bits else '': int(counts[i]) for i in np.flatnonzero(counts)}
+
+
+def top_outcomes(probabilities, top_k=None, min_probability=0.0) -> dict:
+    """
+    Picks out the significant outcomes of a distribution, so wide circuits do not ship 2**m values
+
+    Args:
+        probabilities: the probability of each outcome, indexed by the measured bits
+        top_k: keep at most this many of the most likely outcomes
+        min_probability: drop outcomes less likely than this
+
+    Returns:
+        a dictionary mapping each kept bitstring (outcomes that cannot happen are always dropped) to its probability, most likely first
+    """
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    num_bits = int(np.log2(probabilities.size))
+
+    candidates = np.flatnonzero((probabilities > 0) & (probabilities >= min_probability))
+
+    # argpartition finds the k largest in linear time, so only those k need sorting
+    if top_k is not None and top_k < candidates.size:
+        candidates = candidates[np.argpartition(probabilities[candidates], -top_k)[-top_k:]]
+    candidates = candidates[np.argsort(-probabilities[candidates], kind='stable')]
+
+    return {format(int(i), f'0{num_bits}b') if num_bits else '': float(probabilities[i]) for i in candidates}
+
+
+def run_job(job, simulator_class=Simulator) -> dict:
+    """
+    Simulates a single circuit, catching any failure so one bad job cannot abort a batch
+
+    Args:
+        job: a {'circuit': {'gates'}, 'to_measure'} dictionary, with an optional 'engine'
+        simulator_class: the class used to simulate the circuit
+
+    Returns:
+        a dictionary with the state vector, as a NumPy array, the probed values and the
+        milliseconds spent in each stage, or an error message
+    """
+    timer = StageTimer()
+
+    try:
+        circuit_array = job.get('circuit', {}).get('gates', [])
+        to_measure = job.get('to_measure', [])
+
+        with timer.stage('init'):
+            simulator = simulator_class(circuit_array, to_measure, engine=job.get('engine', 'auto'))
+        # The probe sweep keeps its final state, so the circuit is only simulated once
+        if simulator.uses_cirq:
+            with timer.stage('generate_probed_circuit'):
+                simulator.generate_probed_circuit()
+        with timer.stage('probe'):
+            probed_values = simulator.probe_measurements()
+
+        with timer.stage('simulate'):
+            state_vector = simulator.simulate_circuit()
+
+        return {'status': 'ok', 'state_vector': state_vector, 'probed_values': probed_values, 'timings': timer.durations}
+
+    except Exception as e:
+        return {'status': 'error', 'message': str(e)}
@@ -0,0 +1,299 @@
+"""
+    File: sparse.py
+    Date: 10-2026
+"""
+
+import numpy as np
+from confighome.columns import parse_columns
+from confighome.statevector import StatevectorEngine, GATE_MATRICES
+
+# Amplitudes smaller than this are treated as zero and dropped from the state
+PRUNE_TOLERANCE = 1e-12
+# The sparse state switches to dense once it holds 1/DENSE_DIVISOR of the 2**n amplitudes
+DENSE_DIVISOR = 8
+
+
+def max_support(columns, num_qubits) -> int:
+    """
+    Finds an upper bound on the number of nonzero amplitudes a circuit can reach.
+    Every palette gate except H maps basis states one to one, so only H can double the support.
+
+    Args:
+        columns: list of parsed Column objects
+        num_qubits: the number of qubits in the circuit
+
+    Returns:
+        the bound, never more than 2**num_qubits
+    """
+    branching = sum(1 for column in columns for _, gate in column.gates if gate == 'H')
+
+    return 2 ** min(branching, num_qubits)
+
+
+def densify_threshold(num_qubits) -> int:
+    """
+    Finds the support at which a dense state vector becomes the cheaper representation
+
+    Args:
+        num_qubits: the number of qubits in the circuit
+
+    Returns:
+        the number of nonzero amplitudes that triggers the switch to dense
+    """
+    return max(1, 2 ** num_qubits // DENSE_DIVISOR)
+
+
+class SparseEngine:
+    """
+    A sparse state engine that only stores the nonzero amplitudes.
+
+    Each basis state is a row of a boolean (support, n) matrix, with qubit 0 in the first column,
+    so circuits of any width can run as long as few amplitudes are nonzero. Once the support
+    passes densify_threshold the state is handed over to a StatevectorEngine.
+    """
+    def __init__(self, num_qubits):
+        self.num_qubits = num_qubits
+        self.bits = np.zeros((1, num_qubits), dtype=bool)
+        self.amplitudes = np.ones(1, dtype=np.complex128)
+
+        self.__threshold = densify_threshold(num_qubits)
+        self.__dense = None
+
+    @property
+    def is_dense(self) -> bool:
+        """
+        Returns:
+            True once the state has been handed over to a dense engine
+        """
+        return self.__dense is not None
+
+    @property
+    def support(self) -> int:
+        """
+        Returns:
+            the number of stored amplitudes
+        """
+        if self.is_dense:
+            return int(np.count_nonzero(self.__dense.state))
+
+        return len(self.amplitudes)
+
+    def run(self, columns) -> list:
+        """
+        Applies every column of the grid in a single sweep, probing as each column is reached
+
+        Args:
+            columns: list of columns, each a list of gates indexed by row
+
+        Returns:
+            a list of dictionaries containing the row, column and value of the probed measurements
+        """
+        return list(self.sweep(columns))
+
+    def sweep(self, columns):
+        """
+        Applies the columns one at a time, yielding each probe as soon as its column is reached
+
+        Args:
+            columns: list of columns, each a list of gates indexed by row
+
+        Yields:
+            a dictionary containing the row, column and value of each probed measurement
+        """
+        for column in parse_columns(columns):
+            for row in column.probes:
+                yield {'row': row, 'col': column.col_index, 'value': self.probability_of_one(row)}
+
+            self.apply_column(column)
+
+    def apply_column(self, column):
+        """
+        Applies a parsed column to the state
+
+        Args:
+            column: the parsed Column to apply
+        """
+        if self.is_dense:
+            self.__dense.apply_column(column)
+            return
+
+        if column.swap is not None:
+            self.apply_swap(*column.swap, column.controls, column.anticontrols)
+
+        for row, gate in column.gates:
+            self.apply_gate(GATE_MATRICES[gate], row, column.controls, column.anticontrols)
+
+    def apply_gate(self, matrix, target, controls=(), anticontrols=()):
+        """
+        Applies a single qubit gate, optionally controlled
+
+        Args:
+            matrix: the 2x2 unitary to apply
+            target: index of the target qubit
+            controls: indices of the qubits that must be |1>
+            anticontrols: indices of the qubits that must be |0>
+        """
+        if self.is_dense:
+            self.__dense.apply_gate(matrix, target, controls, anticontrols)
+            return
+
+        active = self.__active(controls, anticontrols)
+        bits = self.bits[active]
+        amplitudes = self.amplitudes[active]
+        inputs = bits[:, target].astype(np.intp)
+
+        new_bits = [self.bits[~active]]
+        new_amplitudes = [self.amplitudes[~active]]
+
+        # Each stored state feeds output bit 0 and output bit 1, skipping zero matrix entries
+        for output in (0, 1):
+            coefficients = matrix[output, inputs]
+            nonzero = coefficients != 0
+            branch = bits[nonzero]
+            branch[:, target] = output
+            new_bits.append(branch)
+            new_amplitudes.append(amplitudes[nonzero] * coefficients[nonzero])
+
+        self.bits = np.concatenate(new_bits)
+        self.amplitudes = np.concatenate(new_amplitudes)
+
+        # Only gates with no zero entries (H) can send two states to the same output
+        if np.count_nonzero(matrix) > 2:
+            self.__merge()
+
+        self.__maybe_densify()
+
+    def apply_swap(self, a, b, controls=(), anticontrols=()):
+        """
+        Swaps two qubits, optionally controlled
+
+        Args:
+            a: index of the first qubit
+            b: index of the second qubit
+            controls: indices of the qubits that must be |1>
+            anticontrols: indices of the qubits that must be |0>
+        """
+        if self.is_dense:
+            self.__dense.apply_swap(a, b, controls, anticontrols)
+            return
+
+        active = self.__active(controls, anticontrols)
+        swapped = self.bits[active]
+        swapped[:, [a, b]] = swapped[:, [b, a]]
+        self.bits[active] = swapped
+
+    def probability_of_one(self, row) -> float:
+        """
+        Finds the marginal probability of a qubit being measured as 1
+
+        Args:
+            row: the index of the qubit
+
+        Returns:
+            the probability of the qubit being in the |1> state
+        """
+        if self.is_dense:
+            return self.__dense.probability_of_one(row)
+
+        return float(np.sum(np.abs(self.amplitudes[self.bits[:, row]])**2))
+
+    def distribution(self, indices) -> dict:
+        """
+        Finds the joint outcome distribution of some qubits, only listing outcomes that can occur
+
+        Args:
+            indices: the qubits to measure
+
+        Returns:
+            a dictionary mapping each possible outcome (as an integer, first qubit most
+            significant) to its probability
+        """
+        probabilities = self.marginal(indices)
+
+        return {int(i): float(probabilities[i]) for i in np.flatnonzero(probabilities)}
+
+    def marginal(self, indices) -> np.ndarray:
+        """
+        Finds the outcome probabilities of some qubits as a dense vector
+
+        Args:
+            indices: the qubits to measure
+
+        Returns:
+            the probabilities over the measured qubits, first qubit most significant
+        """
+        if self.is_dense:
+            return self.__dense.marginal(indices)
+
+        indices = sorted(set(indices))
+        weights = 1 << np.arange(len(indices) - 1, -1, -1, dtype=np.int64)
+        outcomes = self.bits[:, indices].astype(np.int64) @ weights
+
+        return np.bincount(outcomes, weights=np.abs(self.amplitudes)**2, minlength=2 ** len(indices))
+
+    def state_vector(self) -> np.ndarray:
+        """
+        Returns:
+            the state as a flat vector of length 2**n
+        """
+        if self.is_dense:
+            return self.__dense.state_vector()
+
+        return self.__to_dense().reshape(-1)
+
+    def __active(self, controls, anticontrols) -> np.ndarray:
+        """
+        Finds the stored states that satisfy the control pattern
+        """
+        active = np.ones(len(self.amplitudes), dtype=bool)
+
+        if controls:
+            active &= self.bits[:, list(controls)].all(axis=1)
+        if anticontrols:
+            active &= ~self.bits[:, list(anticontrols)].any(axis=1)
+
+        return active
+
+    def __merge(self):
+        """
+        Adds together amplitudes stored for the same basis state, and drops the ones that cancel
+        """
+        if self.num_qubits == 0:
+            self.bits = self.bits[:1]
+            self.amplitudes = self.amplitudes.sum(keepdims=True)
+            return
+
+        # Pack each row into bytes so whole basis states can be compared at once
+        packed = np.ascontiguousarray(np.packbits(self.bits, axis=1))
+        keys = packed.view(np.dtype((np.void, packed.shape[1]))).ravel()
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+        summed = np.zeros(len(first), dtype=np.complex128)
+        np.add.at(summed, inverse.ravel(), self.amplitudes)
+
+        keep = np.abs(summed) > PRUNE_TOLERANCE
+        self.bits = self.bits[first[keep]]
+        self.amplitudes = summed[keep]
+
+    def __maybe_densify(self):
+        """
+        Hands the state over to a dense engine once the support is past the threshold
+        """
+        if len(self.amplitudes) < self.__threshold:
+            return
+
+        dense = StatevectorEngine(self.num_qubits)
+        dense.state = self.__to_dense().astype(np.complex64)
+        self.__dense = dense
+        self.bits = None
+        self.amplitudes = None
+
+    def __to_dense(self) -> np.ndarray:
+        """
+        Scatters the stored amplitudes into a (2,)*n array
+        """
+        weights = 1 << np.arange(self.num_qubits - 1, -1, -1, dtype=np.int64)
+        state = np.zeros(2 ** self.num_qubits, dtype=np.complex128)
+        state[self.bits.astype(np.int64) @ weights] = self.amplitudes
+
+        return state.reshape((2,) * self.num_qubits)
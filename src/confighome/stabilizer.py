@@ -0,0 +1,317 @@
+"""
+    File: stabilizer.py
+    Date: 10-2026
+"""
+
+import numpy as np
+from confighome.columns import parse_columns
+
+CLIFFORD_GATES = ('X', 'Y', 'Z', 'H', 'S')
+CONTROLLED_CLIFFORD_GATES = ('X', 'Y', 'Z')
+
+
+def is_clifford(columns) -> bool:
+    """
+    Checks if a circuit only uses Clifford operations, so it can run on a stabilizer tableau.
+    That means no T gates, and any controlled column has a single control driving Pauli gates.
+
+    Args:
+        columns: list of parsed Column objects
+
+    Returns:
+        True if the circuit is Clifford
+    """
+    for column in columns:
+        num_controls = len(column.controls) + len(column.anticontrols)
+        allowed = CLIFFORD_GATES if num_controls == 0 else CONTROLLED_CLIFFORD_GATES
+
+        if num_controls > 1 and (column.gates or column.swap):
+            return False
+        if num_controls == 1 and column.swap:
+            return False
+        if any(gate not in allowed for _, gate in column.gates):
+            return False
+
+    return True
+
+
+class StabilizerEngine:
+    """
+    A stabilizer tableau engine (Aaronson & Gottesman, 2004) for Clifford circuits.
+
+    Rows 0..n-1 of the tableau are destabilizers, rows n..2n-1 stabilizers, and row 2n
+    is scratch space. Every gate is a handful of vectorized bit operations over the rows,
+    so circuits with hundreds of qubits simulate in polynomial time.
+    """
+    def __init__(self, num_qubits):
+        self.num_qubits = num_qubits
+        n = num_qubits
+
+        self.x = np.zeros((2 * n + 1, n), dtype=bool)
+        self.z = np.zeros((2 * n + 1, n), dtype=bool)
+        self.r = np.zeros(2 * n + 1, dtype=bool)
+
+        self.x[np.arange(n), np.arange(n)] = True
+        self.z[np.arange(n, 2 * n), np.arange(n)] = True
+
+    def run(self, columns) -> list:
+        """
+        Applies every column of the grid in a single sweep, probing as each column is reached
+
+        Args:
+            columns: list of columns, each a list of gates indexed by row
+
+        Returns:
+            a list of dictionaries containing the row, column and value of the probed measurements
+        """
+        return list(self.sweep(columns))
+
+    def sweep(self, columns):
+        """
+        Applies the columns one at a time, yielding each probe as soon as its column is reached
+
+        Args:
+            columns: list of columns, each a list of gates indexed by row
+
+        Yields:
+            a dictionary containing the row, column and value of each probed measurement
+        """
+        for column in parse_columns(columns):
+            for row in column.probes:
+                yield {'row': row, 'col': column.col_index, 'value': self.probability_of_one(row)}
+
+            self.apply_column(column)
+
+    def apply_column(self, column):
+        """
+        Applies a parsed Clifford column to the tableau
+
+        Args:
+            column: the parsed Column to apply
+
+        Raises:
+            ValueError: if the column is not Clifford, such as a T gate or a gate with two controls
+        """
+        if not is_clifford([column]):
+            raise ValueError(f'Column {column.col_index} is not a Clifford operation, so it cannot run on the stabilizer engine')
+
+        for ac in column.anticontrols:
+            self.x_gate(ac)
+
+        controls = column.controls + column.anticontrols
+
+        if column.swap is not None:
+            self.swap(*column.swap)
+
+        for row, gate in column.gates:
+            if not controls:
+                getattr(self, f'{gate.lower()}_gate')(row)
+            elif gate == 'X':
+                self.cnot(controls[0], row)
+            elif gate == 'Y':
+                self.s_dagger(row)
+                self.cnot(controls[0], row)
+                self.s_gate(row)
+            elif gate == 'Z':
+                self.h_gate(row)
+                self.cnot(controls[0], row)
+                self.h_gate(row)
+
+        for ac in column.anticontrols:
+            self.x_gate(ac)
+
+    def h_gate(self, a):
+        """
+        Applies a Hadamard to qubit a
+        """
+        self.r ^= self.x[:, a] & self.z[:, a]
+        self.x[:, a], self.z[:, a] = self.z[:, a].copy(), self.x[:, a].copy()
+
+    def s_gate(self, a):
+        """
+        Applies an S gate to qubit a
+        """
+        self.r ^= self.x[:, a] & self.z[:, a]
+        self.z[:, a] ^= self.x[:, a]
+
+    def s_dagger(self, a):
+        """
+        Applies the inverse of S to qubit a, as S three times
+        """
+        for _ in range(3):
+            self.s_gate(a)
+
+    def x_gate(self, a):
+        """
+        Applies a Pauli X to qubit a
+        """
+        self.r ^= self.z[:, a]
+
+    def y_gate(self, a):
+        """
+        Applies a Pauli Y to qubit a
+        """
+        self.r ^= self.x[:, a] ^ self.z[:, a]
+
+    def z_gate(self, a):
+        """
+        Applies a Pauli Z to qubit a
+        """
+        self.r ^= self.x[:, a]
+
+    def cnot(self, a, b):
+        """
+        Applies a CNOT with control a and target b
+        """
+        self.r ^= self.x[:, a] & self.z[:, b] & ~(self.x[:, b] ^ self.z[:, a])
+        self.x[:, b] ^= self.x[:, a]
+        self.z[:, a] ^= self.z[:, b]
+
+    def swap(self, a, b):
+        """
+        Swaps qubits a and b
+        """
+        self.x[:, [a, b]] = self.x[:, [b, a]]
+        self.z[:, [a, b]] = self.z[:, [b, a]]
+
+    def probability_of_one(self, row) -> float:
+        """
+        Finds the marginal probability of a qubit being measured as 1
+
+        Args:
+            row: the index of the qubit
+
+        Returns:
+            0.5 if the outcome is random, otherwise 0 or 1
+        """
+        if self.__is_random(row):
+            return 0.5
+
+        return float(self.__deterministic_outcome(row))
+
+    def distribution(self, indices) -> dict:
+        """
+        Finds the joint outcome distribution of some qubits, by branching on each random
+        measurement. The work grows with the number of outcomes that can occur, not 2**n.
+
+        Args:
+            indices: the qubits to measure
+
+        Returns:
+            a dictionary mapping each possible outcome (as an integer, first qubit most
+            significant) to its probability
+        """
+        indices = sorted(set(indices))
+        outcomes = {}
+        stack = [(self, 0, 0, 1.0)]
+
+        while stack:
+            tableau, depth, outcome, probability = stack.pop()
+
+            if depth == len(indices):
+                outcomes[outcome] = outcomes.get(outcome, 0) + probability
+                continue
+
+            qubit = indices[depth]
+            if tableau.__is_random(qubit):
+                branch = tableau.__copy()
+                tableau = tableau.__copy()
+                branch.__collapse(qubit, 1)
+                tableau.__collapse(qubit, 0)
+                stack.append((branch, depth + 1, outcome << 1 | 1, probability / 2))
+                stack.append((tableau, depth + 1, outcome << 1, probability / 2))
+            else:
+                bit = tableau.__deterministic_outcome(qubit)
+                stack.append((tableau, depth + 1, outcome << 1 | bit, probability))
+
+        return outcomes
+
+    def marginal(self, indices) -> np.ndarray:
+        """
+        Finds the outcome probabilities of some qubits as a dense vector
+
+        Args:
+            indices: the qubits to measure
+
+        Returns:
+            the probabilities over the measured qubits, first qubit most significant
+        """
+        probabilities = np.zeros(2 ** len(set(indices)))
+
+        for outcome, probability in self.distribution(indices).items():
+            probabilities[outcome] = probability
+
+        return probabilities
+
+    def __is_random(self, a) -> bool:
+        """
+        A measurement is random if any stabilizer anticommutes with Z on the qubit
+        """
+        n = self.num_qubits
+        return bool(self.x[n:2 * n, a].any())
+
+    def __deterministic_outcome(self, a) -> int:
+        """
+        Finds the outcome of a measurement that is not random, using the scratch row
+        """
+        n = self.num_qubits
+        scratch = 2 * n
+
+        self.x[scratch] = False
+        self.z[scratch] = False
+        self.r[scratch] = False
+
+        for i in np.flatnonzero(self.x[:n, a]):
+            self.__rowsum(scratch, i + n)
+
+        return int(self.r[scratch])
+
+    def __collapse(self, a, outcome):
+        """
+        Measures a qubit with a random outcome, forcing the result to the given bit
+        """
+        n = self.num_qubits
+        p = n + int(np.flatnonzero(self.x[n:2 * n, a])[0])
+
+        for i in np.flatnonzero(self.x[:2 * n, a]):
+            if i != p:
+                self.__rowsum(i, p)
+
+        self.x[p - n], self.z[p - n], self.r[p - n] = self.x[p], self.z[p], self.r[p]
+        self.x[p] = False
+        self.z[p] = False
+        self.z[p, a] = True
+        self.r[p] = bool(outcome)
+
+    def __rowsum(self, h, i):
+        """
+        Multiplies row h by row i, tracking the phase
+        """
+        x1, z1 = self.x[i], self.z[i]
+        x2, z2 = self.x[h].astype(np.int8), self.z[h].astype(np.int8)
+
+        # Phase exponent picked up by each single qubit Pauli product
+        g = np.zeros(self.num_qubits, dtype=np.int8)
+        both = x1 & z1
+        only_x = x1 & ~z1
+        only_z = ~x1 & z1
+        g[both] = (z2 - x2)[both]
+        g[only_x] = (z2 * (2 * x2 - 1))[only_x]
+        g[only_z] = (x2 * (1 - 2 * z2))[only_z]
+
+        total = 2 * int(self.r[h]) + 2 * int(self.r[i]) + int(g.sum())
+        self.r[h] = total % 4 == 2
+        self.x[h] ^= self.x[i]
+        self.z[h] ^= self.z[i]
+
+    def __copy(self):
+        """
+        Copies the tableau, for branching on a random measurement
+        """
+        other = StabilizerEngine.__new__(StabilizerEngine)
+        other.num_qubits = self.num_qubits
+        other.x = self.x.copy()
+        other.z = self.z.copy()
+        other.r = self.r.copy()
+
+        return other
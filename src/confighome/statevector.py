@@ -0,0 +1,178 @@
+"""
+    File: statevector.py
+    Date: 10-2026
+"""
+
+import numpy as np
+from confighome.columns import parse_columns
+
+GATE_MATRICES = {
+    'X': np.array([[0, 1], [1, 0]], dtype=np.complex64),
+    'Y': np.array([[0, -1j], [1j, 0]], dtype=np.complex64),
+    'Z': np.array([[1, 0], [0, -1]], dtype=np.complex64),
+    'H': np.array([[1, 1], [1, -1]], dtype=np.complex64) / np.sqrt(2),
+    'S': np.array([[1, 0], [0, 1j]], dtype=np.complex64),
+    'T': np.array([[1, 0], [0, np.exp(1j * np.pi / 4)]], dtype=np.complex64),
+}
+
+
+class StatevectorEngine:
+    """
+    A dense state vector engine that applies the builder gate palette
+    straight to a (2,)*n complex array, with qubit 0 on the first axis
+    to match Cirq's ordering. Gates update the array in place.
+    """
+    def __init__(self, num_qubits):
+        self.num_qubits = num_qubits
+        self.state = np.zeros((2,) * num_qubits, dtype=np.complex64)
+        self.state[(0,) * num_qubits] = 1
+
+    def run(self, columns) -> list:
+        """
+        Applies every column of the grid in a single sweep, probing as each column is reached
+
+        Args:
+            columns: list of columns, each a list of gates indexed by row
+
+        Returns:
+            a list of dictionaries containing the row, column and value of the probed measurements
+        """
+        return list(self.sweep(columns))
+
+    def sweep(self, columns):
+        """
+        Applies the columns one at a time, yielding each probe as soon as its column is reached
+
+        Args:
+            columns: list of columns, each a list of gates indexed by row
+
+        Yields:
+            a dictionary containing the row, column and value of each probed measurement
+        """
+        for column in parse_columns(columns):
+            for row in column.probes:
+                yield {'row': row, 'col': column.col_index, 'value': self.probability_of_one(row)}
+
+            self.apply_column(column)
+
+    def apply_column(self, column):
+        """
+        Applies a parsed column to the state
+
+        Args:
+            column: the parsed Column to apply
+        """
+        if column.swap is not None:
+            self.apply_swap(*column.swap, column.controls, column.anticontrols)
+
+        for row, gate in column.gates:
+            self.apply_gate(GATE_MATRICES[gate], row, column.controls, column.anticontrols)
+
+    def apply_gate(self, matrix, target, controls=(), anticontrols=()):
+        """
+        Applies a single qubit gate, optionally controlled. The gate only touches the slice of
+        the state where every control is |1> and every anticontrol is |0>, updated in place, so
+        a gate with k controls and anticontrols costs 2**(n-k) amplitudes rather than 2**n.
+
+        Args:
+            matrix: the 2x2 unitary to apply
+            target: index of the target qubit
+            controls: indices of the qubits that must be |1>
+            anticontrols: indices of the qubits that must be |0>
+        """
+        zero = self.__slice(controls, anticontrols, {target: 0})
+        one = self.__slice(controls, anticontrols, {target: 1})
+        (m00, m01), (m10, m11) = matrix
+
+        if m01 == 0 and m10 == 0:
+            # Z, S and T only scale the |1> half
+            if m00 != 1:
+                self.state[zero] *= m00
+            if m11 != 1:
+                self.state[one] *= m11
+        elif m00 == 0 and m11 == 0 and m01 == 1 and m10 == 1:
+            self.__exchange(zero, one)
+        else:
+            a, b = self.state[zero], self.state[one]
+            self.state[zero], self.state[one] = m00 * a + m01 * b, m10 * a + m11 * b
+
+    def apply_swap(self, a, b, controls=(), anticontrols=()):
+        """
+        Swaps two qubits, optionally controlled, by exchanging the |01> and |10> slices of
+        the pair within the slice selected by the controls
+
+        Args:
+            a: index of the first qubit
+            b: index of the second qubit
+            controls: indices of the qubits that must be |1>
+            anticontrols: indices of the qubits that must be |0>
+        """
+        self.__exchange(self.__slice(controls, anticontrols, {a: 0, b: 1}),
+                        self.__slice(controls, anticontrols, {a: 1, b: 0}))
+
+    def __slice(self, controls, anticontrols, fixed) -> tuple:
+        """
+        Builds the index of the amplitudes a controlled operation acts on. Indexing with it
+        gives a view of the state rather than a copy.
+
+        Args:
+            controls: indices of the qubits that must be |1>
+            anticontrols: indices of the qubits that must be |0>
+            fixed: a dictionary of the other qubits to fix, and their values
+
+        Returns:
+            a tuple with an int on every fixed axis and a full slice on the rest
+        """
+        index = [slice(None)] * self.num_qubits
+        for c in controls:
+            index[c] = 1
+        for ac in anticontrols:
+            index[ac] = 0
+        for axis, value in fixed.items():
+            index[axis] = value
+
+        return tuple(index)
+
+    def __exchange(self, first, second):
+        """
+        Swaps two disjoint slices of the state in place
+        """
+        held = self.state[first].copy()
+        self.state[first] = self.state[second]
+        self.state[second] = held
+
+    def probability_of_one(self, row) -> float:
+        """
+        Finds the marginal probability of a qubit being measured as 1
+
+        Args:
+            row: the index of the qubit
+
+        Returns:
+            the probability of the qubit being in the |1> state
+        """
+        probs = np.abs(np.take(self.state, 1, axis=row))**2
+
+        return float(np.sum(probs))
+
+    def marginal(self, indices) -> np.ndarray:
+        """
+        Finds the outcome probabilities of some qubits
+
+        Args:
+            indices: the qubits to measure
+
+        Returns:
+            the probabilities over the measured qubits, first qubit most significant
+        """
+        probs = np.abs(self.state)**2
+        axes_to_sum_over = tuple(i for i in range(self.num_qubits) if i not in indices)
+
+        return np.sum(probs, axis=axes_to_sum_over).flatten()
+
+    def state_vector(self) -> np.ndarray:
+        """
+        Returns:
+            the state as a flat vector of length 2**n
+        """
+        return self.state.reshape(-1)
@@ -0,0 +1,65 @@
+"""
+    File: test_aer_backend.py
+    Date: 10-2026
+"""
+import unittest
+import numpy as np
+from confighome.aer_backend import AerEngine, aer_available
+from confighome.simulator import run_job
+from confighome.statevector import StatevectorEngine
+from confighome.tests.test_statevector import random_grid
+
+
+@unittest.skipUnless(aer_available(), 'qiskit-aer is not installed')
+class TestAerEngine(unittest.TestCase):
+    """
+    A class to test the Qiskit Aer engine against the NumPy state vector engine
+    """
+    def test_row_zero_is_most_significant(self):
+        """Test the final distribution uses the same qubit order as the other engines."""
+        engine = AerEngine(3)
+        engine.run([['X', 0, 0]])
+        self.assertTrue(np.allclose(engine.marginal([0, 1, 2]), np.eye(8)[4]))
+        self.assertTrue(np.allclose(engine.marginal([1, 2]), np.eye(4)[0]))
+
+    def test_controls_and_anticontrols(self):
+        """Test a column's controls and anticontrols set the control state of its gates."""
+        for prepare, expected in (([0, 0, 0], 0b000), (['X', 0, 0], 0b101), ([0, 'X', 0], 0b010), (['X', 'X', 0], 0b110)):
+            engine = AerEngine(3)
+            engine.run([prepare, ['c', 'ac', 'X']])
+            with self.subTest(prepare=prepare):
+                self.assertAlmostEqual(engine.marginal([0, 1, 2])[expected], 1, places=5)
+
+    def test_matches_statevector_engine(self):
+        """Test random grids give the same distribution and probes as the NumPy engine."""
+        rng = np.random.default_rng(3)
+
+        for _ in range(25):
+            rows = int(rng.integers(1, 6))
+            columns = [list(column) for column in zip(*random_grid(rng, rows, int(rng.integers(1, 8))))]
+
+            aer = AerEngine(rows)
+            dense = StatevectorEngine(rows)
+
+            with self.subTest(columns=columns):
+                aer_probes = aer.run(columns)
+                dense_probes = dense.run(columns)
+                self.assertTrue(np.allclose(aer.marginal(list(range(rows))), dense.marginal(list(range(rows))), atol=1e-5))
+                self.assertEqual([(p['row'], p['col']) for p in aer_probes], [(p['row'], p['col']) for p in dense_probes])
+                for a, b in zip(aer_probes, dense_probes):
+                    self.assertAlmostEqual(a['value'], b['value'], places=5)
+
+    def test_run_job_shapes(self):
+        """Test the Aer engine returns results in the same shape as the Cirq path."""
+        job = {'circuit': {'gates': [['H', 'M', 'c'], [0, 0, 'X']]}, 'to_measure': [{'qubit': 1, 'toggle': 1}]}
+        aer = run_job({**job, 'engine': 'aer'})
+        cirq = run_job({**job, 'engine': 'cirq'})
+
+        self.assertEqual(aer['status'], 'ok')
+        self.assertTrue(np.allclose(aer['state_vector'], cirq['state_vector'], atol=1e-5))
+        self.assertEqual(aer['probed_values'], [{'row': 0, 'col': 1, 'value': aer['probed_values'][0]['value']}])
+        self.assertAlmostEqual(aer['probed_values'][0]['value'], cirq['probed_values'][0]['value'], places=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
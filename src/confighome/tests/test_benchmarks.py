@@ -0,0 +1,105 @@
+"""
+    File: test_benchmarks.py
+    Date: 10-2026
+"""
+import os
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+import cirq
+import numpy as np
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from confighome.benchmarks import (BASELINE_VERSION, BenchmarkCase, compare, load_baseline, random_circuit,
+                                   sweep_cases, time_case)
+
+
+def results(**cases) -> dict:
+    return {'version': BASELINE_VERSION, 'cases': cases}
+
+
+class TestBenchmarks(unittest.TestCase):
+    """
+    A class to test the simulator benchmark suite
+    """
+    # -------------------------------------------------------------------------------------------
+    # ---------------------------- CIRCUIT TESTS ------------------------------------------------
+    # -------------------------------------------------------------------------------------------
+    def test_random_circuit_format(self):
+        """Test random circuits use the editor's grid format and measure every qubit."""
+        gates, to_measure = random_circuit(np.random.default_rng(0), 4, 7, 0.2, 0.3)
+        self.assertEqual(len(gates), 4)
+        self.assertTrue(all(len(row) == 7 for row in gates))
+        self.assertTrue(all(gate in ('X', 'Y', 'Z', 'H', 'S', 'T', 'M', 'c', 'ac') for row in gates for gate in row))
+        self.assertEqual(to_measure, [{'qubit': q, 'toggle': 1} for q in range(4)])
+
+    def test_random_circuit_densities(self):
+        """Test the probe and control densities set the share of those cells."""
+        gates, _ = random_circuit(np.random.default_rng(0), 20, 50, 1.0, 0.0)
+        self.assertTrue(all(gate == 'M' for row in gates for gate in row))
+
+        gates, _ = random_circuit(np.random.default_rng(0), 20, 50, 0.0, 0.5)
+        controls = sum(gate in ('c', 'ac') for row in gates for gate in row)
+        self.assertAlmostEqual(controls / 1000, 0.5, delta=0.05)
+
+    def test_sweep_cases(self):
+        """Test the sweep covers every combination with distinct names."""
+        cases = sweep_cases(range(1, 4), (5, 10), (0.0, 0.2), (0.0,), ('cirq', 'numpy'))
+        self.assertEqual(len(cases), 24)
+        self.assertEqual(len({case.name for case in cases}), 24)
+        self.assertEqual(cases[0].name, 'cirq/q1/c5/p0/k0')
+
+    # -------------------------------------------------------------------------------------------
+    # ---------------------------- TIMING TESTS -------------------------------------------------
+    # -------------------------------------------------------------------------------------------
+    def test_time_case_stages(self):
+        """Test each simulator stage is timed, with circuit generation only timed for Cirq."""
+        cirq_timings = time_case(BenchmarkCase(3, 4, 0.2, 0.2, 'cirq'), repeat=2)
+        self.assertEqual(list(cirq_timings), ['generate_circuit', 'simulate', 'generate_probed_circuit', 'probe'])
+        self.assertTrue(all(milliseconds >= 0 for milliseconds in cirq_timings.values()))
+
+        numpy_timings = time_case(BenchmarkCase(3, 4, 0.2, 0.2, 'numpy'), repeat=1)
+        self.assertEqual(list(numpy_timings), ['simulate', 'probe'])
+
+    def test_time_case_simulates_in_simulate_stage(self):
+        """Test the simulate stage runs a full simulation, rather than reading the probe sweep's final state."""
+        with patch.object(cirq.Simulator, 'simulate', autospec=True, side_effect=cirq.Simulator.simulate) as simulate:
+            time_case(BenchmarkCase(3, 4, 0.2, 0.2, 'cirq'), repeat=2)
+        self.assertEqual(simulate.call_count, 2)
+
+    def test_compare_flags_regressions(self):
+        """Test only stages over both the relative and absolute thresholds are reported."""
+        baseline = results(a={'simulate': 10.0, 'probe': 0.01}, b={'simulate': 10.0})
+        current = results(a={'simulate': 20.0, 'probe': 0.05}, b={'simulate': 11.0}, c={'simulate': 99.0})
+
+        regressions = compare(current, baseline, threshold=0.25, min_delta=1.0)
+        self.assertEqual([(r['case'], r['stage']) for r in regressions], [('a', 'simulate')])
+        self.assertAlmostEqual(regressions[0]['ratio'], 2.0)
+
+        self.assertEqual(len(compare(current, baseline, threshold=0.05, min_delta=0.0)), 3)
+
+    def test_compare_rejects_other_versions(self):
+        """Test baselines from another version of the suite are not compared."""
+        with self.assertRaises(ValueError):
+            compare(results(), {'version': BASELINE_VERSION + 1, 'cases': {}})
+
+    def test_command_saves_and_compares(self):
+        """Test the management command writes a baseline and fails on regressions."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            call_command('benchmark_simulator', '--qubits', '1-2', '--columns', '3', '--repeat', '1',
+                         '--save', path, stdout=StringIO())
+            self.assertEqual(len(load_baseline(path)['cases']), 8)
+
+            out = StringIO()
+            call_command('benchmark_simulator', '--qubits', '1-2', '--columns', '3', '--repeat', '1',
+                         '--baseline', path, '--min-delta', '1000', stdout=out)
+            self.assertIn('No regressions', out.getvalue())
+
+            with self.assertRaises(CommandError):
+                call_command('benchmark_simulator', '--engine', 'qiskit', stdout=StringIO())
+
+
+if __name__ == '__main__':
+    unittest.main()
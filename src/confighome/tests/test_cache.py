@@ -0,0 +1,103 @@
+"""
+    File: test_cache.py
+    Date: 10-2026
+"""
+import unittest
+from confighome.cache import SimulationCache, circuit_key
+
+
+class FakeClock:
+    """
+    A clock that only moves when told to
+    """
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitKey(unittest.TestCase):
+    """
+    A class to test the canonical circuit hash
+    """
+    def test_key_is_stable(self):
+        """Test the same circuit always gives the same key."""
+        gates = [['H', 'c'], [0, 'X']]
+        to_measure = [{'qubit': 0, 'toggle': 1}]
+        self.assertEqual(circuit_key(gates, to_measure), circuit_key(gates, to_measure))
+
+    def test_key_normalizes_empty_cells(self):
+        """Test 0 and '0' are treated as the same empty cell."""
+        self.assertEqual(circuit_key([['H', 0]], []), circuit_key([['H', '0']], []))
+
+    def test_key_ignores_toggle_order_and_untoggled_qubits(self):
+        """Test only the set of toggled qubits affects the key."""
+        a = [{'qubit': 0, 'toggle': 1}, {'qubit': 1, 'toggle': 1}, {'qubit': 2, 'toggle': 0}]
+        b = [{'qubit': 1, 'toggle': 1}, {'qubit': 0, 'toggle': 1}]
+        self.assertEqual(circuit_key([['X'], ['X'], ['X']], a), circuit_key([['X'], ['X'], ['X']], b))
+
+    def test_key_changes_with_circuit(self):
+        """Test different gates or toggles give different keys."""
+        to_measure = [{'qubit': 0, 'toggle': 1}]
+        self.assertNotEqual(circuit_key([['X']], to_measure), circuit_key([['H']], to_measure))
+        self.assertNotEqual(circuit_key([['X']], to_measure), circuit_key([['X']], []))
+
+    def test_key_changes_with_engine(self):
+        """Test a forced engine never shares its cached results with other engines."""
+        to_measure = [{'qubit': 0, 'toggle': 1}]
+        self.assertEqual(circuit_key([['X']], to_measure), circuit_key([['X']], to_measure, 'auto'))
+        self.assertNotEqual(circuit_key([['X']], to_measure, 'auto'), circuit_key([['X']], to_measure, 'cirq'))
+
+
+class TestSimulationCache(unittest.TestCase):
+    """
+    A class to test the LRU simulation cache
+    """
+    def test_miss_then_hit(self):
+        """Test the hit and miss counters."""
+        cache = SimulationCache(max_size=2, ttl=None)
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.stats(), {'size': 1, 'max_size': 2, 'hits': 1, 'misses': 1})
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest unused entry is evicted when the cache is full."""
+        cache = SimulationCache(max_size=2, ttl=None)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_entries_expire(self):
+        """Test entries older than the TTL are dropped."""
+        clock = FakeClock()
+        cache = SimulationCache(max_size=2, ttl=10, clock=clock)
+        cache.set('a', 1)
+        clock.now = 9
+        self.assertEqual(cache.get('a'), 1)
+        clock.now = 10
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+    def test_zero_size_disables_cache(self):
+        """Test a cache with no room stores nothing."""
+        cache = SimulationCache(max_size=0)
+        cache.set('a', 1)
+        self.assertIsNone(cache.get('a'))
+
+    def test_clear(self):
+        """Test clearing the cache resets entries and counters."""
+        cache = SimulationCache()
+        cache.set('a', 1)
+        cache.get('a')
+        cache.clear()
+        self.assertEqual(cache.stats(), {'size': 0, 'max_size': 256, 'hits': 0, 'misses': 0})
+
+if __name__ == '__main__':
+    unittest.main()
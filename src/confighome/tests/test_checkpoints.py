@@ -0,0 +1,124 @@
+"""
+    File: test_checkpoints.py
+    Date: 10-2026
+"""
+import os
+import tempfile
+import unittest
+import numpy as np
+from confighome.checkpoints import CheckpointStore
+from confighome.incremental import IncrementalSession, IncrementalSimulations
+from confighome.tests.test_incremental import MEASURE_ALL, simulated
+from confighome.tests.test_statevector import random_grid
+
+KB = 1024
+
+
+def snapshot(value, size=KB) -> np.ndarray:
+    return np.full(size // 8, value, dtype=np.complex64)
+
+
+class TestCheckpointStore(unittest.TestCase):
+    """
+    A class to test the memory-budgeted checkpoint store
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def spilled_files(self) -> list:
+        return [name for root, _, names in os.walk(self.directory.name) for name in names]
+
+    def test_keeps_snapshots_in_memory_within_budget(self):
+        """Test nothing is spilled while the memory budget holds."""
+        store = CheckpointStore(memory_bytes=2 * KB, disk_bytes=4 * KB, directory=self.directory.name)
+        store.put('a', snapshot(1))
+        store.put('b', snapshot(2))
+
+        self.assertNotIsInstance(store.get('a'), np.memmap)
+        self.assertEqual(store.stats(), {'snapshots': 2, 'memory_bytes': 2 * KB, 'disk_bytes': 0, 'spills': 0, 'evictions': 0})
+        self.assertEqual(self.spilled_files(), [])
+
+    def test_spills_least_recently_used(self):
+        """Test the coldest snapshot moves to a read-only memory-mapped file."""
+        store = CheckpointStore(memory_bytes=2 * KB, disk_bytes=4 * KB, directory=self.directory.name)
+        store.put('a', snapshot(1))
+        store.put('b', snapshot(2))
+        store.get('a')
+        store.put('c', snapshot(3))
+
+        spilled = store.get('b')
+        self.assertIsInstance(spilled, np.memmap)
+        self.assertFalse(spilled.flags.writeable)
+        self.assertTrue(np.all(spilled == 2))
+        self.assertNotIsInstance(store.get('a'), np.memmap)
+        self.assertEqual(store.stats()['memory_bytes'], 2 * KB)
+        self.assertEqual(store.stats()['disk_bytes'], KB)
+        self.assertEqual(len(self.spilled_files()), 1)
+
+    def test_evicts_past_disk_budget(self):
+        """Test the coldest spilled snapshots are deleted once the disk budget is used up."""
+        store = CheckpointStore(memory_bytes=KB, disk_bytes=2 * KB, directory=self.directory.name)
+        for i in range(5):
+            store.put(i, snapshot(i))
+
+        self.assertEqual([i for i in range(5) if i in store], [2, 3, 4])
+        self.assertIsNone(store.get(0))
+        self.assertEqual(store.stats()['evictions'], 2)
+        self.assertEqual(len(self.spilled_files()), 2)
+
+    def test_discard_and_replace(self):
+        """Test removed and replaced snapshots give back their bytes and files."""
+        store = CheckpointStore(memory_bytes=KB, disk_bytes=4 * KB, directory=self.directory.name)
+        store.put('a', snapshot(1))
+        store.put('b', snapshot(2))
+        store.put('b', snapshot(3))
+        store.discard(['a', 'missing'])
+
+        self.assertTrue(np.all(store.get('b') == 3))
+        self.assertEqual(store.stats()['memory_bytes'] + store.stats()['disk_bytes'], KB)
+        self.assertEqual(self.spilled_files(), [])
+
+        store.clear()
+        self.assertEqual(store.stats()['snapshots'], 0)
+
+    # -------------------------------------------------------------------------------------------
+    # ---------------------------- INCREMENTAL TESTS --------------------------------------------
+    # -------------------------------------------------------------------------------------------
+    def test_incremental_resumes_from_spilled_checkpoints(self):
+        """Test incremental sweeps give the same results with checkpoints spilled or evicted."""
+        rng = np.random.default_rng(5)
+        state_bytes = 2**4 * 8
+
+        for memory, disk in ((2 * state_bytes, 100 * state_bytes), (state_bytes, 2 * state_bytes), (0, 0)):
+            store = CheckpointStore(memory_bytes=memory, disk_bytes=disk, directory=self.directory.name)
+            session = IncrementalSession(store=store)
+            gates = random_grid(rng, 4, 12)
+            session.simulate(gates, MEASURE_ALL)
+
+            for _ in range(5):
+                gates[int(rng.integers(0, 4))][int(rng.integers(0, 12))] = rng.choice(['H', 'T', 'c', 'M'])
+                result = session.simulate(gates, MEASURE_ALL)
+                with self.subTest(memory=memory, disk=disk, gates=gates):
+                    self.assertTrue(np.allclose(result['state_vector'], simulated(gates)['state_vector'], atol=1e-5))
+                    self.assertLessEqual(store.stats()['memory_bytes'], memory)
+                    self.assertLessEqual(store.stats()['disk_bytes'], disk)
+
+    def test_evicted_sessions_free_checkpoints(self):
+        """Test sessions dropped from the LRU take their checkpoints with them."""
+        store = CheckpointStore(directory=self.directory.name)
+        simulations = IncrementalSimulations(max_sessions=1, store=store)
+        simulations.simulate('a', [['H', 'T', 'H']], [])
+        self.assertGreater(store.stats()['snapshots'], 0)
+
+        simulations.simulate('b', [['H']], [])
+        self.assertEqual(store.stats()['snapshots'], 1)
+
+        simulations.clear()
+        self.assertEqual(store.stats()['snapshots'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+    File: test_columns.py
+    Date: 10-2026
+"""
+import unittest
+import numpy as np
+from confighome.columns import (ANTICONTROL, BARRIER, CONTROL, EMPTY, GATE_OPCODES, OTHER, PROBE, SWAP,
+                                Column, compile_circuit, encode, parse_columns)
+
+
+class TestCompiledCircuit(unittest.TestCase):
+    """
+    A class to test the compiled opcode grid shared by the engines
+    """
+    def test_encode(self):
+        """Test labels compile to opcodes, with 0 and '0' both empty and unknown labels kept apart."""
+        opcodes = encode([['H', 0, 'c'], ['0', 'ac', 'x']])
+        self.assertEqual(opcodes.dtype, np.int8)
+        self.assertEqual(opcodes.tolist(), [[GATE_OPCODES['H'], EMPTY, CONTROL], [EMPTY, ANTICONTROL, OTHER]])
+
+    def test_compile_truncates_to_shortest_row(self):
+        """Test the grid is cut to its shortest row, as Simulator's transpose does."""
+        circuit = compile_circuit([['X', 'H', 'T'], ['M', 'sw']])
+        self.assertEqual((circuit.num_qubits, circuit.depth), (2, 2))
+        self.assertEqual(circuit.opcodes.tolist(), [[GATE_OPCODES['X'], GATE_OPCODES['H']], [PROBE, SWAP]])
+        self.assertFalse(circuit.opcodes.flags.writeable)
+
+    def test_columns_skip_barriers(self):
+        """Test barrier columns are left out and the rest keep their grid index."""
+        circuit = compile_circuit([['X', 'b', 'c', 'I'], ['M', 'b', 'ac', 0], [0, 'b', 'sw', 'sw'], ['H', 'b', 'sw', 'sw']])
+        self.assertEqual([column.col_index for column in circuit.columns], [0, 2, 3])
+        self.assertTrue((circuit.opcodes[:, 1] == BARRIER).all())
+
+        column = circuit.columns[1]
+        self.assertEqual((column.controls, column.anticontrols, column.swap), ([0], [1], (2, 3)))
+        self.assertEqual((column.control_mask, column.anticontrol_mask, column.swap_mask), (0b1, 0b10, 0b1100))
+
+        first = circuit.columns[0]
+        self.assertEqual((first.gates, first.probes, first.probe_mask), ([(0, 'X'), (3, 'H')], [1], 0b10))
+        self.assertEqual(circuit.columns[2].gates, [])
+
+    def test_column_from_labels_matches_compiled(self):
+        """Test a column parsed from its labels matches the same column of a compiled grid."""
+        labels = ['c', 'sw', 'M', 'Y', 'sw', 'ac', 'T']
+        compiled = compile_circuit([[label] for label in labels]).columns[0]
+        parsed = Column(labels, 0)
+
+        for name in Column.__slots__:
+            self.assertEqual(getattr(parsed, name), getattr(compiled, name), name)
+
+    def test_parse_columns(self):
+        """Test engines get the same columns from a compiled circuit or from the transposed grid."""
+        gates = [['H', 'b', 'c'], [0, 'b', 'X']]
+        compiled = compile_circuit(gates)
+
+        self.assertIs(parse_columns(compiled), compiled.columns)
+        self.assertEqual([(c.col_index, c.gates, c.controls) for c in parse_columns([list(column) for column in zip(*gates)])],
+                         [(c.col_index, c.gates, c.controls) for c in compiled.columns])
+        self.assertEqual(parse_columns([]), [])
+
+    def test_fingerprint(self):
+        """Test grids that simulate the same share a fingerprint, and reshaped grids do not."""
+        self.assertEqual(compile_circuit([['H', 0], [0, 'X']]).fingerprint(), compile_circuit([['H', '0'], ['0', 'X', 'Y']]).fingerprint())
+        self.assertNotEqual(compile_circuit([['H', 0, 0]]).fingerprint(), compile_circuit([['H'], [0], [0]]).fingerprint())
+
+    def test_compile_is_idempotent(self):
+        """Test an already compiled circuit is passed through rather than compiled again."""
+        circuit = compile_circuit([['X']])
+        self.assertIs(compile_circuit(circuit), circuit)
+        self.assertEqual((compile_circuit([]).num_qubits, compile_circuit([]).depth), (0, 0))
+
+    def test_labels(self):
+        """Test a compiled grid can be turned back into labels."""
+        self.assertEqual(compile_circuit([['H', 0, 'x'], ['c', 'M', 'b']]).labels(), [['H', '0', '?'], ['c', 'M', 'b']])
+
+    def test_rejects_malformed_grid(self):
+        """Test a grid that is not a list of rows is rejected."""
+        for gates in ('XH', [['X'], 'H'], None, [[['X']]]):
+            with self.subTest(gates=gates), self.assertRaises(ValueError):
+                compile_circuit(gates)
+
+
+if __name__ == '__main__':
+    unittest.main()
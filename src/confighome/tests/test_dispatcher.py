@@ -0,0 +1,64 @@
+"""
+    File: test_dispatcher.py
+    Date: 10-2026
+"""
+import unittest
+from confighome.aer_backend import aer_available
+from confighome.dispatcher import NUMPY_MAX_QUBITS, STABILIZER_MAX_MEASURED, CircuitFeatures, choose_engine
+
+
+def dense_grid(qubits) -> list:
+    return [['H', 'T', 'H', 'M'] for _ in range(qubits)]
+
+
+class TestDispatcher(unittest.TestCase):
+    """
+    A class to test the engine dispatcher
+    """
+    def test_features(self):
+        """Test the features read from a circuit grid."""
+        features = CircuitFeatures([['H', 'c', 'M', 'b'], [0, 'X', 'T', 'b'], ['M', 'ac', 0, 'b']])
+        self.assertEqual(features.as_dict(), {
+            'qubits': 3,
+            'depth': 3,
+            'clifford': False,
+            'probes': 2,
+            'controlled_columns': 1,
+            'max_support': 2,
+        })
+
+    def test_picks_cheapest_engine(self):
+        """Test wide Clifford, near-classical, small dense and wide dense circuits each get their engine."""
+        self.assertEqual(choose_engine([['H', 'c']] + [[0, 'X']] * 99).engine, 'stabilizer')
+        self.assertEqual(choose_engine([['X', 'c'], ['X', 'c'], [0, 'X'], ['T', 0]] * 10).engine, 'sparse')
+        self.assertEqual(choose_engine(dense_grid(NUMPY_MAX_QUBITS)).engine, 'numpy')
+        self.assertEqual(choose_engine(dense_grid(NUMPY_MAX_QUBITS + 1)).engine, 'aer' if aer_available() else 'cirq')
+
+    def test_h_wall_measured_prefers_dense(self):
+        """Test a Clifford wall of H gates with every qubit measured runs dense, as its distribution is full."""
+        wall = [['H'] for _ in range(NUMPY_MAX_QUBITS)]
+        self.assertEqual(choose_engine(wall, num_measured=NUMPY_MAX_QUBITS).engine, 'numpy')
+        self.assertEqual(choose_engine(wall, num_measured=STABILIZER_MAX_MEASURED).engine, 'stabilizer')
+
+        wide = [['H'] for _ in range(20)]
+        self.assertEqual(choose_engine(wide, num_measured=20, max_dense_qubits=20).engine, 'aer' if aer_available() else 'cirq')
+        self.assertEqual(choose_engine(wide, num_measured=20).engine, 'stabilizer')
+
+    def test_logs_choice_and_reason(self):
+        """Test the chosen engine is logged with the features behind it."""
+        with self.assertLogs('confighome.dispatcher', 'DEBUG') as logs:
+            choice = choose_engine([['H', 'T']])
+        self.assertEqual(choice.engine, 'numpy')
+        self.assertIn('numpy', logs.output[0])
+        self.assertIn("'probes': 0", logs.output[0])
+
+    def test_override(self):
+        """Test a requested engine is used as is, and unknown engines are rejected."""
+        choice = choose_engine([['H', 'c'], [0, 'X']], 'cirq')
+        self.assertEqual((choice.engine, choice.reason), ('cirq', 'requested'))
+        with self.assertRaises(ValueError):
+            choose_engine([['H']], 'qiskit')
+
+
+if __name__ == '__main__':
+    unittest.main()
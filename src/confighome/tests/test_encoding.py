@@ -0,0 +1,51 @@
+"""
+    File: test_encoding.py
+    Date: 10-2026
+"""
+import base64
+import unittest
+import numpy as np
+from confighome.encoding import encode_base64, encode_values, negotiate, pack_binary, unpack_binary
+
+
+class TestEncoding(unittest.TestCase):
+    """
+    A class to test the state vector encodings
+    """
+    def test_negotiate_defaults_to_json(self):
+        """Test JSON floats stay the default."""
+        self.assertEqual(negotiate({}, 'application/json'), ('json', 'float32'))
+
+    def test_negotiate_binary_from_accept(self):
+        """Test an Accept header of application/octet-stream asks for binary."""
+        self.assertEqual(negotiate({'dtype': 'float64'}, 'application/octet-stream'), ('binary', 'float64'))
+
+    def test_negotiate_rejects_unknown(self):
+        """Test unsupported encodings and dtypes are refused."""
+        with self.assertRaises(ValueError):
+            negotiate({'encoding': 'xml'})
+        with self.assertRaises(ValueError):
+            negotiate({'dtype': 'float16'})
+
+    def test_encode_values_little_endian(self):
+        """Test the buffer is little-endian whatever the platform."""
+        self.assertEqual(encode_values([1.0], 'float32'), b'\x00\x00\x80\x3f')
+        self.assertEqual(len(encode_values([0.5] * 4, 'float64')), 32)
+
+    def test_encode_base64(self):
+        """Test the base64 encoding decodes back to the probabilities."""
+        encoded = encode_base64([0.25, 0.75], 'float64')
+        self.assertEqual(encoded['length'], 2)
+        self.assertTrue(np.array_equal(np.frombuffer(base64.b64decode(encoded['data']), dtype='<f8'), [0.25, 0.75]))
+
+    def test_pack_round_trip(self):
+        """Test a framed binary response unpacks to its header and probabilities."""
+        values = np.random.default_rng(12).random(1024)
+        header, decoded = unpack_binary(pack_binary({'status': 'ok', 'probed_values': []}, values, 'float32'))
+
+        self.assertEqual(header, {'status': 'ok', 'probed_values': [], 'dtype': 'float32', 'length': 1024})
+        self.assertTrue(np.allclose(decoded, values))
+
+
+if __name__ == '__main__':
+    unittest.main()
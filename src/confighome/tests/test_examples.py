@@ -0,0 +1,92 @@
+"""
+    File: test_examples.py
+    Date: 10-2026
+"""
+import json
+import os
+import tempfile
+import unittest
+from confighome.examples import ExampleCircuitRegistry, normalize_name
+
+
+class FakeClock:
+    """
+    A clock that only moves when told to
+    """
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestExampleCircuitRegistry(unittest.TestCase):
+    """
+    A class to test the example circuit registry
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+        self.write('bell.json', 'Bell state (ERP pair)')
+        self.write('ghz.json', 'Greenberger–Horne–Zeilinger (GHZ) state')
+        self.registry = ExampleCircuitRegistry(self.directory.name, check_interval=2, clock=self.clock)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, file_name, title, gates=None, mtime=None):
+        path = os.path.join(self.directory.name, file_name)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'title': title, 'gates': gates or [['H']]}, f)
+        if mtime is not None:
+            os.utime(path, ns=(mtime, mtime))
+
+    def test_normalize_name(self):
+        """Test names are compared without case, punctuation or extra spaces."""
+        self.assertEqual(normalize_name('  Bell state (ERP pair)'), 'bell state erp pair')
+
+    def test_loads_lazily(self):
+        """Test nothing is read until the registry is first used."""
+        registry = ExampleCircuitRegistry(lambda: self.fail('directory resolved too early'))
+        self.assertEqual(registry.check_interval, 2.0)
+
+    def test_find_exact_normalized_and_partial(self):
+        """Test lookups by exact title, normalized title and part of a title."""
+        bell = self.registry.find('Bell state (ERP pair)')
+        self.assertEqual(bell.name, 'Bell state (ERP pair)')
+        self.assertIs(self.registry.find('bell STATE erp-pair'), bell)
+        self.assertIs(self.registry.find('Bell State'), bell)
+        self.assertEqual(self.registry.find('ghz').name, 'Greenberger–Horne–Zeilinger (GHZ) state')
+        self.assertIsNone(self.registry.find('Grover'))
+
+    def test_all_in_file_name_order(self):
+        """Test the examples are listed in a stable order."""
+        self.assertEqual([c.file_name for c in self.registry.all()], ['bell.json', 'ghz.json'])
+
+    def test_reloads_changed_files_only(self):
+        """Test edits are picked up after the check interval, without re-parsing unchanged files."""
+        bell = self.registry.find('Bell')
+        ghz = self.registry.find('GHZ')
+
+        self.write('bell.json', 'Bell state (ERP pair)', gates=[['X']], mtime=bell.mtime + 10**9)
+        self.assertIs(self.registry.find('Bell'), bell)
+
+        self.clock.now = 3
+        updated = self.registry.find('Bell')
+        self.assertIsNot(updated, bell)
+        self.assertNotEqual(updated.etag, bell.etag)
+        self.assertIs(self.registry.find('GHZ'), ghz)
+
+    def test_picks_up_new_and_deleted_files(self):
+        """Test files added or removed are reflected in the indexes."""
+        self.registry.all()
+        self.write('grover.json', 'Grover search')
+        os.remove(os.path.join(self.directory.name, 'ghz.json'))
+
+        self.clock.now = 3
+        self.assertEqual(self.registry.find('grover').name, 'Grover search')
+        self.assertIsNone(self.registry.find('GHZ'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+    File: test_incremental.py
+    Date: 10-2026
+"""
+import unittest
+import numpy as np
+from confighome.incremental import IncrementalSession, IncrementalSimulations
+from confighome.simulator import run_job
+from confighome.workers import SimulationTimeout
+from confighome.tests.test_statevector import random_grid
+
+MEASURE_ALL = [{'qubit': qubit, 'toggle': 1} for qubit in range(4)]
+
+
+def simulated(gates, to_measure=MEASURE_ALL) -> dict:
+    return run_job({'circuit': {'gates': gates}, 'to_measure': to_measure, 'engine': 'numpy'})
+
+
+class TestIncrementalSession(unittest.TestCase):
+    """
+    A class to test incremental re-simulation of edited circuits
+    """
+    def assertMatchesSimulator(self, result, gates, to_measure=MEASURE_ALL):
+        expected = simulated(gates, to_measure)
+        self.assertTrue(np.allclose(result['state_vector'], expected['state_vector'], atol=1e-5))
+        self.assertEqual(len(result['probed_values']), len(expected['probed_values']))
+        for a, b in zip(result['probed_values'], expected['probed_values']):
+            self.assertEqual((a['row'], a['col']), (b['row'], b['col']))
+            self.assertAlmostEqual(a['value'], b['value'], places=5)
+
+    def test_resumes_from_first_changed_column(self):
+        """Test an edit only re-simulates from the column it changed."""
+        session = IncrementalSession()
+        gates = [['H', 'M', 'T', 0, 0], ['X', 'c', 'H', 'M', 0], [0, 'X', 0, 'S', 0], [0, 0, 'M', 0, 0]]
+        self.assertEqual(session.simulate(gates, MEASURE_ALL)['resumed_from'], 0)
+
+        gates[1][3] = 'Y'
+        result = session.simulate(gates, MEASURE_ALL)
+        self.assertEqual(result['resumed_from'], 3)
+        self.assertMatchesSimulator(result, gates)
+
+        appended = [row + ['H'] for row in gates]
+        result = session.simulate(appended, MEASURE_ALL)
+        self.assertEqual(result['resumed_from'], 5)
+        self.assertMatchesSimulator(result, appended)
+
+    def test_unchanged_and_removed_columns(self):
+        """Test resubmitting or trimming a circuit reuses the checkpoints."""
+        session = IncrementalSession()
+        gates = [['H', 'c', 'M'], [0, 'X', 0], [0, 0, 'M'], [0, 0, 0]]
+        session.simulate(gates, MEASURE_ALL)
+
+        self.assertEqual(session.simulate([row[:] for row in gates], MEASURE_ALL)['resumed_from'], 3)
+        trimmed = [row[:2] for row in gates]
+        result = session.simulate(trimmed, [{'qubit': 1, 'toggle': 1}])
+        self.assertEqual(result['resumed_from'], 2)
+        self.assertMatchesSimulator(result, trimmed, [{'qubit': 1, 'toggle': 1}])
+
+    def test_qubit_count_change_restarts(self):
+        """Test adding a qubit starts a new sweep."""
+        session = IncrementalSession()
+        session.simulate([['H'], ['X'], [0], [0]], MEASURE_ALL)
+        result = session.simulate([['H'], ['X'], [0], [0], [0]], MEASURE_ALL)
+        self.assertEqual(result['resumed_from'], 0)
+
+    def test_checkpoints_fit_budget(self):
+        """Test a small budget spaces the checkpoints out without changing the results."""
+        rng = np.random.default_rng(4)
+        gates = random_grid(rng, 4, 24)
+        session = IncrementalSession(checkpoint_bytes=4 * 2**4 * 8)
+        session.simulate(gates, MEASURE_ALL)
+
+        gates[2][13] = 'H' if gates[2][13] != 'H' else 'X'
+        result = session.simulate(gates, MEASURE_ALL)
+        self.assertLessEqual(result['resumed_from'], 13)
+        self.assertGreater(result['resumed_from'], 0)
+        self.assertMatchesSimulator(result, gates)
+
+    def test_random_edits_match_simulator(self):
+        """Test a chain of random edits always gives the simulator's results."""
+        rng = np.random.default_rng(11)
+        session = IncrementalSession()
+        gates = random_grid(rng, 4, 10)
+
+        for _ in range(30):
+            row, col = int(rng.integers(0, 4)), int(rng.integers(0, 10))
+            gates[row][col] = rng.choice(['X', 'H', 'T', 'M', 'c', 0])
+            with self.subTest(gates=gates):
+                self.assertMatchesSimulator(session.simulate(gates, MEASURE_ALL), gates)
+
+    def test_stream_yields_probes_before_result(self):
+        """Test kept probes are streamed first and the rest as the sweep reaches them."""
+        session = IncrementalSession()
+        gates = [['H', 'M', 'T', 0], ['X', 'c', 'H', 'M'], [0, 0, 0, 0], [0, 0, 0, 0]]
+        session.simulate(gates, MEASURE_ALL)
+
+        gates[0][2] = 'S'
+        records = list(session.stream(gates, MEASURE_ALL))
+        self.assertEqual([(r['type'], r.get('col')) for r in records], [('probe', 1), ('probe', 3), ('result', None)])
+        self.assertEqual(records[-1]['resumed_from'], 2)
+        self.assertMatchesSimulator(records[-1], gates)
+
+    def test_timeout_restarts_next_sweep(self):
+        """Test an overrunning sweep is stopped and the next one starts from scratch."""
+        session = IncrementalSession()
+        gates = [['H', 'M', 'T'], ['X', 'c', 'H'], [0, 0, 0], [0, 0, 0]]
+        session.simulate(gates, MEASURE_ALL)
+
+        gates[1][2] = 'X'
+        with self.assertRaises(SimulationTimeout):
+            session.simulate(gates, MEASURE_ALL, timeout=-1)
+
+        result = session.simulate(gates, MEASURE_ALL)
+        self.assertEqual(result['resumed_from'], 0)
+        self.assertMatchesSimulator(result, gates)
+
+    def test_sessions_are_bounded(self):
+        """Test only the most recently used sessions are kept."""
+        simulations = IncrementalSimulations(max_sessions=2)
+        for key in ('a', 'b', 'a', 'c'):
+            simulations.simulate(key, [['H']], [])
+        self.assertEqual(len(simulations), 2)
+        self.assertEqual(simulations.simulate('a', [['H']], [])['resumed_from'], 1)
+        self.assertEqual(simulations.simulate('b', [['H']], [])['resumed_from'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+    File: test_metrics.py
+    Date: 10-2026
+"""
+import unittest
+from confighome.metrics import StageMetrics, StageTimer
+
+
+class FakeClock:
+    """
+    A clock that moves forward by one second every time it is read
+    """
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+
+class TestStageTimer(unittest.TestCase):
+    """
+    A class to test the per-request stage timer
+    """
+    def test_stage_records_milliseconds(self):
+        """Test a stage is timed in milliseconds."""
+        timer = StageTimer(clock=FakeClock())
+        with timer.stage('parse'):
+            pass
+        self.assertEqual(timer.durations, {'parse': 1000})
+
+    def test_repeated_stage_adds_up(self):
+        """Test timing the same stage twice adds the durations."""
+        timer = StageTimer(clock=FakeClock())
+        with timer.stage('probe'):
+            pass
+        timer.update({'probe': 5, 'simulate': 2})
+        self.assertEqual(timer.durations, {'probe': 1005, 'simulate': 2})
+
+    def test_stage_recorded_on_error(self):
+        """Test a stage that raises is still timed."""
+        timer = StageTimer(clock=FakeClock())
+        with self.assertRaises(ValueError):
+            with timer.stage('init'):
+                raise ValueError
+        self.assertIn('init', timer.durations)
+
+    def test_header(self):
+        """Test the Server-Timing header format."""
+        timer = StageTimer()
+        timer.add('parse', 1.234)
+        timer.add('simulate', 20)
+        self.assertEqual(timer.header(), 'parse;dur=1.23, simulate;dur=20.00')
+
+
+class TestStageMetrics(unittest.TestCase):
+    """
+    A class to test the aggregated stage timings
+    """
+    def test_snapshot_by_qubits(self):
+        """Test timings are split by stage and qubit count."""
+        metrics = StageMetrics()
+        for milliseconds in range(1, 101):
+            metrics.record({'simulate': milliseconds}, 3)
+        metrics.record({'simulate': 7, 'parse': 1}, 10)
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['simulate']['3']['count'], 100)
+        self.assertAlmostEqual(snapshot['simulate']['3']['p50'], 50.5)
+        self.assertAlmostEqual(snapshot['simulate']['3']['p95'], 95.05)
+        self.assertEqual(snapshot['simulate']['3']['max'], 100)
+        self.assertEqual(snapshot['simulate']['10']['count'], 1)
+        self.assertEqual(snapshot['parse']['10']['max'], 1)
+
+    def test_samples_are_bounded(self):
+        """Test percentiles only use the most recent samples, while count and max stay exact."""
+        metrics = StageMetrics(max_samples=10)
+        metrics.record({'simulate': 1000}, 1)
+        for _ in range(10):
+            metrics.record({'simulate': 1}, 1)
+
+        stats = metrics.snapshot()['simulate']['1']
+        self.assertEqual(stats['count'], 11)
+        self.assertEqual(stats['max'], 1000)
+        self.assertEqual(stats['p95'], 1)
+
+    def test_clear(self):
+        """Test clearing removes every timing."""
+        metrics = StageMetrics()
+        metrics.record({'parse': 1}, 1)
+        metrics.clear()
+        self.assertEqual(metrics.snapshot(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+    File: test_optimizer.py
+    Date: 10-2026
+"""
+import json
+import os
+import unittest
+import cirq
+import numpy as np
+from confighome.optimizer import optimize_circuit
+from confighome.simulator import Simulator
+
+CIRCUITS_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'static', 'circuits')
+
+
+def load_example(name):
+    """
+    Loads the gate grid of one of the bundled example circuits
+    """
+    with open(os.path.join(CIRCUITS_DIR, name), 'r', encoding='utf-8') as f:
+        return json.load(f)['gates']
+
+
+class TestOptimizer(unittest.TestCase):
+    """
+    A class to test the circuit optimization pass
+    """
+    def setUp(self):
+        self.q = [cirq.GridQubit(i, 0) for i in range(3)]
+
+    def assert_same_state(self, original, optimized):
+        """Asserts two circuits produce the same state on the same qubits."""
+        simulator = cirq.Simulator()
+        before = simulator.simulate(original, qubit_order=self.q).final_state_vector
+        after = simulator.simulate(optimized, qubit_order=self.q).final_state_vector
+        self.assertTrue(cirq.allclose_up_to_global_phase(before, after, atol=1e-5))
+
+    def test_drops_identities(self):
+        """Test plain and controlled identities are removed."""
+        circuit = cirq.Circuit([cirq.I(self.q[0]), cirq.I(self.q[1]).controlled_by(self.q[0]), cirq.X(self.q[2])])
+        optimized = optimize_circuit(circuit)
+        self.assertEqual(list(optimized.all_operations()), [cirq.X(self.q[2])])
+
+    def test_keeps_probes(self):
+        """Test tagged identities used as probes survive and block fusion."""
+        probe = cirq.I(self.q[0]).with_tags('probe_0_1')
+        circuit = cirq.Circuit([cirq.H(self.q[0]), probe, cirq.H(self.q[0])])
+        optimized = optimize_circuit(circuit)
+        self.assertEqual(list(optimized.all_operations()), [cirq.H(self.q[0]), probe, cirq.H(self.q[0])])
+
+    def test_keeps_anticontrolled_columns(self):
+        """Test consecutive anticontrolled columns need no X gates on their anticontrol."""
+        sim = Simulator([['ac', 'ac'], ['X', 0], [0, 'H']], [])
+        sim.generate_cirq_circuit()
+        optimized = optimize_circuit(sim.cirq_circuit)
+
+        x_on_control = [op for op in optimized.all_operations() if op.qubits == (self.q[0],)]
+        self.assertEqual(len(x_on_control), 0)
+        self.assert_same_state(sim.cirq_circuit, optimized)
+
+    def test_cancels_cascading_pairs(self):
+        """Test pairs exposed by an earlier cancellation also cancel."""
+        circuit = cirq.Circuit([cirq.CNOT(self.q[0], self.q[1]), cirq.H(self.q[1]), cirq.H(self.q[1]), cirq.CNOT(self.q[0], self.q[1])])
+        self.assertEqual(len(list(optimize_circuit(circuit).all_operations())), 0)
+
+    def test_fuses_single_qubit_runs(self):
+        """Test a run of single qubit gates becomes one matrix gate."""
+        circuit = cirq.Circuit([cirq.H(self.q[0]), cirq.T(self.q[0]), cirq.S(self.q[0]), cirq.X(self.q[1])])
+        optimized = optimize_circuit(circuit)
+        self.assertEqual(len(list(optimized.all_operations())), 2)
+        self.assert_same_state(circuit, optimized)
+
+    def test_packs_moments(self):
+        """Test independent operations share a moment."""
+        circuit = cirq.Circuit([cirq.Moment([cirq.X(self.q[0])]), cirq.Moment([cirq.X(self.q[1])]), cirq.Moment([cirq.X(self.q[2])])])
+        self.assertEqual(len(optimize_circuit(circuit)), 1)
+
+    def test_examples_shrink_and_match(self):
+        """Test the QFT and Shor code examples lose operations without changing their output."""
+        for name in ['Quantum Fourier transform on 3 qubits.json', 'Shor Code.json']:
+            gates = load_example(name)
+            to_measure = [{'qubit': q, 'toggle': 1} for q in range(len(gates))]
+
+            sim = Simulator(gates, to_measure)
+            sim.generate_cirq_circuit()
+            optimized = optimize_circuit(sim.cirq_circuit)
+
+            unoptimized_sim = Simulator(gates, to_measure, optimize=False)
+            unoptimized_sim.generate_cirq_circuit()
+
+            with self.subTest(name=name):
+                self.assertLess(len(list(optimized.all_operations())), len(list(sim.cirq_circuit.all_operations())))
+                self.assertLessEqual(len(optimized), len(sim.cirq_circuit))
+                self.assertTrue(np.allclose(sim.simulate_circuit(), unoptimized_sim.simulate_circuit(), atol=1e-5))
+
+if __name__ == '__main__':
+    unittest.main()
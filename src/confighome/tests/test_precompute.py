@@ -0,0 +1,88 @@
+"""
+    File: test_precompute.py
+    Date: 10-2026
+"""
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from confighome.examples import ExampleCircuitRegistry
+from confighome.precompute import PrecomputedResults, example_key, precompute_examples
+from confighome.simulator import run_job
+from confighome.tests.test_examples import FakeClock
+
+BELL = [['H', 'c', 0], [0, 'X', 'M'], [0, 0]]
+MEASURE_ALL = [{'qubit': qubit, 'toggle': 1} for qubit in range(3)]
+
+
+class TestPrecomputedResults(unittest.TestCase):
+    """
+    A class to test the precomputed example circuit results
+    """
+    def setUp(self):
+        self.examples = tempfile.TemporaryDirectory()
+        self.output = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+        self.write('bell.json', BELL)
+        self.registry = ExampleCircuitRegistry(self.examples.name, check_interval=2, clock=self.clock)
+        self.results = PrecomputedResults(self.output.name, self.registry, check_interval=2, clock=self.clock)
+
+    def tearDown(self):
+        self.examples.cleanup()
+        self.output.cleanup()
+
+    def write(self, file_name, gates, mtime=None):
+        path = os.path.join(self.examples.name, file_name)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'title': file_name, 'gates': gates}, f)
+        if mtime is not None:
+            os.utime(path, ns=(mtime, mtime))
+
+    def test_example_key_ignores_padding(self):
+        """Test trailing empty columns and cells past the shortest row do not change the key."""
+        padded = [row[:2] + [0, '0'] for row in BELL]
+        self.assertEqual(example_key(padded), example_key(BELL))
+        self.assertEqual(example_key([row[:2] for row in BELL]), example_key(BELL))
+        self.assertNotEqual(example_key([['H'], [0]]), example_key([['H'], [0], [0]]))
+        self.assertNotEqual(example_key([['H', 'X']]), example_key([['X', 'H']]))
+
+    def test_matches_simulator(self):
+        """Test stored results match the simulator for any measured qubits."""
+        precompute_examples(self.registry, self.output.name)
+
+        for to_measure in ([], MEASURE_ALL, [{'qubit': 1, 'toggle': 1}, {'qubit': 0, 'toggle': 0}]):
+            with self.subTest(to_measure=to_measure):
+                stored = self.results.get(BELL, to_measure)
+                simulated = run_job({'circuit': {'gates': BELL}, 'to_measure': to_measure})
+                self.assertTrue(np.allclose(stored['state_vector'], simulated['state_vector'], atol=1e-6))
+                self.assertEqual(stored['probed_values'], simulated['probed_values'])
+
+    def test_missing_results(self):
+        """Test nothing is served before the results are written, or for other circuits."""
+        self.assertIsNone(self.results.get(BELL, MEASURE_ALL))
+
+        precompute_examples(self.registry, self.output.name)
+        self.clock.now += 2
+        self.assertIsNotNone(self.results.get(BELL, MEASURE_ALL))
+        self.assertIsNone(self.results.get([['X']], MEASURE_ALL))
+
+    def test_changed_example_is_invalidated(self):
+        """Test a result stops being served once its example file changes."""
+        precompute_examples(self.registry, self.output.name)
+        self.assertIsNotNone(self.results.get(BELL, MEASURE_ALL))
+
+        self.write('bell.json', [['X', 0], [0, 0], [0, 0]], mtime=10**18)
+        self.clock.now += 2
+        self.assertIsNone(self.results.get(BELL, MEASURE_ALL))
+
+    def test_arrays_are_read_only(self):
+        """Test workers share the stored arrays as read-only memory maps."""
+        precompute_examples(self.registry, self.output.name)
+        array = np.load(os.path.join(self.output.name, f'{example_key(BELL)}.npy'), mmap_mode='r')
+        self.assertFalse(array.flags.writeable)
+        self.assertAlmostEqual(float(array.sum()), 1, places=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,10 +3,13 @@
     Author: Lea Button
     Date: 04-2024
 """
+import threading
 import unittest
+from unittest.mock import patch
 import cirq
 import numpy as np
-from confighome.simulator import Simulator
+from confighome import simulator as simulator_module
+from confighome.simulator import Simulator, run_job, sample_counts, stream_job, top_outcomes
 
 class TestSimulator(unittest.TestCase):
     """
@@ -475,5 +478,183 @@ class TestSimulator(unittest.TestCase):
                 self.assertEqual(actual['col'], expected['col'])
                 self.assertTrue(np.isclose(actual['value'], expected['value']))
 
+    def test_probe_before_simulate_without_probed_circuit(self):
+        """Test probing before the probed circuit is generated still leaves the right final state."""
+        sim = Simulator([['X', 'M']], [{'qubit': 0, 'toggle': 1}], engine='cirq')
+        sim.generate_cirq_circuit()
+        probes = sim.probe_measurements()
+
+        self.assertEqual([(p['row'], p['col']) for p in probes], [(0, 1)])
+        self.assertTrue(np.allclose(sim.simulate_circuit(), [0, 1]))
+
+    def test_stream_probes_copies_only_probed_states(self):
+        """Test the sweep only copies the state before probed moments and at the end."""
+        gates = [['H', 'T', 'H', 'S', 'M', 'X', 'H'],
+                 ['X', 'H', 'T', 'H', 0, 'H', 'T']]
+        sim = Simulator(gates, [{'qubit': 0, 'toggle': 1}], engine='cirq', optimize=False)
+        sim.generate_probed_circuit()
+
+        state_vector = cirq.SparseSimulatorStep.state_vector
+        with patch.object(cirq.SparseSimulatorStep, 'state_vector', autospec=True, side_effect=state_vector) as copies:
+            probes = sim.probe_measurements()
+
+        self.assertEqual(len(probes), 1)
+        self.assertEqual(copies.call_count, 2)
+        expected = Simulator(gates, [{'qubit': 0, 'toggle': 1}], engine='numpy').simulate_circuit()
+        self.assertTrue(np.allclose(sim.simulate_circuit(), expected, atol=1e-6))
+
+    def test_probe_measurements_match_prefix_simulation(self):
+        """Test the single sweep gives the same values as simulating each prefix from scratch."""
+        gates = [['H', 'M', 'c', 'M', 'T', 'M'],
+                 [0, 'M', 'X', 'M', 'ac', 'M'],
+                 ['X', 'M', 'H', 'M', 'H', 'M']]
+        sim = Simulator(gates, [])
+        sim.generate_probed_circuit()
+        probes = sim.probe_measurements()
+
+        self.assertEqual(len(probes), 9)
+        for moment_index, moment in enumerate(sim.probed_circuit):
+            for op in moment:
+                if not isinstance(op, cirq.TaggedOperation):
+                    continue
+                row, col = map(int, op.tags[0].split('_')[1:])
+                prefix = cirq.Circuit(sim.probed_circuit[:moment_index])
+                state = cirq.Simulator().simulate(prefix, qubit_order=sim.qubits).final_state_vector
+                probs = (np.abs(state)**2).reshape([2] * len(sim.qubits))
+                expected = np.sum(np.take(probs, 1, axis=row))
+                actual = next(p for p in probes if p['row'] == row and p['col'] == col)
+                with self.subTest(row=row, col=col):
+                    self.assertTrue(np.isclose(actual['value'], expected, atol=1e-6))
+
+    # -------------------------------------------------------------------------------------------
+    # ---------------------------- SAMPLING TESTS -----------------------------------------------
+    # -------------------------------------------------------------------------------------------
+    def test_sample_counts_total_shots(self):
+        """Test the counts add up to the number of shots, keyed by bitstring."""
+        counts = sample_counts([0.5, 0, 0, 0.5], 1000, np.random.default_rng(1))
+        self.assertEqual(sum(counts.values()), 1000)
+        self.assertEqual(set(counts), {'00', '11'})
+
+    def test_sample_counts_deterministic_outcome(self):
+        """Test a certain outcome gets every shot."""
+        self.assertEqual(sample_counts([0, 0, 1, 0], 10), {'10': 10})
+
+    def test_sample_counts_no_measured_qubits(self):
+        """Test sampling with nothing measured."""
+        self.assertEqual(sample_counts([1.0], 5), {'': 5})
+
+    def test_sample_counts_million_shots(self):
+        """Test a million shots come from a single draw and follow the distribution."""
+        counts = sample_counts([0.25, 0.75], 10**6, np.random.default_rng(7))
+        self.assertEqual(sum(counts.values()), 10**6)
+        self.assertTrue(abs(counts['1'] / 10**6 - 0.75) < 0.01)
+
+    def test_sample(self):
+        """Test sampling the measured qubits of a circuit."""
+        gates = [['X'], ['H']]
+        sim = Simulator(gates, [{'qubit': 0, 'toggle': 1}], engine='numpy')
+        self.assertEqual(sim.sample(100, seed=3), {'1': 100})
+
+    def test_top_outcomes_top_k(self):
+        """Test the k most likely outcomes are kept, most likely first."""
+        outcomes = top_outcomes([0.1, 0.4, 0, 0.3, 0.2, 0, 0, 0], top_k=2)
+        self.assertEqual(list(outcomes.items()), [('001', 0.4), ('011', 0.3)])
+
+    def test_top_outcomes_min_probability(self):
+        """Test unlikely and impossible outcomes are dropped."""
+        probabilities = [0.1, 0.4, 0, 0.3, 0.2, 0, 0, 0]
+        self.assertEqual(top_outcomes(probabilities, min_probability=0.15), {'001': 0.4, '011': 0.3, '100': 0.2})
+        self.assertEqual(len(top_outcomes(probabilities, top_k=10)), 4)
+
+    def test_top_outcomes_wide_distribution(self):
+        """Test picking from a large distribution matches a full sort."""
+        probabilities = np.random.default_rng(13).random(2**16)
+        outcomes = top_outcomes(probabilities, top_k=5)
+        expected = np.argsort(probabilities)[::-1][:5]
+        self.assertEqual([int(bits, 2) for bits in outcomes], list(expected))
+
+    # -------------------------------------------------------------------------------------------
+    # ---------------------------- BATCH TESTS --------------------------------------------------
+    # -------------------------------------------------------------------------------------------
+    def test_run_job(self):
+        """Test running a single /simulate style job."""
+        result = run_job({'circuit': {'gates': [['X', 'M']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}]})
+        self.assertEqual(result['status'], 'ok')
+        self.assertTrue(np.allclose(result['state_vector'], [0, 1]))
+        self.assertEqual(result['probed_values'][0]['col'], 1)
+        self.assertTrue(np.isclose(result['probed_values'][0]['value'], 1))
+
+    def test_run_job_simulates_cirq_once(self):
+        """Test a Cirq job takes its final state from the probe sweep instead of simulating again."""
+        job = {'circuit': {'gates': [['H', 'M'], [0, 'X']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}], 'engine': 'cirq'}
+        with patch.object(cirq.Simulator, 'simulate', side_effect=AssertionError('simulated twice')):
+            result = run_job(job)
+        self.assertEqual(result['status'], 'ok')
+        self.assertTrue(np.allclose(result['state_vector'], [0.5, 0.5]))
+        self.assertTrue(np.isclose(result['probed_values'][0]['value'], 0.5))
+
+    def test_run_job_with_error(self):
+        """Test a broken job reports an error instead of raising."""
+        result = run_job({'circuit': 'not a circuit'})
+        self.assertEqual(result['status'], 'error')
+        self.assertIn('message', result)
+
+    def test_simulate_batch_keeps_order_and_isolates_failures(self):
+        """Test batch results come back in order, and one failing circuit does not abort the rest."""
+        jobs = [
+            {'circuit': {'gates': [['X']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}]},
+            {'circuit': {'gates': [['X']]}, 'to_measure': [], 'engine': 'quantum'},
+            {'circuit': {'gates': [['H'], ['c']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}]},
+        ]
+        results = Simulator.simulate_batch(jobs, max_workers=2)
+
+        self.assertEqual([r['status'] for r in results], ['ok', 'error', 'ok'])
+        self.assertTrue(np.allclose(results[0]['state_vector'], [0, 1]))
+        self.assertTrue(np.allclose(results[2]['state_vector'], [1, 0]))
+
+    def test_simulate_batch_creates_one_spawned_pool(self):
+        """Test concurrent first batches share one pool, whose workers are spawned rather than forked."""
+        with patch.object(simulator_module, '_batch_pool', None), \
+                patch.object(simulator_module, 'ProcessPoolExecutor', wraps=simulator_module.ProcessPoolExecutor) as executor:
+            job = {'circuit': {'gates': [['X']]}, 'to_measure': []}
+            threads = [threading.Thread(target=Simulator.simulate_batch, args=([job], 1)) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            simulator_module._batch_pool.shutdown()
+
+        self.assertEqual(executor.call_count, 1)
+        self.assertEqual(executor.call_args.kwargs['mp_context'].get_start_method(), 'spawn')
+
+    # -------------------------------------------------------------------------------------------
+    # ---------------------------- STREAMING TESTS ----------------------------------------------
+    # -------------------------------------------------------------------------------------------
+    def test_stream_job_matches_run_job(self):
+        """Test a streamed job yields its probes, then the same result as run_job, for every engine."""
+        gates = [['H', 'M', 'T', 'M'], [0, 'c', 'X', 'M']]
+        to_measure = [{'qubit': 0, 'toggle': 1}, {'qubit': 1, 'toggle': 1}]
+
+        for engine in ('cirq', 'numpy', 'sparse'):
+            job = {'circuit': {'gates': gates}, 'to_measure': to_measure, 'engine': engine}
+            with self.subTest(engine=engine):
+                records = list(stream_job(job))
+                expected = run_job(job)
+
+                self.assertEqual([r['type'] for r in records], ['probe'] * 3 + ['result'])
+                self.assertTrue(np.allclose(records[-1]['state_vector'], expected['state_vector'], atol=1e-6))
+                self.assertEqual(records[-1]['probed_values'], [{k: r[k] for k in ('row', 'col', 'value')} for r in records[:-1]])
+
+    def test_stream_job_is_lazy(self):
+        """Test probes are yielded before the sweep finishes."""
+        records = stream_job({'circuit': {'gates': [['X', 'M', 'H']]}, 'to_measure': [], 'engine': 'numpy'})
+        first = next(records)
+        self.assertEqual((first['type'], first['col']), ('probe', 1))
+
+    def test_stream_job_with_error(self):
+        """Test a broken streamed job ends with an error record."""
+        records = list(stream_job({'circuit': 'not a circuit'}))
+        self.assertEqual(records[-1]['type'], 'error')
+
 if __name__ == '__main__':
     unittest.main()
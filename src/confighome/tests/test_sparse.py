@@ -0,0 +1,99 @@
+"""
+    File: test_sparse.py
+    Date: 10-2026
+"""
+import unittest
+import numpy as np
+from confighome.columns import parse_columns
+from confighome.simulator import Simulator, resolve_engine
+from confighome.sparse import SparseEngine, densify_threshold, max_support
+from confighome.statevector import StatevectorEngine, GATE_MATRICES
+from confighome.tests.test_statevector import random_grid
+
+
+class TestSparseEngine(unittest.TestCase):
+    """
+    A class to test the sparse engine against the dense state vector engine
+    """
+    # -------------------------------------------------------------------------------------------
+    # ---------------------------- KERNEL TESTS -------------------------------------------------
+    # -------------------------------------------------------------------------------------------
+    def test_permutation_gates_keep_support(self):
+        """Test X, controlled X and swaps never add amplitudes."""
+        engine = SparseEngine(8)
+        engine.apply_gate(GATE_MATRICES['X'], 0)
+        engine.apply_gate(GATE_MATRICES['X'], 5, controls=[0])
+        engine.apply_swap(5, 7)
+        self.assertEqual(engine.support, 1)
+        self.assertTrue(np.allclose(engine.marginal([0, 5, 7]), np.eye(8)[5]))
+
+    def test_hadamard_pair_cancels(self):
+        """Test amplitudes that cancel are dropped from the state."""
+        engine = SparseEngine(8)
+        engine.apply_gate(GATE_MATRICES['H'], 3)
+        self.assertEqual(engine.support, 2)
+        engine.apply_gate(GATE_MATRICES['H'], 3)
+        self.assertEqual(engine.support, 1)
+        self.assertAlmostEqual(engine.probability_of_one(3), 0)
+
+    def test_switches_to_dense(self):
+        """Test the state moves to a dense engine once the support passes the threshold."""
+        engine = SparseEngine(5)
+        engine.apply_gate(GATE_MATRICES['H'], 0)
+        self.assertFalse(engine.is_dense)
+        engine.apply_gate(GATE_MATRICES['H'], 1)
+        self.assertTrue(engine.is_dense)
+        self.assertTrue(np.allclose(engine.marginal([0, 1]), [0.25] * 4))
+
+    def test_wide_toffoli_arithmetic(self):
+        """Test classical circuits far wider than a state vector could hold."""
+        n = 300
+        engine = SparseEngine(n)
+        engine.apply_gate(GATE_MATRICES['X'], 0)
+        engine.apply_gate(GATE_MATRICES['X'], 150)
+        engine.apply_gate(GATE_MATRICES['X'], n - 1, controls=[0, 150])
+        engine.apply_gate(GATE_MATRICES['S'], n - 1)
+        self.assertEqual(engine.support, 1)
+        self.assertEqual(engine.probability_of_one(n - 1), 1)
+        self.assertEqual(engine.distribution([0, n - 1]), {3: 1.0})
+
+    def test_matches_statevector_engine(self):
+        """Test random circuits give the same state as the dense engine, before and after switching over."""
+        rng = np.random.default_rng(9)
+
+        for _ in range(60):
+            rows = int(rng.integers(1, 7))
+            columns = [list(column) for column in zip(*random_grid(rng, rows, int(rng.integers(1, 10))))]
+
+            sparse = SparseEngine(rows)
+            dense = StatevectorEngine(rows)
+
+            with self.subTest(columns=columns):
+                sparse_probes = sparse.run(columns)
+                dense_probes = dense.run(columns)
+                self.assertTrue(np.allclose(sparse.state_vector(), dense.state_vector(), atol=1e-5))
+                for a, b in zip(sparse_probes, dense_probes):
+                    self.assertAlmostEqual(a['value'], b['value'], places=5)
+
+    # -------------------------------------------------------------------------------------------
+    # ---------------------------- ROUTING TESTS ------------------------------------------------
+    # -------------------------------------------------------------------------------------------
+    def test_max_support_counts_hadamards(self):
+        """Test the support bound doubles per H and is capped at 2**n."""
+        columns = parse_columns([['H', 'H'], ['c', 'X'], ['T', 'H']])
+        self.assertEqual(max_support(columns, 2), 4)
+        self.assertEqual(max_support(columns, 10), 8)
+        self.assertEqual(densify_threshold(10), 2**7)
+
+    def test_auto_routes_low_support_circuits(self):
+        """Test 'auto' picks the sparse engine for non-Clifford circuits with little superposition."""
+        toffoli = [['X', 'c'], ['X', 'c'], [0, 'X'], ['T', 0]]
+        self.assertEqual(resolve_engine(toffoli), 'sparse')
+
+        simulator = Simulator(toffoli, [{'qubit': 2, 'toggle': 1}])
+        self.assertEqual(simulator.engine, 'sparse')
+        self.assertTrue(np.allclose(simulator.simulate_circuit(), [0, 1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
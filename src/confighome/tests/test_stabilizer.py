@@ -0,0 +1,141 @@
+"""
+    File: test_stabilizer.py
+    Date: 10-2026
+"""
+import unittest
+import numpy as np
+from confighome.columns import parse_columns
+from confighome.simulator import Simulator, resolve_engine
+from confighome.stabilizer import StabilizerEngine, is_clifford
+
+
+def random_clifford_grid(rng, rows, cols):
+    """
+    Builds a random Clifford grid (indexed [row][col]), with at most one control per column
+    """
+    grid = [[0] * cols for _ in range(rows)]
+
+    for col in range(cols):
+        free = list(rng.permutation(rows))
+        if rows >= 2 and rng.random() < 0.3:
+            grid[free.pop()][col] = rng.choice(['c', 'ac'])
+            palette = ['X', 'Y', 'Z', 'I', 'M', 0, 0]
+        elif rows >= 2 and rng.random() < 0.2:
+            grid[free.pop()][col] = 'sw'
+            grid[free.pop()][col] = 'sw'
+            palette = ['X', 'Y', 'Z', 'H', 'S', 'I', 'M', 0]
+        else:
+            palette = ['X', 'Y', 'Z', 'H', 'S', 'I', 'M', 0]
+        for row in free:
+            grid[row][col] = rng.choice(palette)
+
+    return grid
+
+
+def columns_of(grid):
+    """
+    Parses a grid indexed [row][col] into its columns
+    """
+    return parse_columns([list(column) for column in zip(*grid)])
+
+
+class TestStabilizerEngine(unittest.TestCase):
+    """
+    A class to test the stabilizer tableau engine against the dense state vector engine
+    """
+    # -------------------------------------------------------------------------------------------
+    # ---------------------------- is_clifford TESTS --------------------------------------------
+    # -------------------------------------------------------------------------------------------
+    def test_is_clifford_accepts_clifford_gates(self):
+        """Test H, S, Paulis, CNOT and swaps are Clifford."""
+        grid = [['H', 'c', 'sw', 'S'], [0, 'X', 'sw', 'Y']]
+        self.assertTrue(is_clifford(columns_of(grid)))
+
+    def test_is_clifford_rejects_t(self):
+        """Test a T gate is not Clifford."""
+        self.assertFalse(is_clifford(columns_of([['H', 'T']])))
+
+    def test_is_clifford_rejects_toffoli(self):
+        """Test a doubly controlled gate is not Clifford."""
+        self.assertFalse(is_clifford(columns_of([['c'], ['c'], ['X']])))
+
+    def test_is_clifford_rejects_controlled_h(self):
+        """Test a controlled Hadamard is not Clifford."""
+        self.assertFalse(is_clifford(columns_of([['c'], ['H']])))
+
+    def test_is_clifford_rejects_controlled_swap(self):
+        """Test a Fredkin gate is not Clifford."""
+        self.assertFalse(is_clifford(columns_of([['c'], ['sw'], ['sw']])))
+
+    # -------------------------------------------------------------------------------------------
+    # ---------------------------- ENGINE TESTS -------------------------------------------------
+    # -------------------------------------------------------------------------------------------
+    def test_bell_distribution(self):
+        """Test a Bell pair only ever measures 00 or 11."""
+        engine = StabilizerEngine(2)
+        engine.run([['H', 0], ['c', 'X']])
+        self.assertEqual(engine.distribution([0, 1]), {0: 0.5, 3: 0.5})
+
+    def test_rejects_non_clifford_columns(self):
+        """Test the engine refuses a Toffoli or a T gate rather than dropping a control or crashing."""
+        for columns in ([['X', 0, 0], ['c', 'c', 'X']], [['T']]):
+            with self.subTest(columns=columns), self.assertRaises(ValueError):
+                StabilizerEngine(len(columns[0])).run(columns)
+
+    def test_deterministic_outcome(self):
+        """Test an X gate gives a certain measurement."""
+        engine = StabilizerEngine(3)
+        engine.x_gate(1)
+        self.assertEqual(engine.probability_of_one(0), 0)
+        self.assertEqual(engine.probability_of_one(1), 1)
+        self.assertTrue(np.allclose(engine.marginal([0, 1, 2]), np.eye(8)[2]))
+
+    def test_wide_ghz(self):
+        """Test a 200 qubit GHZ state, far past what a state vector could hold."""
+        gates = [['H', 'c', 'M']] + [[0, 'X', 'M'] for _ in range(199)]
+        to_measure = [{'qubit': 0, 'toggle': 1}, {'qubit': 199, 'toggle': 1}]
+
+        simulator = Simulator(gates, to_measure)
+        self.assertEqual(simulator.engine, 'stabilizer')
+        self.assertTrue(np.allclose(simulator.simulate_circuit(), [0.5, 0, 0, 0.5]))
+        self.assertTrue(all(probe['value'] == 0.5 for probe in simulator.probe_measurements()))
+
+    def test_matches_statevector_engine(self):
+        """Test random Clifford circuits give the same results as the dense engine."""
+        rng = np.random.default_rng(8)
+
+        for _ in range(40):
+            rows = int(rng.integers(1, 6))
+            grid = random_clifford_grid(rng, rows, int(rng.integers(1, 10)))
+            to_measure = [{'qubit': q, 'toggle': int(rng.integers(0, 2))} for q in range(rows)]
+
+            stabilizer = Simulator(grid, to_measure, engine='stabilizer')
+            dense = Simulator(grid, to_measure, engine='numpy')
+
+            with self.subTest(grid=grid):
+                self.assertTrue(np.allclose(stabilizer.simulate_circuit(), dense.simulate_circuit(), atol=1e-5))
+                for a, b in zip(stabilizer.probe_measurements(), dense.probe_measurements()):
+                    self.assertEqual((a['row'], a['col']), (b['row'], b['col']))
+                    self.assertAlmostEqual(a['value'], b['value'], places=5)
+
+    # -------------------------------------------------------------------------------------------
+    # ---------------------------- resolve_engine TESTS -----------------------------------------
+    # -------------------------------------------------------------------------------------------
+    def test_auto_routes_clifford_circuits(self):
+        """Test 'auto' picks the stabilizer engine for Clifford circuits and a dense engine otherwise."""
+        self.assertEqual(resolve_engine([['H', 'c'], [0, 'X']]), 'stabilizer')
+        self.assertEqual(resolve_engine([['H', 'T'], [0, 'X']]), 'numpy')
+
+    def test_explicit_engine_is_kept(self):
+        """Test a requested engine is used even for Clifford circuits."""
+        self.assertEqual(resolve_engine([['H']], 'numpy'), 'numpy')
+
+    def test_forced_stabilizer_requires_clifford(self):
+        """Test forcing the stabilizer engine on a Toffoli or a T gate is rejected."""
+        for gates in ([['X', 'c'], [0, 'c'], [0, 'X']], [['H', 'T']]):
+            with self.subTest(gates=gates), self.assertRaises(ValueError):
+                resolve_engine(gates, 'stabilizer')
+
+
+if __name__ == '__main__':
+    unittest.main()
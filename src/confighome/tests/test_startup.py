@@ -0,0 +1,46 @@
+"""
+    File: test_startup.py
+    Date: 10-2026
+"""
+import unittest
+from io import StringIO
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from confighome.backends import LazyModule, lazy_import
+from confighome.benchmarks import measure_startup
+
+
+class TestStartup(unittest.TestCase):
+    """
+    A class to test the start-up cost of a worker
+    """
+    # -------------------------------------------------------------------------------------------
+    # ---------------------------- IMPORT TESTS -------------------------------------------------
+    # -------------------------------------------------------------------------------------------
+    def test_views_import_loads_no_backend(self):
+        """Test importing the views in a fresh worker loads no simulation backend."""
+        startup = measure_startup(settings.SETTINGS_MODULE, settings.BASE_DIR)
+        self.assertEqual(startup['loaded'], [])
+        self.assertGreater(startup['seconds'], 0)
+
+    def test_benchmark_startup_command(self):
+        """Test the start-up benchmark reports the import time and fails when it is over budget."""
+        out = StringIO()
+        call_command('benchmark_startup', '--budget', '600', '--repeat', '1', stdout=out)
+        self.assertIn('within budget', out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command('benchmark_startup', '--budget', '0', '--repeat', '1', stdout=StringIO())
+
+    def test_lazy_module_loads_on_first_use(self):
+        """Test a lazy module is only imported once an attribute is used."""
+        module = lazy_import('colorsys')
+        self.assertIsInstance(module, LazyModule)
+        self.assertFalse(module.loaded)
+        self.assertEqual(module.rgb_to_hsv(0, 0, 0), (0, 0, 0))
+        self.assertTrue(module.loaded)
+
+
+if __name__ == '__main__':
+    unittest.main()
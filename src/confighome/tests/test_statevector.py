@@ -0,0 +1,146 @@
+"""
+    File: test_statevector.py
+    Date: 10-2026
+"""
+import unittest
+import cirq
+import numpy as np
+from confighome.simulator import Simulator
+from confighome.statevector import StatevectorEngine, GATE_MATRICES
+
+
+def random_grid(rng, rows, cols):
+    """
+    Builds a random builder grid (indexed [row][col]) using the full gate palette
+    """
+    palette = ['X', 'Y', 'Z', 'H', 'S', 'T', 'I', 'M', 0, 0, 0]
+    grid = [[0] * cols for _ in range(rows)]
+
+    for col in range(cols):
+        if rng.random() < 0.1:
+            for row in range(rows):
+                grid[row][col] = 'b'
+            continue
+
+        free = list(rng.permutation(rows))
+        if rows >= 2 and rng.random() < 0.2:
+            grid[free.pop()][col] = 'sw'
+            grid[free.pop()][col] = 'sw'
+        for _ in range(rng.integers(0, min(2, len(free)) + 1)):
+            if len(free) > 1:
+                grid[free.pop()][col] = rng.choice(['c', 'ac'])
+        for row in free:
+            grid[row][col] = rng.choice(palette)
+
+    return grid
+
+
+class TestStatevectorEngine(unittest.TestCase):
+    """
+    A class to test the NumPy state vector engine against Cirq
+    """
+    # -------------------------------------------------------------------------------------------
+    # ---------------------------- KERNEL TESTS -------------------------------------------------
+    # -------------------------------------------------------------------------------------------
+    def test_initial_state(self):
+        """Test the engine starts in |0...0>."""
+        engine = StatevectorEngine(3)
+        expected = np.zeros(8)
+        expected[0] = 1
+        self.assertTrue(np.allclose(engine.state_vector(), expected))
+
+    def test_apply_gate_on_first_qubit(self):
+        """Test qubit 0 is the most significant bit, as in Cirq."""
+        engine = StatevectorEngine(2)
+        engine.apply_gate(GATE_MATRICES['X'], 0)
+        self.assertTrue(np.allclose(engine.state_vector(), [0, 0, 1, 0]))
+
+    def test_apply_controlled_gate(self):
+        """Test a CNOT only flips the target when the control is |1>."""
+        engine = StatevectorEngine(2)
+        engine.apply_gate(GATE_MATRICES['H'], 0)
+        engine.apply_gate(GATE_MATRICES['X'], 1, controls=[0])
+        self.assertTrue(np.allclose(engine.state_vector(), [1 / np.sqrt(2), 0, 0, 1 / np.sqrt(2)]))
+
+    def test_apply_anticontrolled_gate(self):
+        """Test an anticontrolled X flips the target when the anticontrol is |0>."""
+        engine = StatevectorEngine(2)
+        engine.apply_gate(GATE_MATRICES['X'], 1, anticontrols=[0])
+        self.assertTrue(np.allclose(engine.state_vector(), [0, 1, 0, 0]))
+
+    def test_apply_swap(self):
+        """Test swapping two qubits."""
+        engine = StatevectorEngine(3)
+        engine.apply_gate(GATE_MATRICES['X'], 0)
+        engine.apply_swap(0, 2)
+        self.assertTrue(np.allclose(engine.state_vector(), [0, 1, 0, 0, 0, 0, 0, 0]))
+
+    def test_mixed_controls_touch_only_their_slice(self):
+        """Test a gate with controls and anticontrols matches the full controlled unitary, in place."""
+        rng = np.random.default_rng(7)
+        q = cirq.LineQubit.range(5)
+        engine = StatevectorEngine(5)
+        engine.state = (rng.normal(size=(2,) * 5) + 1j * rng.normal(size=(2,) * 5)).astype(np.complex64)
+        initial = engine.state.reshape(-1).copy()
+        buffer = engine.state
+
+        operations = [
+            (cirq.H(q[2]).controlled_by(q[0], q[4], control_values=[1, 0]), lambda: engine.apply_gate(GATE_MATRICES['H'], 2, [0], [4])),
+            (cirq.T(q[1]).controlled_by(q[3], control_values=[0]), lambda: engine.apply_gate(GATE_MATRICES['T'], 1, [], [3])),
+            (cirq.X(q[4]).controlled_by(q[0], q[1], control_values=[0, 1]), lambda: engine.apply_gate(GATE_MATRICES['X'], 4, [1], [0])),
+            (cirq.SWAP(q[0], q[3]).controlled_by(q[2], q[1], control_values=[1, 0]), lambda: engine.apply_swap(0, 3, [2], [1])),
+        ]
+        expected = initial
+        for operation, apply in operations:
+            expected = cirq.Circuit(operation).unitary(qubit_order=q) @ expected
+            apply()
+
+        self.assertIs(engine.state, buffer)
+        self.assertTrue(np.allclose(engine.state_vector(), expected, atol=1e-5))
+
+    def test_probability_of_one(self):
+        """Test the marginal of a single qubit."""
+        engine = StatevectorEngine(2)
+        engine.apply_gate(GATE_MATRICES['H'], 1)
+        self.assertTrue(np.isclose(engine.probability_of_one(0), 0))
+        self.assertTrue(np.isclose(engine.probability_of_one(1), 0.5))
+
+    # -------------------------------------------------------------------------------------------
+    # ---------------------------- DIFFERENTIAL TESTS -------------------------------------------
+    # -------------------------------------------------------------------------------------------
+    def test_matches_cirq_on_random_circuits(self):
+        """Test the NumPy engine gives the same amplitudes and probes as Cirq on random grids."""
+        rng = np.random.default_rng(2024)
+
+        for trial in range(40):
+            rows = int(rng.integers(1, 7))
+            cols = int(rng.integers(1, 9))
+            gates = random_grid(rng, rows, cols)
+            to_measure = [{'qubit': q, 'toggle': int(rng.integers(0, 2))} for q in range(rows)]
+
+            cirq_sim = Simulator(gates, to_measure, engine='cirq')
+            cirq_sim.generate_cirq_circuit()
+            cirq_sim.generate_probed_circuit()
+            cirq_state = cirq.Simulator().simulate(cirq_sim.cirq_circuit, qubit_order=cirq_sim.qubits).final_state_vector
+
+            engine = StatevectorEngine(rows)
+            engine.run(cirq_sim.circuit)
+
+            numpy_sim = Simulator(gates, to_measure, engine='numpy')
+
+            with self.subTest(trial=trial, gates=gates):
+                self.assertTrue(np.allclose(engine.state_vector(), cirq_state, atol=1e-5))
+                self.assertTrue(np.allclose(numpy_sim.simulate_circuit(), cirq_sim.simulate_circuit(), atol=1e-5))
+
+                cirq_probes = sorted((p['row'], p['col'], p['value']) for p in cirq_sim.probe_measurements())
+                numpy_probes = sorted((p['row'], p['col'], p['value']) for p in numpy_sim.probe_measurements())
+                self.assertEqual([p[:2] for p in numpy_probes], [p[:2] for p in cirq_probes])
+                self.assertTrue(np.allclose([p[2] for p in numpy_probes], [p[2] for p in cirq_probes], atol=1e-5))
+
+    def test_unknown_engine(self):
+        """Test selecting an engine that does not exist."""
+        with self.assertRaises(ValueError):
+            Simulator([['X']], [], engine='quantum')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+    File: test_unitary.py
+    Date: 10-2026
+"""
+import unittest
+import cirq
+import numpy as np
+from confighome.cache import SimulationCache
+from confighome.columns import Column, compile_circuit
+from confighome.simulator import Simulator
+from confighome.tests.test_statevector import random_grid
+from confighome.unitary import circuit_unitaries, column_signature, column_unitary
+
+
+class TestUnitary(unittest.TestCase):
+    """
+    A class to test the column and circuit unitaries against Cirq
+    """
+    def test_matches_cirq_on_random_circuits(self):
+        """Test the circuit unitary matches Cirq's, and the product of the column unitaries."""
+        rng = np.random.default_rng(11)
+
+        for trial in range(20):
+            rows = int(rng.integers(1, 5))
+            gates = random_grid(rng, rows, int(rng.integers(1, 7)))
+
+            sim = Simulator(gates, [], engine='cirq')
+            sim.generate_cirq_circuit()
+            result = sim.unitaries()
+
+            with self.subTest(trial=trial, gates=gates):
+                expected = cirq.unitary(sim.cirq_circuit)
+                self.assertTrue(np.allclose(result['unitary'], expected, atol=1e-5))
+                self.assertEqual([column['col'] for column in result['columns']], [column.col_index for column in sim.circuit.columns])
+
+    def test_controlled_column_is_block_diagonal(self):
+        """Test a controlled column leaves every basis state outside its control block alone."""
+        unitary = column_unitary(Column(['ac', 'H', 'c'], 0), 3).toarray()
+
+        block = [0b001, 0b011]
+        outside = [i for i in range(8) if i not in block]
+        self.assertTrue(np.allclose(unitary[np.ix_(outside, outside)], np.eye(6)))
+        self.assertTrue(np.allclose(unitary[np.ix_(block, block)], np.array([[1, 1], [1, -1]]) / np.sqrt(2), atol=1e-6))
+        self.assertEqual(column_unitary(Column(['c', 'c', 'X'], 0), 3).nnz, 8)
+
+    def test_signature_ignores_position_and_probes(self):
+        """Test the same column gets the same signature wherever it is and whatever it probes."""
+        circuit = compile_circuit([['H', 'b', 'H', 'H'], ['c', 'b', 'c', 'M'], ['X', 'b', 'X', 'X']])
+        first, second, third = circuit.columns
+
+        self.assertEqual(column_signature(first, 3), column_signature(second, 3))
+        self.assertNotEqual(column_signature(first, 3), column_signature(third, 3))
+        self.assertNotEqual(column_signature(first, 3), column_signature(first, 4))
+
+    def test_cache_is_shared_across_circuits(self):
+        """Test repeated columns are only built once, within a circuit and across circuits."""
+        cache = SimulationCache(max_size=8, ttl=None)
+        circuit_unitaries(compile_circuit([['H', 'c', 'H'], [0, 'X', 0]]), cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+        circuit_unitaries(compile_circuit([['c', 'T'], ['X', 0]]), cache)
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+
+    def test_empty_circuit(self):
+        """Test a circuit of empty and barrier columns has the identity as its unitary."""
+        result = circuit_unitaries(compile_circuit([[0, 'b'], [0, 'b']]))
+        self.assertTrue(np.allclose(result['unitary'], np.eye(4)))
+        self.assertEqual(len(result['columns']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,15 +4,22 @@
     Date: 04-2024
 """
 from contextlib import AbstractContextManager
-from django.test import TestCase, Client
+from django.conf import settings
+from django.test import TestCase, Client, AsyncClient, override_settings
 from django.urls import reverse
 from unittest.mock import patch
+import base64
 import json
+import threading
 import numpy as np
 from django.contrib.auth import get_user_model
 from users.forms import CustomUserCreationForm
 from users.models import UserFile, CustomUser
+from confighome.cache import circuit_key
+from confighome.encoding import unpack_binary
+from confighome.views import simulation_cache, stage_metrics
 
+@override_settings(SIMULATION_WORKERS=0)
 class ViewTests(TestCase):
     """
     A class to test the Django Views
@@ -27,6 +34,7 @@ class ViewTests(TestCase):
             description="A test circuit file.",
             uploaded_file='{"data": "This is a test file."}'
         )
+        simulation_cache.clear()
 
     # -------------------------------------------------------------------------------------------
     # --------------------------------------- login TESTS ---------------------------------------
@@ -392,6 +400,181 @@ class ViewTests(TestCase):
             'probed_values': [{'row': 0, 'col': 1, 'value': 0.5}]
         })
 
+    @patch('confighome.views.Simulator')
+    def test_simulate_post_cached(self, MockSimulator):
+        """
+        Test a repeated simulate request is served from the cache
+        """
+        mock_sim = MockSimulator.return_value
+        mock_sim.simulate_circuit.return_value = np.array([1, 0])
+        mock_sim.probe_measurements.return_value = []
+
+        data = {
+            'circuit': {'gates': [['H', '0'], ['0', 'X']]},
+            'to_measure': [{'qubit': 1, 'toggle': 1}]
+        }
+        same_circuit = {
+            'circuit': {'gates': [['H', 0], [0, 'X']]},
+            'to_measure': [{'qubit': 0, 'toggle': 0}, {'qubit': 1, 'toggle': 1}]
+        }
+
+        first = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+        second = self.client.post(reverse('simulate'), json.dumps(same_circuit), content_type='application/json')
+
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(MockSimulator.call_count, 1)
+        self.assertEqual(simulation_cache.stats()['hits'], 1)
+        self.assertEqual(simulation_cache.stats()['misses'], 1)
+
+    @patch('confighome.views.Simulator')
+    @patch('confighome.views.example_results')
+    def test_simulate_post_precomputed_example(self, mock_results, MockSimulator):
+        """
+        Test an example circuit with a precomputed result is served without simulating it
+        """
+        mock_results.get.return_value = {'state_vector': [0.5, 0.5], 'probed_values': []}
+
+        data = {
+            'circuit': {'gates': [['H', 0]]},
+            'to_measure': [{'qubit': 0, 'toggle': 1}]
+        }
+        response = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+
+        self.assertEqual(response.json(), {'status': 'ok', 'state_vector': [0.5, 0.5], 'probed_values': []})
+        mock_results.get.assert_called_once_with([['H', 0]], [{'qubit': 0, 'toggle': 1}])
+        MockSimulator.assert_not_called()
+
+    @patch('confighome.views.example_results')
+    def test_simulate_post_precomputed_example_forced_engine(self, mock_results):
+        """
+        Test a forced engine on an example is validated rather than served the precomputed result
+        """
+        mock_results.get.return_value = {'state_vector': [0.5, 0.5], 'probed_values': []}
+
+        data = {'circuit': {'gates': [['H', 'T']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}], 'engine': 'stabilizer'}
+        response = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+
+        self.assertEqual(response.json()['status'], 'error')
+        self.assertIn('Clifford', response.json()['message'])
+        mock_results.get.assert_not_called()
+
+    def test_simulate_post_numpy_engine(self):
+        """
+        Test the simulate view with the NumPy engine selected
+        """
+        data = {
+            'circuit': {'gates': [['H', 'c', 'M'], [0, 'X', 0]]},
+            'to_measure': [{'qubit': 0, 'toggle': 1}, {'qubit': 1, 'toggle': 1}],
+            'engine': 'numpy'
+        }
+
+        response = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+        response_data = response.json()
+        self.assertEqual(response_data['status'], 'ok')
+        self.assertTrue(np.allclose(response_data['state_vector'], [0.5, 0, 0, 0.5]))
+        self.assertEqual(len(response_data['probed_values']), 1)
+        self.assertEqual(response_data['probed_values'][0]['row'], 0)
+        self.assertEqual(response_data['probed_values'][0]['col'], 2)
+        self.assertTrue(np.isclose(response_data['probed_values'][0]['value'], 0.5))
+
+    def test_simulate_post_with_shots(self):
+        """
+        Test the simulate view returns sampled counts for the measured qubits
+        """
+        data = {
+            'circuit': {'gates': [['X'], ['H']]},
+            'to_measure': [{'qubit': 0, 'toggle': 1}, {'qubit': 1, 'toggle': 1}],
+            'shots': 1000
+        }
+
+        response = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+        response_data = response.json()
+        self.assertEqual(response_data['status'], 'ok')
+        self.assertEqual(response_data['shots'], 1000)
+        self.assertEqual(sum(response_data['counts'].values()), 1000)
+        self.assertTrue(set(response_data['counts']) <= {'10', '11'})
+
+    def test_simulate_post_with_invalid_shots(self):
+        """
+        Test the simulate view rejects a shot count that is not a positive whole number
+        """
+        for shots in [0, -5, 2.5, 'many']:
+            data = {'circuit': {'gates': [['X']]}, 'to_measure': [], 'shots': shots}
+            response = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+            with self.subTest(shots=shots):
+                self.assertEqual(response.json()['status'], 'error')
+
+    @override_settings(SIMULATION_MAX_QUBITS=2)
+    def test_simulate_post_over_qubit_limit(self):
+        """
+        Test the simulate view rejects circuits over the qubit budget
+        """
+        data = {'circuit': {'gates': [['H', 'T'], ['H', 'T'], ['H', 'T']]}, 'to_measure': []}
+
+        response = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.json()['status'], 'error')
+        self.assertIn('3 qubits', response.json()['message'])
+
+    @override_settings(SIMULATION_MAX_QUBITS=2)
+    def test_simulate_post_wide_clifford_circuit(self):
+        """
+        Test Clifford circuits use the stabilizer budget instead of the dense qubit limit
+        """
+        gates = [['H', 'c']] + [[0, 'X'] for _ in range(59)]
+        to_measure = [{'qubit': 0, 'toggle': 1}, {'qubit': 59, 'toggle': 1}]
+        data = {'circuit': {'gates': gates}, 'to_measure': to_measure}
+
+        response = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'ok')
+        self.assertTrue(np.allclose(response.json()['state_vector'], [0.5, 0, 0, 0.5]))
+
+    @override_settings(SIMULATION_MAX_QUBITS=2)
+    def test_simulate_post_wide_sparse_circuit(self):
+        """
+        Test non-Clifford circuits with few superpositions use the sparse budget
+        """
+        gates = [['X', 'c'], ['X', 'c'], ['T', 'X']] + [[0, 0] for _ in range(57)]
+        to_measure = [{'qubit': 2, 'toggle': 1}]
+        data = {'circuit': {'gates': gates}, 'to_measure': to_measure}
+
+        response = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(np.allclose(response.json()['state_vector'], [0, 1]))
+
+    @override_settings(SIMULATION_WORKERS=1)
+    def test_simulate_post_in_worker_process(self):
+        """
+        Test the simulate view running the circuit in the worker pool
+        """
+        data = {'circuit': {'gates': [['X'], ['H']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}, {'qubit': 1, 'toggle': 1}]}
+
+        response = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+        self.assertEqual(response.json()['status'], 'ok')
+        self.assertTrue(np.allclose(response.json()['state_vector'], [0, 0, 0.5, 0.5]))
+
+    def test_simulate_post_stabilizer_rejects_toffoli(self):
+        """
+        Test forcing the stabilizer engine on a Toffoli returns an error instead of a wrong state
+        """
+        data = {'circuit': {'gates': [['X', 'c'], [0, 'c'], [0, 'X']]}, 'to_measure': [{'qubit': q, 'toggle': 1} for q in range(3)], 'engine': 'stabilizer'}
+
+        response = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+        self.assertEqual(response.json()['status'], 'error')
+        self.assertIn('Clifford', response.json()['message'])
+
+    @override_settings(SIMULATION_MAX_STABILIZER_MEASURED=4)
+    def test_simulate_post_stabilizer_measuring_too_many(self):
+        """
+        Test a stabilizer run measuring more qubits than its outcome search allows is rejected up front
+        """
+        data = {'circuit': {'gates': [['H']] * 5}, 'to_measure': [{'qubit': q, 'toggle': 1} for q in range(5)], 'engine': 'stabilizer'}
+
+        response = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 413)
+        self.assertIn('measures 5 qubits', response.json()['message'])
+
     @patch('confighome.views.Simulator')
     def test_simulate_post_with_internal_error(self, MockSimulator):
         """
@@ -429,3 +612,377 @@ class ViewTests(TestCase):
         self.assertEqual(response.status_code, 200) 
         self.assertEqual(response_data['status'], 'error')
         self.assertEqual(response_data['message'], 'Invalid request method')
+
+    # -------------------------------------------------------------------------------------------
+    # ------------------------------------ simulate_batch TESTS ---------------------------------
+    # -------------------------------------------------------------------------------------------
+    def test_simulate_batch_post_success(self):
+        """
+        Test the batch view returns results in order, with failures reported per circuit
+        """
+        data = {
+            'circuits': [
+                {'circuit': {'gates': [['X']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}]},
+                {'circuit': {'gates': [['X']]}, 'to_measure': [], 'engine': 'quantum'},
+                {'circuit': {'gates': [['H']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}]},
+            ]
+        }
+
+        response = self.client.post(reverse('simulate_batch'), json.dumps(data), content_type='application/json')
+        response_data = response.json()
+        self.assertEqual(response_data['status'], 'ok')
+        self.assertEqual([r['status'] for r in response_data['results']], ['ok', 'error', 'ok'])
+        self.assertTrue(np.allclose(response_data['results'][0]['state_vector'], [0, 1]))
+        self.assertTrue(np.allclose(response_data['results'][2]['state_vector'], [0.5, 0.5]))
+
+    def test_simulate_batch_uses_cache(self):
+        """
+        Test circuits already simulated by /simulate are not sent to the pool
+        """
+        job = {'circuit': {'gates': [['X']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}]}
+        self.client.post(reverse('simulate'), json.dumps(job), content_type='application/json')
+
+        with patch('confighome.views.Simulator.simulate_batch', return_value=[]) as mock_batch:
+            response = self.client.post(reverse('simulate_batch'), json.dumps({'circuits': [job]}), content_type='application/json')
+
+        mock_batch.assert_called_once_with([], max_workers=settings.SIMULATION_BATCH_WORKERS)
+        self.assertTrue(np.allclose(response.json()['results'][0]['state_vector'], [0, 1]))
+
+    def test_simulate_batch_rejects_malformed_entries(self):
+        """
+        Test batch entries that are not objects are reported as errors without being simulated
+        """
+        data = {'circuits': ['junk', {'circuit': {'gates': [['X']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}]}]}
+
+        response = self.client.post(reverse('simulate_batch'), json.dumps(data), content_type='application/json')
+        results = response.json()['results']
+        self.assertEqual([r['status'] for r in results], ['error', 'ok'])
+        self.assertIn('must be an object', results[0]['message'])
+
+    @override_settings(SIMULATION_BATCH_LIMIT=1)
+    def test_simulate_batch_too_many_circuits(self):
+        """
+        Test the batch view rejects batches over the limit
+        """
+        data = {'circuits': [{'circuit': {'gates': [['X']]}}, {'circuit': {'gates': [['H']]}}]}
+        response = self.client.post(reverse('simulate_batch'), json.dumps(data), content_type='application/json')
+        self.assertEqual(response.json()['status'], 'error')
+
+    def test_simulate_batch_non_post_error(self):
+        """
+        Test the batch view with a non-POST request
+        """
+        response = self.client.get(reverse('simulate_batch'))
+        self.assertEqual(response.json(), {'status': 'error', 'message': 'Invalid request method'})
+
+    def test_simulate_unitary(self):
+        """
+        Test the unitary view returns sparse column unitaries and the dense circuit unitary
+        """
+        data = {'circuit': {'gates': [['H', 'c'], [0, 'X']]}}
+
+        response = self.client.post(reverse('simulate_unitary'), json.dumps(data), content_type='application/json')
+        response_data = response.json()
+        self.assertEqual(response_data['status'], 'ok')
+        self.assertEqual([column['col'] for column in response_data['columns']], [0, 1])
+
+        cnot = response_data['columns'][1]['unitary']
+        self.assertEqual(cnot['size'], 4)
+        self.assertEqual(sorted(zip(cnot['rows'], cnot['cols'])), [(0, 0), (1, 1), (2, 3), (3, 2)])
+
+        bell = np.array(response_data['unitary']['real']) + 1j * np.array(response_data['unitary']['imag'])
+        self.assertTrue(np.allclose(bell[:, 0], [1 / np.sqrt(2), 0, 0, 1 / np.sqrt(2)], atol=1e-6))
+
+    @override_settings(SIMULATION_MAX_UNITARY_QUBITS=1)
+    def test_simulate_unitary_too_many_qubits(self):
+        """
+        Test the unitary view rejects circuits over its qubit limit
+        """
+        data = {'circuit': {'gates': [['H'], [0]]}}
+        response = self.client.post(reverse('simulate_unitary'), json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.json()['status'], 'error')
+
+    def test_simulate_unitary_non_post_error(self):
+        """
+        Test the unitary view with a non-POST request
+        """
+        response = self.client.get(reverse('simulate_unitary'))
+        self.assertEqual(response.json(), {'status': 'error', 'message': 'Invalid request method'})
+
+    def test_simulate_post_binary(self):
+        """
+        Test the simulate view returns a binary buffer when asked for octet-stream
+        """
+        data = {'circuit': {'gates': [['H'], [0]]}, 'to_measure': [{'qubit': 0, 'toggle': 1}, {'qubit': 1, 'toggle': 1}], 'dtype': 'float64'}
+
+        response = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json', HTTP_ACCEPT='application/octet-stream')
+        self.assertEqual(response['Content-Type'], 'application/octet-stream')
+        self.assertIn('Accept', response['Vary'])
+
+        header, values = unpack_binary(response.content)
+        self.assertEqual((header['status'], header['dtype'], header['length']), ('ok', 'float64', 4))
+        self.assertEqual(header['probed_values'], [])
+        self.assertTrue(np.allclose(values, [0.5, 0, 0.5, 0]))
+
+    def test_simulate_caches_state_vector_array(self):
+        """
+        Test a simulated state vector is cached as a read-only array and still served as JSON
+        """
+        data = {'circuit': {'gates': [['X']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}]}
+
+        binary = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json', HTTP_ACCEPT='application/octet-stream')
+        cached = simulation_cache.get(circuit_key([['X']], data['to_measure']))
+        self.assertIsInstance(cached['state_vector'], np.ndarray)
+        self.assertFalse(cached['state_vector'].flags.writeable)
+        self.assertTrue(np.allclose(unpack_binary(binary.content)[1], [0, 1]))
+
+        response = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+        self.assertEqual(response.json()['state_vector'], [0, 1])
+
+    def test_simulate_stream_after_simulate(self):
+        """
+        Test the stream view can replay a state vector cached as an array by the simulate view
+        """
+        data = {'circuit': {'gates': [['H', 'M'], [0, 'X']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}]}
+        self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+
+        records = self.stream_records(data)
+        self.assertEqual([r['type'] for r in records], ['probe', 'result'])
+        self.assertTrue(np.allclose(records[-1]['state_vector'], [0.5, 0.5]))
+
+    def test_simulate_post_base64(self):
+        """
+        Test the simulate view can return the state vector as base64 inside the JSON
+        """
+        data = {'circuit': {'gates': [['X']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}], 'encoding': 'base64'}
+
+        response = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+        encoded = response.json()['state_vector']
+        self.assertEqual(encoded['dtype'], 'float32')
+        self.assertTrue(np.allclose(np.frombuffer(base64.b64decode(encoded['data']), dtype='<f4'), [0, 1]))
+
+    def test_simulate_post_top_k(self):
+        """
+        Test the simulate view returns only the most likely outcomes when asked
+        """
+        gates = [['H'], ['H'], ['X']]
+        to_measure = [{'qubit': q, 'toggle': 1} for q in range(3)]
+        data = {'circuit': {'gates': gates}, 'to_measure': to_measure, 'top_k': 2, 'min_probability': 0.01}
+
+        response = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+        response_data = response.json()
+        self.assertNotIn('state_vector', response_data)
+        self.assertEqual(len(response_data['outcomes']), 2)
+        self.assertTrue(set(response_data['outcomes']) <= {'001', '011', '101', '111'})
+
+    def test_simulate_post_invalid_top_k(self):
+        """
+        Test the simulate view rejects bad filtering options
+        """
+        for options in ({'top_k': 0}, {'top_k': 1.5}, {'min_probability': 2}, {'top_k': 1, 'encoding': 'binary'}):
+            data = {'circuit': {'gates': [['X']]}, 'to_measure': [], **options}
+            response = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+            self.assertEqual(response.json()['status'], 'error')
+
+    def test_simulate_post_invalid_encoding(self):
+        """
+        Test the simulate view rejects unknown encodings
+        """
+        data = {'circuit': {'gates': [['X']]}, 'to_measure': [], 'encoding': 'xml'}
+
+        response = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+        self.assertEqual(response.json()['status'], 'error')
+
+    # -------------------------------------------------------------------------------------------
+    # ------------------------------------ get_circuit TESTS ------------------------------------
+    # -------------------------------------------------------------------------------------------
+    def test_get_circuit(self):
+        """
+        Test an example circuit can be found by part of its name
+        """
+        response = self.client.get(reverse('get_circuit'), {'name': 'bell state'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['name'], 'Bell state (ERP pair)')
+        self.assertIn('ETag', response)
+
+    def test_get_circuit_not_modified(self):
+        """
+        Test a conditional GET with a matching ETag gets 304
+        """
+        first = self.client.get(reverse('get_circuit'), {'name': 'Quantum Teleportation'})
+        second = self.client.get(reverse('get_circuit'), {'name': 'Quantum Teleportation'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+
+    def test_get_circuit_not_found(self):
+        """
+        Test an unknown example circuit gets 404
+        """
+        response = self.client.get(reverse('get_circuit'), {'name': 'no such circuit'})
+        self.assertEqual(response.status_code, 404)
+
+    # -------------------------------------------------------------------------------------------
+    # ------------------------------------ simulate_async TESTS ---------------------------------
+    # -------------------------------------------------------------------------------------------
+    async def test_simulate_async(self):
+        """
+        Test the async simulate view runs the simulation off the event loop
+        """
+        data = {'circuit': {'gates': [['H', 'T']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}], 'top_k': 1}
+
+        response = await AsyncClient().post(reverse('simulate_async'), json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['outcomes']), 1)
+        self.assertIn('Server-Timing', response)
+
+    def test_simulate_async_releases_slots(self):
+        """
+        Test each finished request frees its slot, so a single slot serves requests one after another
+        """
+        data = {'circuit': {'gates': [['X']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}]}
+
+        with patch('confighome.views.simulation_slots', threading.BoundedSemaphore(1)):
+            for _ in range(3):
+                response = self.client.post(reverse('simulate_async'), json.dumps(data), content_type='application/json')
+                self.assertEqual(response.json()['state_vector'], [0, 1])
+
+    @override_settings(SIMULATION_RETRY_AFTER=5)
+    def test_simulate_async_saturated(self):
+        """
+        Test the async simulate view answers 503 with Retry-After when every slot is taken
+        """
+        data = {'circuit': {'gates': [['X']]}, 'to_measure': []}
+
+        with patch('confighome.views.simulation_slots', threading.BoundedSemaphore(1)) as slots:
+            slots.acquire()
+            response = self.client.post(reverse('simulate_async'), json.dumps(data), content_type='application/json')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '5')
+        self.assertEqual(response.json()['status'], 'error')
+
+    def test_simulate_async_non_post_error(self):
+        """
+        Test the async simulate view with a non-POST request
+        """
+        response = self.client.get(reverse('simulate_async'))
+        self.assertEqual(response.json(), {'status': 'error', 'message': 'Invalid request method'})
+
+    # -------------------------------------------------------------------------------------------
+    # ------------------------------------ simulate_stream TESTS --------------------------------
+    # -------------------------------------------------------------------------------------------
+    def stream_records(self, data):
+        response = self.client.post(reverse('simulate_stream'), json.dumps(data), content_type='application/json')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+    def test_simulate_stream(self):
+        """
+        Test the stream view sends each probe and then the final distribution
+        """
+        data = {'circuit': {'gates': [['H', 'M', 'T', 'M']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}]}
+
+        records = self.stream_records(data)
+        self.assertEqual([r['type'] for r in records], ['probe', 'probe', 'result'])
+        self.assertTrue(np.allclose(records[-1]['state_vector'], [0.5, 0.5]))
+
+        # The result is cached, and a repeat is streamed from the cache in the same format
+        self.assertEqual(self.stream_records(data), records)
+        response = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+        self.assertEqual(response.json()['probed_values'], records[-1]['probed_values'])
+
+    @patch('confighome.views.Simulator')
+    def test_simulate_stream_incremental(self, MockSimulator):
+        """
+        Test builder edits are re-simulated from the session's previous sweep
+        """
+        gates = [['H', 'M', 'T', 0], ['X', 'c', 'H', 'M']]
+        data = {'circuit': {'gates': gates}, 'to_measure': [{'qubit': 1, 'toggle': 1}], 'incremental': True}
+        first = self.stream_records(data)
+
+        gates[0][3] = 'X'
+        second = self.stream_records(data)
+
+        MockSimulator.assert_not_called()
+        self.assertIn(settings.SESSION_COOKIE_NAME, self.client.cookies)
+        self.assertEqual([r['type'] for r in first], ['probe', 'probe', 'result'])
+        self.assertTrue(np.allclose(second[-1]['state_vector'], [0.5, 0.5]))
+        self.assertEqual(second[:-1], first[:-1])
+
+    @override_settings(SIMULATION_TIMEOUT=-1)
+    def test_simulate_stream_incremental_timeout(self):
+        """
+        Test an incremental sweep that overruns ends the stream with an error record
+        """
+        data = {'circuit': {'gates': [['H', 'M'], ['X', 0]]}, 'to_measure': [], 'incremental': True}
+
+        records = self.stream_records(data)
+        self.assertEqual(records[-1]['type'], 'error')
+        self.assertIn('Simulation took longer than', records[-1]['message'])
+
+    @patch('confighome.views.Simulator')
+    def test_simulate_stream_error(self, MockSimulator):
+        """
+        Test the stream view ends with an error record when the simulation fails
+        """
+        MockSimulator.side_effect = RuntimeError('Simulation failed')
+        data = {'circuit': {'gates': [['X']]}, 'to_measure': []}
+
+        records = self.stream_records(data)
+        self.assertEqual(records, [{'type': 'error', 'status': 'error', 'message': 'Simulation failed'}])
+
+    @override_settings(SIMULATION_MAX_QUBITS=2)
+    def test_simulate_stream_over_qubit_limit(self):
+        """
+        Test the stream view rejects circuits over budget before streaming
+        """
+        data = {'circuit': {'gates': [['H', 'T']] * 3}, 'to_measure': []}
+
+        response = self.client.post(reverse('simulate_stream'), json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 413)
+
+    def test_simulate_stream_non_post_error(self):
+        """
+        Test the stream view with a non-POST request
+        """
+        response = self.client.get(reverse('simulate_stream'))
+        self.assertEqual(response.json(), {'status': 'error', 'message': 'Invalid request method'})
+
+    # -------------------------------------------------------------------------------------------
+    # ------------------------------------ simulation_metrics TESTS -----------------------------
+    # -------------------------------------------------------------------------------------------
+    def test_simulate_server_timing_header(self):
+        """
+        Test the simulate view reports its stage timings in a Server-Timing header
+        """
+        data = {'circuit': {'gates': [['H', 'T']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}]}
+
+        response = self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+        stages = [entry.split(';')[0] for entry in response['Server-Timing'].split(', ')]
+        for stage in ('parse', 'cache', 'admit', 'init', 'simulate', 'probe', 'serialize'):
+            self.assertIn(stage, stages)
+        self.assertNotIn('timings', response.json())
+
+    def test_simulation_metrics_staff_only(self):
+        """
+        Test the metrics view redirects users who are not staff
+        """
+        response = self.client.get(reverse('simulation_metrics'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_simulation_metrics_by_qubit_count(self):
+        """
+        Test the metrics view aggregates simulate timings by qubit count
+        """
+        self.user.is_staff = True
+        self.user.save()
+        stage_metrics.clear()
+        data = {'circuit': {'gates': [['H', 'T'], [0, 'T']]}, 'to_measure': []}
+
+        self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+        self.client.post(reverse('simulate'), json.dumps(data), content_type='application/json')
+
+        stages = self.client.get(reverse('simulation_metrics')).json()['stages']
+        self.assertEqual(stages['parse']['2']['count'], 2)
+        self.assertEqual(stages['simulate']['2']['count'], 1)
+        self.assertLessEqual(stages['parse']['2']['p50'], stages['parse']['2']['max'])
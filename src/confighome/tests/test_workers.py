@@ -0,0 +1,136 @@
+"""
+    File: test_workers.py
+    Date: 10-2026
+"""
+import unittest
+import numpy as np
+from confighome.columns import compile_circuit
+from confighome.workers import (SimulationWorkerPool, SimulationRejected, SimulationTimeout,
+                                check_admission, circuit_size, estimate_memory)
+
+
+class TestAdmission(unittest.TestCase):
+    """
+    A class to test the simulation budgets
+    """
+    def test_circuit_size(self):
+        """Test the size uses the shortest row, like the Simulator's transpose."""
+        self.assertEqual(circuit_size([['X', 0, 'H'], [0, 'X']]), (2, 2))
+        self.assertEqual(circuit_size([]), (0, 0))
+
+    def test_estimate_memory_doubles_per_qubit(self):
+        """Test the memory estimate grows with the state vector."""
+        self.assertEqual(estimate_memory(11), 2 * estimate_memory(10))
+
+    def test_estimate_memory_stabilizer(self):
+        """Test the stabilizer estimate only grows exponentially with the measured qubits."""
+        self.assertLess(estimate_memory(200, 'stabilizer', 2), 2**20)
+        self.assertEqual(estimate_memory(10, 'stabilizer', 11) - estimate_memory(10, 'stabilizer', 10), 2**10 * 8)
+
+    def test_estimate_memory_sparse(self):
+        """Test the sparse estimate follows the support, and includes the dense engine once it can switch over."""
+        self.assertLess(estimate_memory(200, 'sparse', 1, support=4), 2**20)
+        self.assertGreater(estimate_memory(10, 'sparse', 1, support=2**10), estimate_memory(10))
+
+    def test_estimate_memory_aer(self):
+        """Test the Aer estimate counts one in-place state plus the returned probabilities."""
+        self.assertEqual(estimate_memory(20, 'aer', 0), 2**20 * 24 + 8)
+        self.assertLess(estimate_memory(20, 'aer'), estimate_memory(20))
+
+    def test_admits_small_circuit(self):
+        """Test a circuit within every budget is admitted."""
+        check_admission([['X', 'H'], ['H', 'X']], max_qubits=2, max_depth=2, max_memory=2**20)
+
+    def test_rejects_too_many_qubits(self):
+        """Test a circuit with too many qubits is rejected."""
+        with self.assertRaises(SimulationRejected):
+            check_admission([['X']] * 3, max_qubits=2, max_depth=10, max_memory=2**30)
+
+    def test_rejects_too_deep(self):
+        """Test a circuit with too many columns is rejected."""
+        with self.assertRaises(SimulationRejected):
+            check_admission([['X'] * 11], max_qubits=2, max_depth=10, max_memory=2**30)
+
+    def test_rejects_over_memory(self):
+        """Test a circuit whose state vector would not fit is rejected."""
+        with self.assertRaises(SimulationRejected):
+            check_admission([['X']] * 20, max_qubits=30, max_depth=10, max_memory=2**20)
+
+
+    def test_rejects_stabilizer_measuring_too_many(self):
+        """Test a Clifford circuit measuring more qubits than the stabilizer search allows is rejected, though it fits in memory."""
+        wall = [['H']] * 20
+        check_admission(wall, max_qubits=200, max_depth=10, max_memory=2**30, engine='stabilizer', num_measured=16, max_stabilizer_measured=16)
+        with self.assertRaises(SimulationRejected):
+            check_admission(wall, max_qubits=200, max_depth=10, max_memory=2**30, engine='stabilizer', num_measured=17, max_stabilizer_measured=16)
+
+
+class TestSimulationWorkerPool(unittest.TestCase):
+    """
+    A class to test running simulations in worker processes
+    """
+    def setUp(self):
+        self.pool = SimulationWorkerPool(size=1, timeout=30)
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    def test_run(self):
+        """Test a job runs in a worker and returns its result."""
+        result = self.pool.run({'circuit': {'gates': [['X']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}]})
+        self.assertEqual(result['status'], 'ok')
+        self.assertTrue(np.allclose(result['state_vector'], [0, 1]))
+
+    def test_run_compiled_circuit(self):
+        """Test a job can carry its compiled circuit and resolved engine to the worker."""
+        circuit = compile_circuit([['H', 'c'], [0, 'X']])
+        result = self.pool.run({'circuit': {'gates': circuit}, 'to_measure': [{'qubit': 0, 'toggle': 1}, {'qubit': 1, 'toggle': 1}], 'engine': 'numpy'})
+        self.assertEqual(result['status'], 'ok')
+        self.assertTrue(np.allclose(result['state_vector'], [0.5, 0, 0, 0.5]))
+
+    def test_malformed_job_keeps_worker(self):
+        """Test a job that is not a dictionary comes back as an error without stopping the worker."""
+        result = self.pool.run('junk')
+        self.assertEqual(result['status'], 'error')
+        self.assertNotIn('stopped unexpectedly', result['message'])
+
+        result = self.pool.run({'circuit': {'gates': [['X']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}]})
+        self.assertTrue(np.allclose(result['state_vector'], [0, 1]))
+
+    def test_timeout_kills_job_and_recovers(self):
+        """Test an overrunning job is cancelled, and the pool keeps working afterwards."""
+        self.pool.run({'circuit': {'gates': [['X']]}, 'to_measure': []})
+
+        slow = {'circuit': {'gates': [['H', 'T'] * 200] * 18}, 'to_measure': [], 'engine': 'cirq'}
+        with self.assertRaises(SimulationTimeout):
+            self.pool.run(slow, timeout=0.05)
+
+        result = self.pool.run({'circuit': {'gates': [['H']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}]})
+        self.assertTrue(np.allclose(result['state_vector'], [0.5, 0.5]))
+
+    def test_map_keeps_order(self):
+        """Test a list of jobs comes back in order."""
+        jobs = [{'circuit': {'gates': [['X']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}]},
+                {'circuit': 'broken'},
+                {'circuit': {'gates': [[0]]}, 'to_measure': [{'qubit': 0, 'toggle': 1}]}]
+        results = self.pool.map(jobs)
+        self.assertEqual([r['status'] for r in results], ['ok', 'error', 'ok'])
+        self.assertTrue(np.allclose(results[2]['state_vector'], [1, 0]))
+
+    def test_stream(self):
+        """Test a streamed job sends its probes and result back from the worker."""
+        records = list(self.pool.stream({'circuit': {'gates': [['X', 'M']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}]}))
+        self.assertEqual([r['type'] for r in records], ['probe', 'result'])
+        self.assertTrue(np.isclose(records[0]['value'], 1))
+
+        result = self.pool.run({'circuit': {'gates': [['H']]}, 'to_measure': [{'qubit': 0, 'toggle': 1}]})
+        self.assertTrue(np.allclose(result['state_vector'], [0.5, 0.5]))
+
+    def test_stream_timeout(self):
+        """Test an overrunning streamed job is cancelled."""
+        slow = {'circuit': {'gates': [['H', 'T'] * 200] * 18}, 'to_measure': [], 'engine': 'cirq'}
+        with self.assertRaises(SimulationTimeout):
+            list(self.pool.stream(slow, timeout=0.05))
+
+if __name__ == '__main__':
+    unittest.main()
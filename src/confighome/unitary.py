@@ -0,0 +1,81 @@
+"""
+    File: unitary.py
+    Date: 10-2026
+"""
+
+import numpy as np
+from confighome.backends import lazy_import
+from confighome.statevector import StatevectorEngine
+
+# SciPy is only loaded once a lesson asks for a unitary
+scipy_sparse = lazy_import('scipy.sparse')
+
+
+def column_signature(column, num_qubits) -> tuple:
+    """
+    Identifies what a column does, leaving out its position and probes, so that the same column
+    (such as H on row 0, or a CNOT from row 0 to row 1) has one signature in every circuit
+
+    Args:
+        column: the parsed Column
+        num_qubits: the number of qubits in the circuit
+
+    Returns:
+        a hashable signature
+    """
+    return (num_qubits, tuple(column.gates), column.control_mask, column.anticontrol_mask, column.swap)
+
+
+def column_unitary(column, num_qubits) -> 'scipy_sparse.csr_matrix':
+    """
+    Builds the unitary of a column by applying it to every basis state at once: the identity is
+    held as a (2,)*n x 2**n array and run through the state vector engine's kernels, so a
+    controlled column only touches the block selected by its controls
+
+    Args:
+        column: the parsed Column
+        num_qubits: the number of qubits in the circuit
+
+    Returns:
+        the 2**n x 2**n unitary, sparse, with qubit 0 the most significant bit
+    """
+    dim = 2 ** num_qubits
+
+    engine = StatevectorEngine(num_qubits)
+    engine.state = np.eye(dim, dtype=np.complex64).reshape((2,) * num_qubits + (dim,))
+    engine.apply_column(column)
+
+    return scipy_sparse.csr_matrix(engine.state.reshape(dim, dim))
+
+
+def circuit_unitaries(circuit, cache=None) -> dict:
+    """
+    Finds the unitary of every column of a circuit and of the whole circuit. Column unitaries
+    are looked up by their signature first, and the whole circuit is built up by multiplying
+    the sparse column unitaries into the running product.
+
+    Args:
+        circuit: the CompiledCircuit
+        cache: an optional SimulationCache of column unitaries, shared between circuits
+
+    Returns:
+        a {'columns', 'unitary'} dictionary, where columns lists a {'col', 'unitary'} dictionary
+        for every column that is not a barrier, and unitary is the dense product of them all
+    """
+    num_qubits = circuit.num_qubits
+    product = np.eye(2 ** num_qubits, dtype=np.complex64)
+    columns = []
+
+    for column in circuit.columns:
+        signature = column_signature(column, num_qubits)
+        unitary = cache.get(signature) if cache is not None else None
+
+        if unitary is None:
+            unitary = column_unitary(column, num_qubits)
+            if cache is not None:
+                cache.set(signature, unitary)
+
+        columns.append({'col': column.col_index, 'unitary': unitary})
+        product = unitary @ product
+
+    return {'columns': columns, 'unitary': product}
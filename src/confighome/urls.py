@@ -25,6 +25,11 @@ urlpatterns = [
     path('circuit_table/', views.get_circuit_table, name='circuit_table'),
     path('builder', views.build, name='builder'),
     path('simulate', views.simulate, name='simulate'),
+    path('simulate_async', views.simulate_async, name='simulate_async'),
+    path('simulate_stream', views.simulate_stream, name='simulate_stream'),
+    path('simulate_batch', views.simulate_batch, name='simulate_batch'),
+    path('simulate_unitary', views.simulate_unitary, name='simulate_unitary'),
+    path('simulation_metrics', views.simulation_metrics, name='simulation_metrics'),
     path('save_circuit/', views.save_circuit, name='save_circuit'),
     path('download_circuit/<int:pk>/', views.download_circuit, name='download_circuit'),
     path('delete_circuit/<int:pk>/', views.delete_circuit, name='delete_circuit'),
@@ -3,48 +3,192 @@
     Author: Lea Button
     Date: 03-2024
 """
-import os
 import json
-from urllib.parse import quote
+import asyncio
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from django.urls import reverse
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.core.paginator import Paginator
 from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.conf import settings
 from django.contrib.auth import authenticate, login
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
 from django.contrib.staticfiles.finders import find
-from confighome.simulator import Simulator
+from confighome.simulator import Simulator, resolve_engine, run_job, sample_counts, stream_job, top_outcomes
+from confighome.cache import SimulationCache, circuit_key
+from confighome.checkpoints import CheckpointStore
+from confighome.columns import compile_circuit
+from confighome.metrics import StageMetrics, StageTimer
+from confighome.examples import ExampleCircuitRegistry
+from confighome.incremental import IncrementalSimulations
+from confighome.precompute import PrecomputedResults
+from confighome.unitary import circuit_unitaries
+from confighome.encoding import BINARY_CONTENT_TYPE, encode_base64, negotiate, pack_binary
+from confighome.workers import SimulationWorkerPool, SimulationRejected, SimulationTimeout, check_admission
 from users.forms import CustomUserCreationForm, ChangeEmailForm
 from users.models import UserFile
 from users.progress import Lesson, Section, LessonProgress, TestScore
 
-circuit_files = [f for f in os.listdir(find('circuits')) if f.endswith('.json')]
-example_circuits = []
+example_registry = ExampleCircuitRegistry(lambda: find('circuits'), settings.EXAMPLE_CIRCUITS_CHECK_INTERVAL)
+example_results = PrecomputedResults(settings.EXAMPLE_RESULTS_DIR, example_registry, settings.EXAMPLE_CIRCUITS_CHECK_INTERVAL)
+
+simulation_cache = SimulationCache(settings.SIMULATION_CACHE_SIZE, settings.SIMULATION_CACHE_TTL)
+unitary_cache = SimulationCache(settings.SIMULATION_UNITARY_CACHE_SIZE, ttl=None)
+simulation_pool = None
+simulation_pool_lock = threading.Lock()
+stage_metrics = StageMetrics(settings.SIMULATION_METRICS_SAMPLES)
+checkpoint_store = CheckpointStore(settings.SIMULATION_CHECKPOINT_MEMORY, settings.SIMULATION_CHECKPOINT_DISK, settings.SIMULATION_CHECKPOINT_DIR)
+incremental_simulations = IncrementalSimulations(settings.SIMULATION_INCREMENTAL_SESSIONS, settings.SIMULATION_CHECKPOINT_BYTES, checkpoint_store)
+simulation_slots = threading.BoundedSemaphore(settings.SIMULATION_ASYNC_MAX_PENDING)
+simulation_executor = None
+
+
+def get_simulation_pool():
+    """
+    Returns the worker pool for this process, or None when simulations run in-process
+    """
+    global simulation_pool
+
+    if settings.SIMULATION_WORKERS <= 0:
+        return None
+
+    # Concurrent first requests would otherwise each start a pool, and leak all but one
+    with simulation_pool_lock:
+        if simulation_pool is None:
+            simulation_pool = SimulationWorkerPool(settings.SIMULATION_WORKERS, settings.SIMULATION_TIMEOUT)
+
+    return simulation_pool
+
+
+def get_simulation_executor():
+    """
+    Returns the thread pool that runs async simulations off the event loop, starting it on first use
+    """
+    global simulation_executor
+
+    if simulation_executor is None:
+        simulation_executor = ThreadPoolExecutor(max_workers=settings.SIMULATION_ASYNC_WORKERS, thread_name_prefix='simulate')
+
+    return simulation_executor
+
+
+def admit(gates, to_measure=(), engine='auto'):
+    """
+    Checks a circuit against the configured simulation budgets. Clifford and low-support
+    circuits run on the stabilizer and sparse engines, so they are allowed far more qubits,
+    and dense circuits on Aer may use a few more qubits than on the single-threaded engines.
+
+    Args:
+        gates: the circuit grid, indexed [row][col], or its CompiledCircuit
+        to_measure: list of {'qubit', 'toggle'} dictionaries
+        engine: the requested engine
+
+    Returns:
+        the engine the circuit will run on
+
+    Raises:
+        SimulationRejected: if the circuit is over budget
+    """
+    circuit = compile_circuit(gates)
+    num_measured = len({item['qubit'] for item in to_measure if item['toggle'] == 1 and item['qubit'] < circuit.num_qubits})
+    engine = resolve_engine(circuit, engine, num_measured, settings.SIMULATION_MAX_QUBITS)
+    max_qubits = {
+        'stabilizer': settings.SIMULATION_MAX_STABILIZER_QUBITS,
+        'sparse': settings.SIMULATION_MAX_SPARSE_QUBITS,
+        'aer': settings.SIMULATION_MAX_AER_QUBITS,
+    }.get(engine, settings.SIMULATION_MAX_QUBITS)
+
+    check_admission(circuit, max_qubits, settings.SIMULATION_MAX_DEPTH, settings.SIMULATION_MAX_MEMORY, engine, num_measured,
+                    settings.SIMULATION_MAX_STABILIZER_MEASURED)
+
+    return engine
+
+def precomputed_result(gates, to_measure, engine='auto'):
+    """
+    Looks up a bundled example's precomputed result. They were simulated on the automatically
+    chosen engine, so a request that forces an engine is simulated, and validated, as usual.
+
+    Returns:
+        a {'state_vector', 'probed_values'} result, or None
+    """
+    if engine != 'auto':
+        return None
+
+    return example_results.get(gates, to_measure)
+
+def incremental_session_key(session, gates, engine):
+    """
+    Returns:
+        the key of the builder session whose previous sweep a circuit can resume, or None if the
+        circuit should go to the simulator. Only dense-sized circuits are swept this way.
+    """
+    if session is None or engine not in ('auto', 'numpy') or len(gates) > settings.SIMULATION_MAX_QUBITS:
+        return None
+
+    if session.session_key is None:
+        session.create()
+
+    return session.session_key
+
+def simulate_incremental(session, gates, to_measure, engine='auto'):
+    """
+    Resumes the builder session's previous sweep from its first edited column, for clients
+    that send 'incremental': true. The sweep runs in this process, so it is stopped once it
+    takes longer than SIMULATION_TIMEOUT, as the worker pool stops a simulation.
+
+    Args:
+        session: the request's session, or None when it cannot be used
+        gates: the circuit grid, indexed [row][col]
+        to_measure: list of {'qubit', 'toggle'} dictionaries
+        engine: the engine the client asked for
 
-QT = None
+    Returns:
+        a {'state_vector', 'probed_values'} result, or None if the circuit should go to the simulator
+
+    Raises:
+        SimulationTimeout: if the sweep overran
+    """
+    session_key = incremental_session_key(session, gates, engine)
+    if session_key is None:
+        return None
 
-for circuit_file in circuit_files:
+    result = incremental_simulations.simulate(session_key, gates, to_measure, settings.SIMULATION_TIMEOUT)
 
-    file_path = find(os.path.join('circuits', circuit_file))
+    return {'state_vector': result['state_vector'], 'probed_values': result['probed_values']}
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        circuit_data = json.load(f)
+def stream_incremental(session, gates, to_measure, engine='auto'):
+    """
+    Streams a resumed sweep like simulate_incremental, yielding each probe as the sweep reaches it
+
+    Args:
+        session: the request's session, or None when it cannot be used
+        gates: the circuit grid, indexed [row][col]
+        to_measure: list of {'qubit', 'toggle'} dictionaries
+        engine: the engine the client asked for
 
-    json_string = json.dumps(circuit_data)
-
-    url_encoded_json_string = quote(json_string)
-
-    print(circuit_data['title'])
-
-    if 'Teleportation' in circuit_data['title']:
-        QT = { 'name': circuit_data['title'], 'data': url_encoded_json_string }
-
-    example_circuits.append({
-        'name': circuit_data['title'], 
-        'data': url_encoded_json_string,
-    })
+    Returns:
+        an iterator of the same records as stream_job, or None if the circuit should go to the simulator
+    """
+    session_key = incremental_session_key(session, gates, engine)
+    if session_key is None:
+        return None
+
+    records = incremental_simulations.stream(session_key, gates, to_measure, settings.SIMULATION_TIMEOUT)
+
+    return ({key: value for key, value in record.items() if key != 'resumed_from'} for record in records)
+
+def example_circuits():
+    """
+    Returns the example circuits as the {'name', 'data'} dictionaries used by the templates
+    """
+    return [circuit.as_dict() for circuit in example_registry.all()]
 
 
 def user_login(request):
@@ -114,9 +258,9 @@ def dash(request):
         paginator = Paginator(user_circuits, 6)  
         page_number = request.GET.get('page')
         user_circuits = paginator.get_page(page_number)
-        return render(request, 'pages/dash.html', {'example_circuits': example_circuits, 'user_circuits': user_circuits})
+        return render(request, 'pages/dash.html', {'example_circuits': example_circuits(), 'user_circuits': user_circuits})
     else:
-        return render(request, 'pages/dash.html', {'example_circuits': example_circuits})
+        return render(request, 'pages/dash.html', {'example_circuits': example_circuits()})
 
 def build(request):
     if request.user.is_authenticated:
@@ -124,9 +268,9 @@ def build(request):
         paginator = Paginator(user_circuits, 6)  
         page_number = request.GET.get('page')
         user_circuits = paginator.get_page(page_number)
-        return render(request, 'pages/build.html', {'example_circuits': example_circuits, 'user_circuits': user_circuits})
+        return render(request, 'pages/build.html', {'example_circuits': example_circuits(), 'user_circuits': user_circuits})
     else:
-        return render(request, 'pages/build.html', {'example_circuits': example_circuits})
+        return render(request, 'pages/build.html', {'example_circuits': example_circuits()})
 
 def intro(request):
     return render(request, 'pages/intro_lesson.html', {})
@@ -138,9 +282,8 @@ def quantum_circuits(request):
     return render(request, 'pages/circuits_lesson.html', {})
 
 def quantum_phenomena(request):
-    print(QT)
-    print("QT")
-    return render(request, 'pages/phenomena_lesson.html', {'circuit_data': QT})
+    teleportation = example_registry.find('Teleportation')
+    return render(request, 'pages/phenomena_lesson.html', {'circuit_data': teleportation.as_dict() if teleportation else None})
 
 def error_correction(request):
     return render(request, 'pages/error_correction_lesson.html', {})
@@ -203,24 +346,349 @@ def delete_circuit(request, pk):
         return redirect(reverse('dashboard'))  
     return HttpResponse("Method not allowed", status=405)
 
+def json_ready(result) -> dict:
+    """
+    Returns:
+        the result with its state vector as a list, as simulations keep it as a NumPy array
+    """
+    state_vector = result.get('state_vector')
+    if isinstance(state_vector, np.ndarray):
+        return {**result, 'state_vector': state_vector.tolist()}
+
+    return result
+
+def encode_simulation(result, encoding, dtype):
+    """
+    Builds a successful /simulate response, with the state vector as a JSON list (the default),
+    a base64 string inside the JSON, or a binary buffer after a JSON header
+
+    Args:
+        result: the state vector, probed values and any sampled counts
+        encoding: 'json', 'base64' or 'binary'
+        dtype: 'float32' or 'float64', for the base64 and binary encodings
+
+    Returns:
+        the response
+    """
+    if encoding == 'binary':
+        header = {key: value for key, value in result.items() if key != 'state_vector'}
+        response = HttpResponse(pack_binary({'status': 'ok', **header}, result['state_vector'], dtype), content_type=BINARY_CONTENT_TYPE)
+    elif encoding == 'base64':
+        response = JsonResponse({'status': 'ok', **result, 'state_vector': encode_base64(result['state_vector'], dtype)})
+    else:
+        response = JsonResponse({'status': 'ok', **json_ready(result)})
+
+    patch_vary_headers(response, ('Accept',))
+    return response
+
+def simulate_request(body, accept='', session=None):
+    """
+    Runs a /simulate request body through the cache, admission checks and simulator.
+    Shared by the sync and async views, so it must not touch the request object.
+
+    Args:
+        body: the raw JSON request body
+        accept: the request's Accept header
+        session: the request's session, for incremental simulations, or None
+
+    Returns:
+        the response
+    """
+    timer = StageTimer()
+
+    try:
+        with timer.stage('parse'):
+            data = json.loads(body)
+
+        circuit_obj = data.get('circuit', [])
+        circuit_array = circuit_obj.get('gates', [])
+        to_measure = data.get('to_measure', [])
+        engine = data.get('engine', 'auto')
+        shots = data.get('shots')
+
+        if shots is not None and (type(shots) is not int or not 0 < shots <= settings.SIMULATION_MAX_SHOTS):
+            return JsonResponse({'status': 'error', 'message': f'shots must be a whole number from 1 to {settings.SIMULATION_MAX_SHOTS}'})
+
+        encoding, dtype = negotiate(data, accept)
+
+        top_k = data.get('top_k')
+        min_probability = data.get('min_probability', 0)
+        filtered = top_k is not None or 'min_probability' in data
+
+        if top_k is not None and (type(top_k) is not int or top_k < 1):
+            return JsonResponse({'status': 'error', 'message': 'top_k must be a whole number of at least 1'})
+        if type(min_probability) not in (int, float) or not 0 <= min_probability <= 1:
+            return JsonResponse({'status': 'error', 'message': 'min_probability must be a number from 0 to 1'})
+        if filtered and encoding != 'json':
+            return JsonResponse({'status': 'error', 'message': 'top_k and min_probability return JSON outcomes, not an encoded state vector'})
+
+        # The grid is compiled once, for the cache key, the engine choice and the admission checks
+        with timer.stage('compile'):
+            circuit = compile_circuit(circuit_array)
+
+        with timer.stage('cache'):
+            key = circuit_key(circuit, to_measure, engine)
+            result = precomputed_result(circuit_array, to_measure, engine) or simulation_cache.get(key)
+
+        if result is None:
+            with timer.stage('admit'):
+                resolved = admit(circuit, to_measure, engine)
+
+            if data.get('incremental') is True:
+                with timer.stage('incremental'):
+                    result = simulate_incremental(session, circuit_array, to_measure, engine)
+
+            if result is None:
+                # The compiled grid and the engine already picked for it go to the simulator as they are
+                job = {'circuit': {'gates': circuit}, 'to_measure': to_measure, 'engine': resolved}
+                pool = get_simulation_pool()
+                with timer.stage('dispatch'):
+                    outcome = pool.run(job) if pool else run_job(job, Simulator)
+                timer.update(outcome.get('timings', {}))
+
+                if outcome['status'] != 'ok':
+                    return JsonResponse(outcome)
+
+                # The state vector stays an array, so binary responses are packed straight from it
+                state_vector = outcome['state_vector']
+                state_vector.flags.writeable = False
+                result = {'state_vector': state_vector, 'probed_values': outcome['probed_values']}
+
+            simulation_cache.set(key, result)
+
+        if shots is not None:
+            with timer.stage('sample'):
+                counts = sample_counts(result['state_vector'], shots)
+            result = {**result, 'shots': shots, 'counts': counts}
+
+        if filtered:
+            with timer.stage('filter'):
+                outcomes = top_outcomes(result['state_vector'], top_k, min_probability)
+            result = {key: value for key, value in result.items() if key != 'state_vector'}
+            result['outcomes'] = outcomes
+
+        with timer.stage('serialize'):
+            response = encode_simulation(result, encoding, dtype)
+
+        stage_metrics.record(timer.durations, len(circuit_array))
+        response['Server-Timing'] = timer.header()
+        return response
+
+    except SimulationRejected as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=413)
+    except SimulationTimeout as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=504)
+    except Exception as e:
+        return JsonResponse({'status': 'error', 'message': str(e)})
+
+
 @csrf_exempt
 def simulate(request):
+    if request.method == 'POST':
+        return simulate_request(request.body, request.headers.get('Accept', ''), request.session)
+
+    return JsonResponse({'status': 'error', 'message': 'Invalid request method'})
+
+
+async def simulate_async(request):
+    """
+    An async /simulate for ASGI servers. The simulation runs on a thread pool so the event loop
+    stays free for cheap requests, and once SIMULATION_ASYNC_MAX_PENDING simulations are running
+    or queued, new ones are turned away with 503 and Retry-After instead of queueing without limit.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'status': 'error', 'message': 'Invalid request method'})
+
+    if not simulation_slots.acquire(blocking=False):
+        response = JsonResponse({'status': 'error', 'message': 'The simulator is busy, please try again shortly'}, status=503)
+        response['Retry-After'] = str(settings.SIMULATION_RETRY_AFTER)
+        return response
+
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_simulation_executor(), simulate_request, request.body, request.headers.get('Accept', ''))
+    finally:
+        simulation_slots.release()
+
+# csrf_exempt wraps views in a sync function, which would hide that this view is async
+simulate_async.csrf_exempt = True
+
+@csrf_exempt
+def simulate_stream(request):
+    """
+    Streams a simulation as newline-delimited JSON: one 'probe' record per probe as the sweep
+    reaches its column, then a 'result' record with the final distribution, or an 'error' record
+    """
     try:
         if request.method == 'POST':
             data = json.loads(request.body)
 
-            circuit_obj = data.get('circuit', [])
-            circuit_array = circuit_obj.get('gates', [])
+            circuit_array = data.get('circuit', {}).get('gates', [])
             to_measure = data.get('to_measure', [])
+            engine = data.get('engine', 'auto')
+
+            circuit = compile_circuit(circuit_array)
+            key = circuit_key(circuit, to_measure, engine)
+            cached = precomputed_result(circuit_array, to_measure, engine) or simulation_cache.get(key)
+            records = None
+            resolved = engine
+
+            if cached is not None:
+                records = [{'type': 'probe', **probe} for probe in cached['probed_values']]
+                records.append(json_ready({'type': 'result', 'status': 'ok', **cached}))
+            else:
+                resolved = admit(circuit, to_measure, engine)
+                if data.get('incremental') is True:
+                    records = stream_incremental(request.session, circuit_array, to_measure, engine)
+
+            if records is None:
+                job = {'circuit': {'gates': circuit}, 'to_measure': to_measure, 'engine': resolved}
+                pool = get_simulation_pool()
+                records = pool.stream(job) if pool else stream_job(job, Simulator)
+
+            return StreamingHttpResponse(ndjson_records(records, key), content_type='application/x-ndjson')
+
+    except SimulationRejected as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=413)
+    except Exception as e:
+        return JsonResponse({'status': 'error', 'message': str(e)})
+
+    return JsonResponse({'status': 'error', 'message': 'Invalid request method'})
+
 
-            simulator = Simulator(circuit_array, to_measure)
-            simulator.generate_cirq_circuit()
-            state_vector = simulator.simulate_circuit()
+def matrix_json(matrix) -> dict:
+    """
+    Encodes a complex matrix for JSON as its real and imaginary parts. Sparse matrices only
+    list their nonzero entries, by row and column.
 
-            simulator.generate_probed_circuit()
-            probed_values = simulator.probe_measurements()
+    Args:
+        matrix: a dense NumPy array or a SciPy sparse matrix
 
-            return JsonResponse({'status': 'ok','state_vector': state_vector.tolist(), 'probed_values': probed_values})
+    Returns:
+        the JSON-ready dictionary
+    """
+    if isinstance(matrix, np.ndarray):
+        return {'real': matrix.real.tolist(), 'imag': matrix.imag.tolist()}
+
+    entries = matrix.tocoo()
+    return {
+        'size': matrix.shape[0],
+        'rows': entries.row.tolist(),
+        'cols': entries.col.tolist(),
+        'real': entries.data.real.tolist(),
+        'imag': entries.data.imag.tolist(),
+    }
+
+
+@csrf_exempt
+def simulate_unitary(request):
+    """
+    Returns the unitary of each column of a circuit, sparse, and of the whole circuit, dense, for
+    the lessons that show them. Column unitaries are shared between requests through unitary_cache.
+    """
+    try:
+        if request.method == 'POST':
+            data = json.loads(request.body)
+            circuit = compile_circuit(data.get('circuit', {}).get('gates', []))
+
+            check_admission(circuit, settings.SIMULATION_MAX_UNITARY_QUBITS, settings.SIMULATION_MAX_DEPTH, settings.SIMULATION_MAX_MEMORY)
+            result = circuit_unitaries(circuit, unitary_cache)
+
+            return JsonResponse({
+                'status': 'ok',
+                'columns': [{'col': column['col'], 'unitary': matrix_json(column['unitary'])} for column in result['columns']],
+                'unitary': matrix_json(result['unitary']),
+            })
+
+    except SimulationRejected as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=413)
+    except Exception as e:
+        return JsonResponse({'status': 'error', 'message': str(e)})
+
+    return JsonResponse({'status': 'error', 'message': 'Invalid request method'})
+
+
+def ndjson_records(records, key):
+    """
+    Encodes streamed simulation records one per line, caching the result once it arrives
+
+    Args:
+        records: an iterator of records from stream_job
+        key: the cache key of the circuit
+
+    Yields:
+        each record as a line of JSON
+    """
+    try:
+        for record in records:
+            if record['type'] == 'result':
+                simulation_cache.set(key, {'state_vector': record['state_vector'], 'probed_values': record['probed_values']})
+            yield json.dumps(record) + '\n'
+    except SimulationTimeout as e:
+        yield json.dumps({'type': 'error', 'status': 'error', 'message': str(e)}) + '\n'
+
+
+@staff_member_required
+def simulation_metrics(request):
+    """
+    Shows the count, p50, p95 and max time of each /simulate stage by qubit count, and the use of
+    the incremental checkpoint store and the column unitary cache, for staff only
+    """
+    return JsonResponse({'status': 'ok', 'stages': stage_metrics.snapshot(), 'checkpoints': checkpoint_store.stats(),
+                         'unitaries': unitary_cache.stats()})
+
+@csrf_exempt
+def simulate_batch(request):
+    try:
+        if request.method == 'POST':
+            data = json.loads(request.body)
+            jobs = data.get('circuits', [])
+
+            if not isinstance(jobs, list):
+                return JsonResponse({'status': 'error', 'message': 'circuits must be a list'})
+            if len(jobs) > settings.SIMULATION_BATCH_LIMIT:
+                return JsonResponse({'status': 'error', 'message': f'At most {settings.SIMULATION_BATCH_LIMIT} circuits per batch'})
+
+            results = [None] * len(jobs)
+            keys = [None] * len(jobs)
+            pending = []
+
+            for i, job in enumerate(jobs):
+                if not isinstance(job, dict):
+                    results[i] = {'status': 'error', 'message': 'Each circuit must be an object with a circuit and to_measure'}
+                    continue
+                try:
+                    circuit = compile_circuit(job['circuit']['gates'])
+                    keys[i] = circuit_key(circuit, job.get('to_measure', []), job.get('engine', 'auto'))
+                    cached = simulation_cache.get(keys[i])
+                    if cached is None:
+                        resolved = admit(circuit, job.get('to_measure', []), job.get('engine', 'auto'))
+                        jobs[i] = {'circuit': {'gates': circuit}, 'to_measure': job.get('to_measure', []), 'engine': resolved}
+                except SimulationRejected as e:
+                    results[i] = {'status': 'error', 'message': str(e)}
+                    continue
+                except Exception:
+                    cached = None
+                if cached is not None:
+                    results[i] = json_ready({'status': 'ok', **cached})
+                else:
+                    pending.append(i)
+
+            pool = get_simulation_pool()
+            pending_jobs = [jobs[i] for i in pending]
+            if pool:
+                simulated = pool.map(pending_jobs)
+            else:
+                simulated = Simulator.simulate_batch(pending_jobs, max_workers=settings.SIMULATION_BATCH_WORKERS)
+
+            for i, result in zip(pending, simulated):
+                result.pop('timings', None)
+                results[i] = json_ready(result)
+                if result['status'] == 'ok' and keys[i] is not None:
+                    result['state_vector'].flags.writeable = False
+                    simulation_cache.set(keys[i], {'state_vector': result['state_vector'], 'probed_values': result['probed_values']})
+
+            return JsonResponse({'status': 'ok', 'results': results})
 
     except Exception as e:
         return JsonResponse({'status': 'error', 'message': str(e)})
@@ -296,12 +764,18 @@ def get_test_scores(request):
     return JsonResponse(list(scores), safe=False)
 
 
+def example_etag(request):
+    """
+    Finds the ETag of the example circuit named in the request, for conditional GETs
+    """
+    circuit = example_registry.find(request.GET.get('name', ''))
+    return circuit.etag if circuit else None
+
+@condition(etag_func=example_etag)
 def get_circuit(request):
-    name = request.GET.get('name', '').lower()
+    circuit = example_registry.find(request.GET.get('name', ''))
 
-    for circuit in example_circuits:
-        if name in circuit['name'].lower():
-            print("FOUND")
-            return JsonResponse(circuit)
+    if circuit is None:
+        return JsonResponse({'error': 'Circuit not found'}, status=404)
 
-    return JsonResponse({'error': 'Circuit not found'}, status=404)
\ No newline at end of file
+    return JsonResponse(circuit.as_dict())
\ No newline at end of file
@@ -0,0 +1,325 @@
+"""
+    File: workers.py
+    Date: 10-2026
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from confighome.columns import CompiledCircuit, compile_circuit
+from confighome.simulator import run_job, stream_job
+from confighome.sparse import densify_threshold, max_support
+
+# Bytes per amplitude (complex64), times the copies alive while a gate is applied
+BYTES_PER_AMPLITUDE = 8
+WORKING_COPIES = 4
+
+
+class SimulationRejected(Exception):
+    """
+    Raised when a circuit is over the qubit, depth or memory budget
+    """
+
+
+class SimulationTimeout(Exception):
+    """
+    Raised when a simulation runs past its wall-clock budget
+    """
+
+
+def circuit_size(gates) -> tuple:
+    """
+    Finds the number of qubits and columns in a circuit grid
+
+    Args:
+        gates: the circuit grid, indexed [row][col], or its CompiledCircuit
+
+    Returns:
+        a (qubits, depth) tuple, using the same truncation as Simulator's transpose
+    """
+    if isinstance(gates, CompiledCircuit):
+        return gates.num_qubits, gates.depth
+
+    qubits = len(gates)
+    depth = min((len(row) for row in gates), default=0)
+
+    return qubits, depth
+
+
+def estimate_memory(num_qubits, engine='cirq', num_measured=0, support=None) -> int:
+    """
+    Estimates the peak memory needed to simulate a circuit
+
+    Args:
+        num_qubits: the number of qubits in the circuit
+        engine: the engine that will run it
+        num_measured: the number of qubits measured at the end
+        support: the most nonzero amplitudes the sparse engine can hold, defaulting to 2**n
+
+    Returns:
+        the estimate in bytes
+    """
+    dense = (2 ** num_qubits) * BYTES_PER_AMPLITUDE * WORKING_COPIES
+    distribution = (2 ** num_measured) * 8
+
+    if engine == 'stabilizer':
+        # Two boolean (2n+1) x n tableaux, plus the dense float64 distribution over the measured qubits
+        return 2 * (2 * num_qubits + 1) * num_qubits + distribution
+
+    if engine == 'sparse':
+        # A row of bits and a complex128 amplitude per stored state, then the dense engine once it switches over
+        support = 2 ** num_qubits if support is None else support
+        threshold = densify_threshold(num_qubits)
+        sparse = min(support, threshold) * (num_qubits + 16) * WORKING_COPIES
+        return sparse + (dense if support >= threshold else 0) + distribution
+
+    if engine == 'aer':
+        # Aer updates one complex64 state in place, and hands back float64 probabilities over every qubit
+        return (2 ** num_qubits) * (BYTES_PER_AMPLITUDE + 2 * 8) + distribution
+
+    return dense
+
+
+def check_admission(gates, max_qubits, max_depth, max_memory, engine='cirq', num_measured=0, max_stabilizer_measured=None):
+    """
+    Rejects circuits that would be too expensive to simulate, before any work starts
+
+    Args:
+        gates: the circuit grid, indexed [row][col], or its CompiledCircuit
+        max_qubits: the largest number of qubits allowed
+        max_depth: the largest number of columns allowed
+        max_memory: the largest memory estimate allowed, in bytes
+        engine: the engine that will run the circuit
+        num_measured: the number of qubits measured at the end
+        max_stabilizer_measured: the most qubits the stabilizer engine may measure, as its
+            search over the outcomes costs far more per outcome than the memory they take
+
+    Raises:
+        SimulationRejected: if the circuit is over any of the budgets
+    """
+    circuit = compile_circuit(gates)
+    qubits, depth = circuit_size(circuit)
+
+    if qubits > max_qubits:
+        raise SimulationRejected(f'Circuit has {qubits} qubits, the limit is {max_qubits}')
+    if depth > max_depth:
+        raise SimulationRejected(f'Circuit has {depth} columns, the limit is {max_depth}')
+    if engine == 'stabilizer' and max_stabilizer_measured is not None and num_measured > max_stabilizer_measured:
+        raise SimulationRejected(f'Clifford circuit measures {num_measured} qubits, the limit is {max_stabilizer_measured}')
+
+    support = max_support(circuit.columns, qubits) if engine == 'sparse' else None
+    memory = estimate_memory(qubits, engine, num_measured, support)
+    if memory > max_memory:
+        raise SimulationRejected(f'Circuit needs about {memory // 2**20} MiB to simulate, the limit is {max_memory // 2**20} MiB')
+
+
+def _worker_loop(conn):
+    """
+    Runs jobs sent down the pipe until told to stop
+
+    Args:
+        conn: the worker's end of the pipe
+    """
+    conn.send('ready')
+
+    while True:
+        job = conn.recv()
+        if job is None:
+            break
+        try:
+            if job.get('stream'):
+                for record in stream_job(job):
+                    conn.send(record)
+            else:
+                conn.send(run_job(job))
+        except Exception as e:
+            # A malformed job is reported like any failed simulation, rather than ending the worker
+            conn.send({'type': 'error', 'status': 'error', 'message': str(e)})
+
+
+class _Worker:
+    """
+    A single simulation process and the pipe used to talk to it
+    """
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_loop, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+        # Wait for start-up to finish, so imports never count against a job's timeout
+        self.conn.recv()
+
+    def kill(self):
+        """
+        Stops the process immediately, abandoning any job it is running
+        """
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class SimulationWorkerPool:
+    """
+    A fixed number of simulation processes, so runaway circuits never block a web worker.
+
+    Every job gets a wall-clock timeout. A job that overruns has its process killed
+    and replaced, leaving jobs on the other workers untouched.
+    """
+    def __init__(self, size, timeout):
+        self.size = size
+        self.timeout = timeout
+
+        self.__context = multiprocessing.get_context('spawn')
+        self.__idle = queue.Queue()
+        self.__started = 0
+        self.__lock = threading.Lock()
+
+    def run(self, job, timeout=None) -> dict:
+        """
+        Runs one job in a worker process
+
+        Args:
+            job: a {'circuit': {'gates'}, 'to_measure'} dictionary, as posted to /simulate
+            timeout: seconds to allow, defaulting to the pool's timeout
+
+        Returns:
+            the result from run_job
+
+        Raises:
+            SimulationTimeout: if no worker became free, or the job overran
+        """
+        timeout = self.timeout if timeout is None else timeout
+        worker = self.__acquire(timeout)
+
+        try:
+            worker.conn.send(job)
+            finished = worker.conn.poll(timeout)
+            result = worker.conn.recv() if finished else None
+        except (EOFError, OSError):
+            self.__discard(worker)
+            return {'status': 'error', 'message': 'Simulation worker stopped unexpectedly'}
+
+        if not finished:
+            self.__discard(worker)
+            raise SimulationTimeout(f'Simulation took longer than {timeout:g} seconds')
+
+        self.__idle.put(worker)
+        return result
+
+    def stream(self, job, timeout=None):
+        """
+        Runs one job in a worker process, yielding its records as the worker sends them
+
+        Args:
+            job: a {'circuit': {'gates'}, 'to_measure'} dictionary, as posted to /simulate
+            timeout: seconds to allow for the whole job, defaulting to the pool's timeout
+
+        Yields:
+            the records from stream_job, ending with a 'result' or 'error' record
+
+        Raises:
+            SimulationTimeout: if no worker became free, or the job overran
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        worker = self.__acquire(timeout)
+        finished = False
+
+        try:
+            worker.conn.send({**job, 'stream': True})
+
+            while True:
+                if not worker.conn.poll(max(0, deadline - time.monotonic())):
+                    raise SimulationTimeout(f'Simulation took longer than {timeout:g} seconds')
+
+                record = worker.conn.recv()
+                if record['type'] in ('result', 'error'):
+                    finished = True
+                yield record
+                if finished:
+                    break
+        except (EOFError, OSError):
+            yield {'type': 'error', 'status': 'error', 'message': 'Simulation worker stopped unexpectedly'}
+        finally:
+            # A worker abandoned mid-job (timeout, or the client went away) is still busy, so replace it
+            if finished:
+                self.__idle.put(worker)
+            else:
+                self.__discard(worker)
+
+    def map(self, jobs, timeout=None) -> list:
+        """
+        Runs a list of jobs across the workers, keeping their order
+
+        Args:
+            jobs: list of jobs, as accepted by run
+            timeout: seconds to allow each job
+
+        Returns:
+            a list of results, with timeouts reported as errors
+        """
+        def run_one(job):
+            try:
+                return self.run(job, timeout)
+            except SimulationTimeout as e:
+                return {'status': 'error', 'message': str(e)}
+
+        with ThreadPoolExecutor(max_workers=max(1, self.size)) as executor:
+            return list(executor.map(run_one, jobs))
+
+    def shutdown(self):
+        """
+        Stops every idle worker
+        """
+        while True:
+            try:
+                worker = self.__idle.get_nowait()
+            except queue.Empty:
+                break
+            self.__discard(worker)
+
+    def __acquire(self, timeout) -> _Worker:
+        """
+        Takes an idle worker, starting a new one while the pool is not full
+        """
+        deadline = time.monotonic() + timeout
+
+        while True:
+            try:
+                return self.__idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self.__lock:
+                start_new = self.__started < self.size
+                if start_new:
+                    self.__started += 1
+
+            if start_new:
+                try:
+                    return _Worker(self.__context)
+                except Exception:
+                    with self.__lock:
+                        self.__started -= 1
+                    raise
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise SimulationTimeout('All simulation workers are busy, please try again')
+
+            # Wake up regularly in case a killed worker's slot has been freed
+            try:
+                return self.__idle.get(timeout=min(remaining, 0.1))
+            except queue.Empty:
+                continue
+
+    def __discard(self, worker):
+        """
+        Kills a worker and frees its slot for a replacement
+        """
+        worker.kill()
+        with self.__lock:
+            self.__started -= 1